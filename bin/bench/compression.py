@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark compressed request and response bodies for bulk upload checks.
+
+Starts a local aiohttp server that answers `POST /api/assets/bulk-upload-check` and sends checks
+of different sizes through AsyncClient, once uncompressed and once with gzip request bodies
+(`TransportConfig(compress_threshold=...)`) and gzip responses. Reports the bytes on the wire,
+the CPU time per call (client and server run in the same process) and the transfer time the bytes
+would take on a slow link. Run from the project environment:
+
+    uv run bin/bench/compression.py --items 1000 5000 --link-mbit 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import time
+from typing import Optional
+
+from aiohttp import web
+
+from immichpy import AsyncClient
+from immichpy.client.generated.models.asset_bulk_upload_check_dto import (
+    AssetBulkUploadCheckDto,
+)
+from immichpy.client.generated.models.asset_bulk_upload_check_item import (
+    AssetBulkUploadCheckItem,
+)
+from immichpy.client.utils.transport import TransportConfig
+
+
+class Server:
+    def __init__(self) -> None:
+        self.compress_responses = False
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    async def bulk_upload_check(self, request: web.Request) -> web.Response:
+        self.request_bytes += request.content_length or 0
+        assets = (await request.json())["assets"]
+        results = [
+            {
+                "id": a["id"],
+                "action": "reject",
+                "reason": "duplicate",
+                "assetId": a["id"],
+            }
+            for a in assets
+        ]
+        body = json.dumps({"results": results}).encode()
+        headers = {"Content-Type": "application/json"}
+        if self.compress_responses and "gzip" in request.headers.get(
+            "Accept-Encoding", ""
+        ):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        self.response_bytes += len(body)
+        return web.Response(body=body, headers=headers)
+
+
+async def run(
+    base_url: str,
+    server: Server,
+    dto: AssetBulkUploadCheckDto,
+    threshold: Optional[int],
+    calls: int,
+) -> tuple[float, float, float]:
+    server.compress_responses = threshold is not None
+    server.request_bytes = server.response_bytes = 0
+    transport = TransportConfig(compress_threshold=threshold)
+    async with AsyncClient(base_url=base_url, transport=transport) as client:
+        cpu = time.process_time()
+        for _ in range(calls):
+            await client.assets.check_bulk_upload(dto)
+        cpu = time.process_time() - cpu
+    return server.request_bytes / calls, server.response_bytes / calls, cpu / calls
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--threshold", type=int, default=16 * 1024)
+    parser.add_argument("--link-mbit", type=float, default=10.0)
+    args = parser.parse_args()
+
+    server = Server()
+    app = web.Application(client_max_size=64 * 1024**2)
+    app.router.add_post("/api/assets/bulk-upload-check", server.bulk_upload_check)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    base_url = f"http://127.0.0.1:{runner.addresses[0][1]}/api"
+
+    print(
+        f"{'items':>6} {'variant':12} {'request (KiB)':>14} {'response (KiB)':>15} "
+        f"{'cpu/call (ms)':>14} {f'@{args.link_mbit:g} Mbit/s (ms)':>18}"
+    )
+    try:
+        for items in args.items:
+            dto = AssetBulkUploadCheckDto(
+                assets=[
+                    AssetBulkUploadCheckItem(
+                        checksum=hashlib.sha1(str(i).encode()).hexdigest(),
+                        id=f"file-{i}.jpg",
+                    )
+                    for i in range(items)
+                ]
+            )
+            for name, threshold in (("plain", None), ("gzip", args.threshold)):
+                sent, received, cpu = await run(
+                    base_url, server, dto, threshold, args.calls
+                )
+                link = (sent + received) * 8 / (args.link_mbit * 1e6)
+                print(
+                    f"{items:6} {name:12} {sent / 1024:14.1f} {received / 1024:15.1f} "
+                    f"{cpu * 1e3:14.2f} {link * 1e3:18.1f}"
+                )
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark the default transport of AsyncClient against TransportConfig settings.
+
+Starts a local aiohttp server that answers `GET /api/server/version` and sends many concurrent
+requests through AsyncClient. Run from the project environment:
+
+    uv run bin/bench/transport.py --requests 20000 --concurrency 256
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from typing import Optional
+
+from aiohttp import web
+
+from immichpy import AsyncClient
+from immichpy.client.utils.transport import TransportConfig
+
+VERSION = {"major": 2, "minor": 5, "patch": 2}
+
+
+async def start_server(host: str, keepalive: float) -> web.AppRunner:
+    async def version(request: web.Request) -> web.Response:
+        return web.json_response(VERSION)
+
+    app = web.Application()
+    app.router.add_get("/api/server/version", version)
+    runner = web.AppRunner(app, keepalive_timeout=keepalive)
+    await runner.setup()
+    await web.TCPSite(runner, host, 0).start()
+    return runner
+
+
+async def run(
+    base_url: str,
+    transport: Optional[TransportConfig],
+    requests: int,
+    concurrency: int,
+) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(client: AsyncClient) -> None:
+        async with semaphore:
+            await client.server.get_server_version()
+
+    async with AsyncClient(base_url=base_url, transport=transport) as client:
+        await one(client)  # warm up DNS and the first connection
+        start = time.perf_counter()
+        await asyncio.gather(*(one(client) for _ in range(requests)))
+        return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=128)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument(
+        "--server-keepalive",
+        type=float,
+        default=5.0,
+        help="keep-alive timeout of the test server (Node.js default: 5s)",
+    )
+    args = parser.parse_args()
+
+    runner = await start_server(args.host, args.server_keepalive)
+    port = runner.addresses[0][1]
+    base_url = f"http://{args.host}:{port}/api"
+    variants: dict[str, Optional[TransportConfig]] = {
+        "default session": None,
+        "TransportConfig()": TransportConfig(),
+        "TransportConfig(trust_env=True)": TransportConfig(trust_env=True),
+        "TransportConfig(limit=0)": TransportConfig(limit=0),
+        "TransportConfig(keepalive_timeout=0)": TransportConfig(keepalive_timeout=0),
+    }
+    try:
+        for name, transport in variants.items():
+            elapsed = await run(base_url, transport, args.requests, args.concurrency)
+            print(f"{name:40} {elapsed:7.2f}s {args.requests / elapsed:10.0f} req/s")
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
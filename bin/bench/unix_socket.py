@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark AsyncClient over a Unix domain socket against TCP loopback (and optionally TLS loopback).
+
+Runs a small aiohttp server in a separate process that answers `GET /api/server/version` on all
+transports, then measures sequential latency, concurrent throughput and the CPU time of the client
+process. Run from the project environment:
+
+    uv run bin/bench/unix_socket.py --requests 20000
+    uv run bin/bench/unix_socket.py --tls-cert cert.pem --tls-key key.pem
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import ssl
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from aiohttp import web
+
+from immichpy import AsyncClient
+from immichpy.client.utils.transport import TransportConfig
+
+VERSION = {"major": 2, "minor": 5, "patch": 2}
+
+
+def serve(
+    tcp_port: int,
+    tls_port: Optional[int],
+    unix_path: str,
+    tls_files: Optional[tuple[str, str]],
+) -> None:
+    async def version(request: web.Request) -> web.Response:
+        return web.json_response(VERSION)
+
+    async def main() -> None:
+        app = web.Application()
+        app.router.add_get("/api/server/version", version)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", tcp_port).start()
+        await web.UnixSite(runner, unix_path).start()
+        if tls_port is not None and tls_files is not None:
+            context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            context.load_cert_chain(*tls_files)
+            await web.TCPSite(
+                runner, "127.0.0.1", tls_port, ssl_context=context
+            ).start()
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_ready(path: str) -> None:
+    for _ in range(100):
+        if Path(path).exists():
+            return
+        await asyncio.sleep(0.05)
+    raise RuntimeError("server did not start")
+
+
+async def measure(
+    base_url: str, transport: TransportConfig, requests: int, concurrency: int
+) -> tuple[float, float, float, float]:
+    async with AsyncClient(base_url=base_url, transport=transport) as client:
+        if base_url.startswith("https"):
+            context = client.base_client.rest_client.ssl_context
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        await client.server.get_server_version()
+
+        latencies = []
+        for _ in range(min(requests, 2000)):
+            start = time.perf_counter()
+            await client.server.get_server_version()
+            latencies.append(time.perf_counter() - start)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one() -> None:
+            async with semaphore:
+                await client.server.get_server_version()
+
+        cpu = time.process_time()
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu
+
+    p50 = statistics.median(latencies)
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    return p50, p99, requests / elapsed, cpu / requests
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--tls-cert", help="certificate for a TLS loopback server")
+    parser.add_argument("--tls-key", help="private key for a TLS loopback server")
+    args = parser.parse_args()
+
+    tls_files = (args.tls_cert, args.tls_key) if args.tls_cert else None
+    tcp_port = free_port()
+    tls_port = free_port() if tls_files else None
+    with tempfile.TemporaryDirectory() as tmp:
+        unix_path = str(Path(tmp) / "immich.sock")
+        server = multiprocessing.Process(
+            target=serve, args=(tcp_port, tls_port, unix_path, tls_files), daemon=True
+        )
+        server.start()
+        try:
+            await wait_ready(unix_path)
+            variants = {
+                "tcp loopback": (f"http://127.0.0.1:{tcp_port}/api", TransportConfig()),
+                "unix socket": (
+                    "http://immich/api",
+                    TransportConfig(unix_socket=unix_path),
+                ),
+            }
+            if tls_port is not None:
+                variants["tls loopback"] = (
+                    f"https://127.0.0.1:{tls_port}/api",
+                    TransportConfig(),
+                )
+            print(
+                f"{'transport':15} {'p50 (us)':>10} {'p99 (us)':>10} {'req/s':>10} {'cpu/req (us)':>13}"
+            )
+            for name, (base_url, transport) in variants.items():
+                p50, p99, rate, cpu = await measure(
+                    base_url, transport, args.requests, args.concurrency
+                )
+                print(
+                    f"{name:15} {p50 * 1e6:10.0f} {p99 * 1e6:10.0f} {rate:10.0f} {cpu * 1e6:13.0f}"
+                )
+        finally:
+            server.terminate()
+            server.join()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
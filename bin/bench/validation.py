@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-call overhead of argument validation (`@validate_call`) in AsyncClient.
+
+The transport is replaced by a stub that answers immediately, so the numbers are the client-side
+cost of a call: validation, serialization and deserialization. Compares the default client with
+`AsyncClient(validate_requests=False)`. Run from the project environment:
+
+    uv run bin/bench/validation.py --calls 20000 --ids 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from immichpy import AsyncClient
+from immichpy.client.generated.models.asset_bulk_delete_dto import AssetBulkDeleteDto
+from immichpy.client.generated.rest import RESTClientObject, RESTResponse
+
+VERSION = json.dumps({"major": 2, "minor": 5, "patch": 2}).encode()
+
+
+class StubResponse:
+    def __init__(self, url: str) -> None:
+        self.status = 200 if url.endswith("/server/version") else 204
+        self.reason = "OK"
+        self.headers = CIMultiDictProxy(
+            CIMultiDict({"Content-Type": "application/json"})
+        )
+        self._body = VERSION if self.status == 200 else b""
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+class StubRESTClient(RESTClientObject):
+    async def request(
+        self,
+        method,
+        url,
+        headers=None,
+        body=None,
+        post_params=None,
+        _request_timeout=None,
+    ) -> RESTResponse:
+        return RESTResponse(StubResponse(url))
+
+
+async def per_call(call: Callable[[], Awaitable[object]], calls: int) -> float:
+    await call()
+    start = time.perf_counter()
+    for _ in range(calls):
+        await call()
+    return (time.perf_counter() - start) / calls
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--ids", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    ids = [uuid.uuid4() for _ in range(args.ids)]
+    bulk_delete = AssetBulkDeleteDto(ids=ids)
+    clients = []
+    for validate in (True, False):
+        client = AsyncClient(base_url="http://stub/api", validate_requests=validate)
+        client.base_client.rest_client = StubRESTClient(client.config)
+        clients.append(client)
+
+    def cases(
+        client: AsyncClient,
+    ) -> dict[str, tuple[Callable[[], Awaitable[object]], int]]:
+        return {
+            "server.get_server_version()": (
+                client.server.get_server_version,
+                args.calls,
+            ),
+            "assets.delete_assets(1 id)": (
+                lambda: client.assets.delete_assets(AssetBulkDeleteDto(ids=ids[:1])),
+                args.calls,
+            ),
+            f"assets.delete_assets({args.ids} ids)": (
+                lambda: client.assets.delete_assets(bulk_delete),
+                max(1, args.calls // 100),
+            ),
+        }
+
+    print(f"{'call':32} {'validated (us)':>15} {'trusted (us)':>13} {'saved':>7}")
+    validated_cases, trusted_cases = cases(clients[0]), cases(clients[1])
+    for name in validated_cases:
+        # Interleave the variants and keep the best round of each to reduce noise.
+        best = [float("inf"), float("inf")]
+        for _ in range(args.rounds):
+            for i, (call, calls) in enumerate(
+                (validated_cases[name], trusted_cases[name])
+            ):
+                best[i] = min(best[i], await per_call(call, calls))
+        validated, trusted = best
+        print(
+            f"{name:32} {validated * 1e6:15.1f} {trusted * 1e6:13.1f} "
+            f"{1 - trusted / validated:7.0%}"
+        )
+    for client in clients:
+        await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any
 
 import typer
 
@@ -34,6 +35,14 @@ def download_archive_to_file(
         "--show-progress",
         help="Show progress bars (per-archive bytes + overall archive count)",
     ),
+    concurrency: int = typer.Option(
+        1, "--concurrency", help="Maximum number of archives to download in parallel"
+    ),
+    adaptive: bool = typer.Option(
+        False,
+        "--adaptive",
+        help="Only add parallelism while the server's time to first byte stays flat",
+    ),
     album_id: str | None = typer.Option(
         None, "--album-id", help="Album ID to download"
     ),
@@ -49,7 +58,7 @@ def download_archive_to_file(
 ) -> None:  # pragma: no cover
     """Download one or more asset archives and save them to ZIP files.
 
-    Downloads archives sequentially (not in parallel) to avoid overloading the server.
+    Downloads archives sequentially (not in parallel) by default to avoid overloading the server.
     The download_info parameter can be provided via --json or using dotted flags.
     """
     json_data = {}
@@ -65,12 +74,14 @@ def download_archive_to_file(
 
     download_info = DownloadInfoDto.model_validate(json_data)
 
-    kwargs = {}
+    kwargs: dict[str, Any] = {}
     kwargs["download_info"] = download_info
     kwargs["out_dir"] = out_dir
     kwargs["key"] = key
     kwargs["slug"] = slug
     kwargs["show_progress"] = show_progress
+    kwargs["concurrency"] = concurrency
+    kwargs["adaptive"] = adaptive
 
     client = ctx.obj["client"]
     result = run_command(client, client.download, "download_archive_to_file", **kwargs)
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
+import copy
 from typing import Optional
 
 from aiohttp import ClientSession
 
-from immichpy.client.generated.api_client import ApiClient
 from immichpy.client.generated.configuration import Configuration
 
 from immichpy.client.generated.api.activities_api import ActivitiesApi
 from immichpy.client.generated.api.albums_api import AlbumsApi
 from immichpy.client.generated.api.api_keys_api import APIKeysApi
+from immichpy.client.wrapper.api_client_wrapped import ApiClientWrapped
 from immichpy.client.wrapper.assets_api_wrapped import AssetsApiWrapped
 from immichpy.client.generated.api.authentication_admin_api import (
     AuthenticationAdminApi,
@@ -25,7 +26,7 @@ from immichpy.client.generated.api.faces_api import FacesApi
 from immichpy.client.generated.api.jobs_api import JobsApi
 from immichpy.client.generated.api.libraries_api import LibrariesApi
 from immichpy.client.generated.api.maintenance_admin_api import MaintenanceAdminApi
-from immichpy.client.generated.api.map_api import MapApi
+from immichpy.client.wrapper.map_api_wrapped import MapApiWrapped
 from immichpy.client.generated.api.memories_api import MemoriesApi
 from immichpy.client.generated.api.notifications_admin_api import NotificationsAdminApi
 from immichpy.client.generated.api.notifications_api import NotificationsApi
@@ -33,21 +34,28 @@ from immichpy.client.generated.api.partners_api import PartnersApi
 from immichpy.client.generated.api.people_api import PeopleApi
 from immichpy.client.generated.api.plugins_api import PluginsApi
 from immichpy.client.generated.api.queues_api import QueuesApi
-from immichpy.client.generated.api.search_api import SearchApi
-from immichpy.client.generated.api.server_api import ServerApi
+from immichpy.client.wrapper.search_api_wrapped import SearchApiWrapped
+from immichpy.client.wrapper.server_api_wrapped import ServerApiWrapped
 from immichpy.client.generated.api.sessions_api import SessionsApi
 from immichpy.client.generated.api.shared_links_api import SharedLinksApi
 from immichpy.client.generated.api.stacks_api import StacksApi
-from immichpy.client.generated.api.sync_api import SyncApi
+from immichpy.client.wrapper.sync_api_wrapped import SyncApiWrapped
 from immichpy.client.generated.api.system_config_api import SystemConfigApi
 from immichpy.client.generated.api.system_metadata_api import SystemMetadataApi
 from immichpy.client.generated.api.tags_api import TagsApi
-from immichpy.client.generated.api.timeline_api import TimelineApi
+from immichpy.client.wrapper.timeline_api_wrapped import TimelineApiWrapped
 from immichpy.client.generated.api.trash_api import TrashApi
 from immichpy.client.generated.api.users_admin_api import UsersAdminApi
 from immichpy.client.wrapper.users_api_wrapped import UsersApiWrapped
 from immichpy.client.generated.api.views_api import ViewsApi
 from immichpy.client.generated.api.workflows_api import WorkflowsApi
+from immichpy.client.utils.circuit_breaker import CircuitBreaker
+from immichpy.client.utils.http_cache import HttpCache
+from immichpy.client.utils.rate_limit import RateLimiter
+from immichpy.client.utils.retry import RetryPolicy
+from immichpy.client.utils.response_cache import ResponseCache
+from immichpy.client.utils.transport import TransportConfig
+from immichpy.client.utils.validation import disable_validation
 
 
 def _normalize_base_url(base_url: str) -> str:
@@ -59,8 +67,10 @@ def _build_configuration(
     api_key: Optional[str],
     access_token: Optional[str],
     base_url: str,
+    client_side_validation: bool = True,
 ) -> Configuration:
     config = Configuration(host=_normalize_base_url(base_url))
+    config.client_side_validation = client_side_validation
     if api_key:
         config.api_key["api_key"] = api_key.strip()
     if access_token:
@@ -151,10 +161,10 @@ class AsyncClient:
     See [MaintenanceAdminApi][immichpy.client.generated.api.maintenance_admin_api.MaintenanceAdminApi] for available methods and [Immich API Documentation](https://api.immich.app/endpoints/maintenance-(admin)) for more information.
     """
 
-    map: MapApi
+    map: MapApiWrapped
     """Map endpoints include supplemental functionality related to geolocation, such as reverse geocoding and retrieving map markers for assets with geolocation data.
 
-    See [MapApi][immichpy.client.generated.api.map_api.MapApi] for available methods and [Immich API Documentation](https://api.immich.app/endpoints/map) for more information.
+    See [MapApiWrapped][immichpy.client.wrapper.map_api_wrapped.MapApiWrapped] for available methods and [Immich API Documentation](https://api.immich.app/endpoints/map) for more information.
     """
 
     memories: MemoriesApi
@@ -199,16 +209,22 @@ class AsyncClient:
     See [QueuesApi][immichpy.client.generated.api.queues_api.QueuesApi] for available methods and [Immich API Documentation](https://api.immich.app/endpoints/queues) for more information.
     """
 
-    search: SearchApi
+    response_cache: Optional[ResponseCache]
+    """Opt-in cache for `search.search_asset_statistics`, `search.get_explore_data`, `search.get_search_suggestions` and `server.get_server_statistics`, set with the `response_cache` argument.
+
+    See [ResponseCache][immichpy.client.utils.response_cache.ResponseCache] for available methods.
+    """
+
+    search: SearchApiWrapped
     """Endpoints related to searching assets via text, smart search, optical character recognition (OCR), and other filters like person, album, and other metadata. Search endpoints usually support pagination and sorting.
 
-    See [SearchApi][immichpy.client.generated.api.search_api.SearchApi] for available methods and [Immich API Documentation](https://api.immich.app/endpoints/search) for more information.
+    See [SearchApiWrapped][immichpy.client.wrapper.search_api_wrapped.SearchApiWrapped] for available methods and [Immich API Documentation](https://api.immich.app/endpoints/search) for more information.
     """
 
-    server: ServerApi
+    server: ServerApiWrapped
     """Information about the current server deployment, including version and build information, available features, supported media types, and more.
 
-    See [ServerApi][immichpy.client.generated.api.server_api.ServerApi] for available methods and [Immich API Documentation](https://api.immich.app/endpoints/server) for more information.
+    See [ServerApiWrapped][immichpy.client.wrapper.server_api_wrapped.ServerApiWrapped] for available methods and [Immich API Documentation](https://api.immich.app/endpoints/server) for more information.
     """
 
     sessions: SessionsApi
@@ -229,10 +245,10 @@ class AsyncClient:
     See [StacksApi][immichpy.client.generated.api.stacks_api.StacksApi] for available methods and [Immich API Documentation](https://api.immich.app/endpoints/stacks) for more information.
     """
 
-    sync: SyncApi
+    sync: SyncApiWrapped
     """A collection of endpoints for the new mobile synchronization implementation.
 
-    See [SyncApi][immichpy.client.generated.api.sync_api.SyncApi] for available methods and [Immich API Documentation](https://api.immich.app/endpoints/sync) for more information.
+    See [SyncApiWrapped][immichpy.client.wrapper.sync_api_wrapped.SyncApiWrapped] for available methods and [Immich API Documentation](https://api.immich.app/endpoints/sync) for more information.
     """
 
     system_config: SystemConfigApi
@@ -253,10 +269,10 @@ class AsyncClient:
     See [TagsApi][immichpy.client.generated.api.tags_api.TagsApi] for available methods and [Immich API Documentation](https://api.immich.app/endpoints/tags) for more information.
     """
 
-    timeline: TimelineApi
+    timeline: TimelineApiWrapped
     """Specialized endpoints related to the timeline implementation used in the web application. External applications or tools should not use or rely on these endpoints, as they are subject to change without notice.
 
-    See [TimelineApi][immichpy.client.generated.api.timeline_api.TimelineApi] for available methods and [Immich API Documentation](https://api.immich.app/endpoints/timeline) for more information.
+    See [TimelineApiWrapped][immichpy.client.wrapper.timeline_api_wrapped.TimelineApiWrapped] for available methods and [Immich API Documentation](https://api.immich.app/endpoints/timeline) for more information.
     """
 
     trash: TrashApi
@@ -296,21 +312,42 @@ class AsyncClient:
         access_token: Optional[str] = None,
         base_url: str,
         http_client: Optional[ClientSession] = None,
+        response_cache: Optional[ResponseCache] = None,
+        http_cache: Optional[HttpCache] = None,
+        coalesce_requests: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[TransportConfig] = None,
+        validate_requests: bool = True,
     ) -> None:
         self._owns_http_client = http_client is None
         self._injected_http_client = http_client
+        self._shares_pool = False
         self.config = _build_configuration(
             api_key=api_key,
             access_token=access_token,
             base_url=base_url,
+            client_side_validation=validate_requests,
+        )
+        self.base_client = ApiClientWrapped(
+            configuration=self.config,
+            http_cache=http_cache,
+            coalesce_requests=coalesce_requests,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            circuit_breaker=circuit_breaker,
+            transport=transport,
         )
-        self.base_client = ApiClient(configuration=self.config)
         self.base_client.user_agent = "immichpy"
 
         # Allow caller to inject a pre-configured aiohttp session.
         if http_client is not None:
             self.base_client.rest_client.pool_manager = http_client
 
+        self._init_apis(response_cache)
+
+    def _init_apis(self, response_cache: Optional[ResponseCache]) -> None:
         # API groups (single upstream API, not microservices)
         self.activities = ActivitiesApi(self.base_client)
         self.albums = AlbumsApi(self.base_client)
@@ -326,7 +363,7 @@ class AsyncClient:
         self.jobs = JobsApi(self.base_client)
         self.libraries = LibrariesApi(self.base_client)
         self.maintenance_admin = MaintenanceAdminApi(self.base_client)
-        self.map = MapApi(self.base_client)
+        self.map = MapApiWrapped(self.base_client)
         self.memories = MemoriesApi(self.base_client)
         self.notifications = NotificationsApi(self.base_client)
         self.notifications_admin = NotificationsAdminApi(self.base_client)
@@ -334,25 +371,74 @@ class AsyncClient:
         self.people = PeopleApi(self.base_client)
         self.plugins = PluginsApi(self.base_client)
         self.queues = QueuesApi(self.base_client)
-        self.search = SearchApi(self.base_client)
-        self.server = ServerApi(self.base_client)
+        self.search = SearchApiWrapped(self.base_client)
+        self.server = ServerApiWrapped(self.base_client)
         self.sessions = SessionsApi(self.base_client)
         self.shared_links = SharedLinksApi(self.base_client)
         self.stacks = StacksApi(self.base_client)
-        self.sync = SyncApi(self.base_client)
+        self.sync = SyncApiWrapped(self.base_client)
         self.system_config = SystemConfigApi(self.base_client)
         self.system_metadata = SystemMetadataApi(self.base_client)
         self.tags = TagsApi(self.base_client)
-        self.timeline = TimelineApi(self.base_client)
+        self.timeline = TimelineApiWrapped(self.base_client)
         self.trash = TrashApi(self.base_client)
         self.users = UsersApiWrapped(self.base_client)
         self.users_admin = UsersAdminApi(self.base_client)
         self.views = ViewsApi(self.base_client)
         self.workflows = WorkflowsApi(self.base_client)
 
+        # Opt-in caching of read-only statistics and search calls.
+        self.response_cache = response_cache
+        self.search.response_cache = response_cache
+        self.server.response_cache = response_cache
+
+        # Trusted mode: pass arguments of generated methods to the serializer without validating them.
+        if not self.config.client_side_validation:
+            for api in vars(self).values():
+                if getattr(api, "api_client", None) is self.base_client:
+                    disable_validation(api)
+
+    def with_credentials(
+        self,
+        *,
+        api_key: Optional[str] = None,
+        access_token: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ) -> AsyncClient:
+        """
+        Create a client for other credentials that shares the connection pool of this client.
+
+        Use this to act for many users: the new client shares the aiohttp session, the SSL context and the
+        transport features (HTTP cache, request coalescing, rate limiter, retry policy, circuit breaker and
+        transport settings) of this client, so creating it is cheap and N users do not mean N connection
+        pools and N TLS handshakes. Only the credentials are per client. The response cache is only shared
+        if it is passed again; its entries are keyed by credentials, so users never see each other's responses.
+
+        Closing the new client does nothing; the connection pool is closed with this client.
+
+        :param api_key: The API key of the user.
+        :param access_token: The access token of the user.
+        :param response_cache: An optional response cache for the new client.
+        :return: The new client.
+        """
+        client = copy.copy(self)
+        client.config = _build_configuration(
+            api_key=api_key,
+            access_token=access_token,
+            base_url=self.config.host,
+            client_side_validation=self.config.client_side_validation,
+        )
+        client.base_client = self.base_client.with_configuration(client.config)
+        client._shares_pool = True
+        client._init_apis(response_cache)
+        return client
+
     async def close(self) -> None:
         """Close the client and release resources."""
 
+        if self._shares_pool:
+            return
+
         rest_client = self.base_client.rest_client
         session = rest_client.pool_manager
 
@@ -368,8 +454,15 @@ class AsyncClient:
 
     async def __aenter__(self) -> "AsyncClient":
         """Enter the context manager."""
+        if self._shares_pool:
+            return self
         if self._injected_http_client is None:
-            self._injected_http_client = ClientSession()
+            transport = self.base_client.transport
+            self._injected_http_client = (
+                transport.session(self.base_client.rest_client.ssl_context)
+                if transport is not None
+                else ClientSession()
+            )
         self.base_client.rest_client.pool_manager = self._injected_http_client
         return self
 
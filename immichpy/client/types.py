@@ -3,10 +3,112 @@ from typing import Literal, Optional, Union
 from multidict import CIMultiDictProxy
 from pydantic import BaseModel, Field
 
-from immichpy.client.generated import AssetMediaResponseDto
+from immichpy.client.generated import (
+    AssetMediaResponseDto,
+    AssetResponseDto,
+    SyncAlbumDeleteV1,
+    SyncAlbumToAssetDeleteV1,
+    SyncAlbumToAssetV1,
+    SyncAlbumUserDeleteV1,
+    SyncAlbumUserV1,
+    SyncAlbumV1,
+    SyncAssetDeleteV1,
+    SyncAssetExifV1,
+    SyncAssetFaceDeleteV1,
+    SyncAssetFaceV1,
+    SyncAssetMetadataDeleteV1,
+    SyncAssetMetadataV1,
+    SyncAssetV1,
+    SyncAuthUserV1,
+    SyncEntityType,
+    SyncMemoryAssetDeleteV1,
+    SyncMemoryAssetV1,
+    SyncMemoryDeleteV1,
+    SyncMemoryV1,
+    SyncPartnerDeleteV1,
+    SyncPartnerV1,
+    SyncPersonDeleteV1,
+    SyncPersonV1,
+    SyncStackDeleteV1,
+    SyncStackV1,
+    SyncUserDeleteV1,
+    SyncUserMetadataDeleteV1,
+    SyncUserMetadataV1,
+    SyncUserV1,
+)
 
 HeadersType = Union[dict[str, str], CIMultiDictProxy[str]]
 RejectionReason = Literal["duplicate", "unsupported_format"]
+FsyncPolicy = Literal["never", "close", "always"]
+LinkMode = Literal["auto", "hardlink", "reflink", "copy"]
+SyncEventData = Union[
+    SyncAlbumDeleteV1,
+    SyncAlbumToAssetDeleteV1,
+    SyncAlbumToAssetV1,
+    SyncAlbumUserDeleteV1,
+    SyncAlbumUserV1,
+    SyncAlbumV1,
+    SyncAssetDeleteV1,
+    SyncAssetExifV1,
+    SyncAssetFaceDeleteV1,
+    SyncAssetFaceV1,
+    SyncAssetMetadataDeleteV1,
+    SyncAssetMetadataV1,
+    SyncAssetV1,
+    SyncAuthUserV1,
+    SyncMemoryAssetDeleteV1,
+    SyncMemoryAssetV1,
+    SyncMemoryDeleteV1,
+    SyncMemoryV1,
+    SyncPartnerDeleteV1,
+    SyncPartnerV1,
+    SyncPersonDeleteV1,
+    SyncPersonV1,
+    SyncStackDeleteV1,
+    SyncStackV1,
+    SyncUserDeleteV1,
+    SyncUserMetadataDeleteV1,
+    SyncUserMetadataV1,
+    SyncUserV1,
+]
+
+
+class CacheStats(BaseModel):
+    """Counters describing the state of a client-side cache."""
+
+    hits: int = Field(..., description="The number of lookups served from the cache.")
+    misses: int = Field(
+        ..., description="The number of lookups that were not in the cache."
+    )
+    entries: int = Field(..., description="The number of entries in the cache.")
+    bytes: int = Field(..., description="The total size of all entries in bytes.")
+
+
+class SmartSearchMatch(BaseModel):
+    """An asset matched by one or more queries of a batch smart search."""
+
+    asset: AssetResponseDto = Field(..., description="The matched asset.")
+    ranks: dict[str, int] = Field(
+        ...,
+        description="The 1-based rank of the asset in the results of each query that matched it, by query label.",
+    )
+    score: float = Field(
+        ...,
+        description="The reciprocal rank fusion score over all queries. Higher is better.",
+    )
+
+
+class SyncEvent(BaseModel):
+    """A single change from the sync stream."""
+
+    type: SyncEntityType = Field(..., description="The type of the change.")
+    data: Optional[SyncEventData] = Field(
+        None,
+        description="The changed entity. None for control events like `SyncCompleteV1`.",
+    )
+    ack: str = Field(
+        ..., description="The ack token to send to the server once processed."
+    )
 
 
 class UploadStats(BaseModel):
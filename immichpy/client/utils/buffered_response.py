@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterator, Iterable, Optional
+
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from immichpy.client.generated.rest import RESTResponse
+
+
+class _BufferedContent:
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def read(self, n: int = -1) -> bytes:
+        body, self._body = self._body, b""
+        return body
+
+    async def iter_chunked(self, n: int) -> AsyncIterator[bytes]:
+        for i in range(0, len(self._body), n):
+            yield self._body[i : i + n]
+
+
+class BufferedClientResponse:
+    """
+    Stand-in for an `aiohttp.ClientResponse` whose body is already in memory.
+
+    Returned by the `*_without_preload_content` methods for responses served from a cache or shared
+    with another in-flight request.
+    """
+
+    def __init__(
+        self,
+        status: int,
+        reason: Optional[str],
+        headers: Iterable[tuple[str, str]],
+        body: bytes,
+    ) -> None:
+        self.status = status
+        self.reason = reason
+        self.headers = CIMultiDictProxy(CIMultiDict(headers))
+        self.content = _BufferedContent(body)
+        self.closed = False
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        return self._body.decode(encoding)
+
+    async def json(self, **kwargs: Any) -> Any:
+        return json.loads(self._body)
+
+    def release(self) -> None:
+        self.closed = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class BufferedRESTResponse(RESTResponse):
+    """
+    A `RESTResponse` with an in-memory body.
+
+    :param shared_results: Deserialized bodies by response type, shared with every other response built
+        from the same body so it is only parsed once.
+    """
+
+    def __init__(
+        self,
+        status: int,
+        reason: Optional[str],
+        headers: Iterable[tuple[str, str]],
+        body: bytes,
+        shared_results: Optional[dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(BufferedClientResponse(status, reason, headers, body))
+        self.data = body
+        self.body = body
+        self.shared_results = shared_results if shared_results is not None else {}
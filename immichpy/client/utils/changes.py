@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import aclosing
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from immichpy.client.generated import (
+    SyncAckSetDto,
+    SyncEntityType,
+    SyncRequestType,
+    SyncStreamDto,
+)
+from immichpy.client.types import SyncEvent
+from immichpy.client.utils.sync_stream import SYNC_REQUEST_TYPES, SyncAckBatcher
+from immichpy.client.wrapper.sync_api_wrapped import SyncApiWrapped
+
+logger = logging.getLogger(__name__)
+
+ChangeHandler = Callable[[SyncEvent], Awaitable[Any]]
+
+
+class ChangeSubscription:
+    """
+    A handler subscribed to a `ChangeFeed`.
+
+    Events are delivered through a bounded queue that is drained by a dedicated task, so a slow
+    handler only holds back the feed once its queue is full. The task is started with the first event.
+
+    :param handler: An async function called for each matching event.
+    :param types: The entity types to receive. None receives all events.
+    :param max_queue_size: The maximum number of undelivered events.
+    """
+
+    def __init__(
+        self,
+        handler: ChangeHandler,
+        types: Optional[Iterable[SyncEntityType]] = None,
+        max_queue_size: int = 100,
+    ) -> None:
+        if max_queue_size < 1:
+            raise ValueError("max_queue_size must be >= 1")
+        self.handler = handler
+        self.types = frozenset(types) if types is not None else None
+        self.queue: asyncio.Queue[SyncEvent] = asyncio.Queue(max_queue_size)
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def matches(self, event: SyncEvent) -> bool:
+        """Whether the subscription receives an event."""
+        return self.types is None or event.type in self.types
+
+    async def put(self, event: SyncEvent) -> None:
+        """
+        Queue an event for the handler, waiting while the queue is full.
+
+        :param event: The event to deliver.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        await self.queue.put(event)
+
+    async def _run(self) -> None:
+        while True:
+            event = await self.queue.get()
+            try:
+                await self.handler(event)
+            except Exception:
+                logger.exception(f"Change handler failed for {event.type.value} event")
+            finally:
+                self.queue.task_done()
+
+    async def drain(self) -> None:
+        """Wait until all queued events were handled."""
+        await self.queue.join()
+
+    async def close(self, drain: bool = True) -> None:
+        """
+        Stop the delivery task.
+
+        :param drain: Whether to wait until all queued events were handled. Otherwise they are dropped.
+        """
+        if self._task is None:
+            return
+        if drain:
+            await self.drain()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+class ChangeFeed:
+    """
+    Change feed that fans sync stream events out to many subscribers over a single upstream connection.
+
+    The feed polls the sync stream every `poll_interval` seconds, requesting only the entity types some
+    subscriber is interested in, and delivers each event to every matching subscription. Events are
+    acknowledged in batches, and a batch is only acknowledged after every subscription has handled all of
+    its events, so the first poll delivers the full current state, later polls deliver only changes, and
+    events that were not handled yet are delivered again after a crash. A handler that raises counts as
+    having handled the event; the error is logged.
+
+    The feed owns the sync checkpoint of its session: the server keeps one checkpoint per session, shared
+    by everything that acknowledges sync events with the same credentials, such as `SyncReplica` or
+    `SyncApiWrapped.consume_sync_stream`. Each of them would only receive the changes the others did not
+    acknowledge yet, so give the feed a session (access token) of its own, e.g. with
+    `AsyncClient.with_credentials`. The sync stream requires session authentication; API keys are rejected.
+
+    :param sync_api: The sync API to stream changes from, e.g. `client.sync`.
+    :param poll_interval: The number of seconds to wait between two polls.
+    :param ack_batch_size: The number of events after which acks are sent to the server.
+    :param ack_interval: The number of seconds after which acks are sent to the server.
+    """
+
+    def __init__(
+        self,
+        sync_api: SyncApiWrapped,
+        *,
+        poll_interval: float = 30.0,
+        ack_batch_size: int = 500,
+        ack_interval: float = 5.0,
+    ) -> None:
+        self.sync_api = sync_api
+        self.poll_interval = poll_interval
+        self.ack_batch_size = ack_batch_size
+        self.ack_interval = ack_interval
+        self.subscriptions: list[ChangeSubscription] = []
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def subscribe(
+        self,
+        handler: ChangeHandler,
+        types: Optional[Iterable[SyncEntityType]] = None,
+        max_queue_size: int = 100,
+    ) -> ChangeSubscription:
+        """
+        Subscribe a handler to the feed.
+
+        :param handler: An async function called for each matching event.
+        :param types: The entity types to receive. None receives all events.
+        :param max_queue_size: The maximum number of undelivered events before the feed waits for the handler.
+        :return: The subscription. Pass it to `unsubscribe` to remove it again.
+        """
+        subscription = ChangeSubscription(handler, types, max_queue_size)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription: ChangeSubscription) -> None:
+        """
+        Remove a subscription from the feed and stop its delivery task.
+
+        :param subscription: The subscription returned by `subscribe`.
+        """
+        self.subscriptions.remove(subscription)
+        await subscription.close()
+
+    def request_types(self) -> list[SyncRequestType]:
+        """The request types needed to serve all current subscriptions."""
+        if any(s.types is None for s in self.subscriptions):
+            return list(SyncRequestType)
+        wanted = {
+            SYNC_REQUEST_TYPES[t]
+            for s in self.subscriptions
+            for t in s.types or ()
+            if t in SYNC_REQUEST_TYPES
+        }
+        return [t for t in SyncRequestType if t in wanted]
+
+    async def _dispatch(self, event: SyncEvent) -> None:
+        for subscription in self.subscriptions:
+            if subscription.matches(event):
+                await subscription.put(event)
+
+    async def _send_acks(self, acks: list[str]) -> None:
+        # Acknowledge a batch only once every subscription handled all of its events.
+        await asyncio.gather(*(s.drain() for s in self.subscriptions))
+        await self.sync_api.send_sync_ack(SyncAckSetDto(acks=acks))
+
+    async def poll(self, **kwargs: Any) -> int:
+        """
+        Fetch all pending changes once and deliver them to the subscribers.
+
+        Returns once the acks of all received events were sent, i.e. after the subscribers handled them.
+
+        :param kwargs: Additional arguments to pass to the `iter_sync_stream` method.
+        :return: The number of received events.
+        """
+        types = self.request_types()
+        if not types:
+            return 0
+        received = 0
+        async with SyncAckBatcher(
+            self._send_acks,
+            max_pending=self.ack_batch_size,
+            max_interval=self.ack_interval,
+        ) as batcher:
+            async with aclosing(
+                self.sync_api.iter_sync_stream(SyncStreamDto(types=types), **kwargs)
+            ) as events:
+                async for event in events:
+                    await self._dispatch(event)
+                    await batcher.add(event)
+                    received += 1
+        return received
+
+    async def run(self, **kwargs: Any) -> None:
+        """
+        Poll for changes until cancelled. Failed polls are logged and retried after `poll_interval`.
+
+        :param kwargs: Additional arguments to pass to the `iter_sync_stream` method.
+        """
+        while True:
+            try:
+                await self.poll(**kwargs)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Polling the change feed failed")
+            await asyncio.sleep(self.poll_interval)
+
+    def start(self, **kwargs: Any) -> None:
+        """
+        Run the feed in a background task.
+
+        :param kwargs: Additional arguments to pass to the `iter_sync_stream` method.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run(**kwargs))
+
+    async def stop(self) -> None:
+        """Stop the background task and all subscriptions, after they handled their queued events."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for subscription in list(self.subscriptions):
+            await self.unsubscribe(subscription)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Awaitable, Callable, Iterable, Literal, Optional
+
+from immichpy.client.generated.exceptions import ApiException
+
+logger = logging.getLogger(__name__)
+
+# Statuses that indicate the server itself is unhealthy.
+FAILURE_STATUSES = frozenset({502, 503, 504})
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class CircuitOpenError(ApiException):
+    """Raised instead of sending a request while the circuit for its host is open."""
+
+    def __init__(self, host: str) -> None:
+        super().__init__(status=0, reason=f"Circuit open for {host}")
+        self.host = host
+
+
+class _Circuit:
+    __slots__ = ("failures", "opened_at", "probing")
+
+    def __init__(self) -> None:
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker that fails fast while a server is unhealthy.
+
+    After `failure_threshold` consecutive failures (connection errors, timeouts or a status in
+    `failure_statuses`) the circuit for the host opens and requests raise `CircuitOpenError` immediately
+    instead of waiting for their timeout. Once `reset_timeout` seconds have passed, the next request
+    becomes a probe (half-open): it pings the server (`ping_server`) first and closes the circuit if the ping succeeds.
+    All other requests keep failing fast until then.
+
+    :param failure_threshold: The number of consecutive failures that open the circuit.
+    :param reset_timeout: The time in seconds the circuit stays open before it is probed.
+    :param failure_statuses: The response statuses counted as failures.
+    :param probe_timeout: The timeout of the probe request in seconds.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        failure_statuses: Iterable[int] = FAILURE_STATUSES,
+        probe_timeout: float = 5.0,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be >= 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_statuses = frozenset(failure_statuses)
+        self.probe_timeout = probe_timeout
+        self._circuits: dict[str, _Circuit] = {}
+
+    def state(self, host: str) -> CircuitState:
+        """
+        Get the state of the circuit for a host.
+
+        :param host: The host, e.g. "localhost:2283".
+        :return: "closed", "open" or "half_open" (open, but due for a probe).
+        """
+        circuit = self._circuits.get(host)
+        if circuit is None or circuit.opened_at is None:
+            return "closed"
+        if time.monotonic() - circuit.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    async def before_request(
+        self, host: str, probe: Callable[[], Awaitable[object]]
+    ) -> None:
+        """
+        Check the circuit before a request is sent.
+
+        :param host: The host of the request.
+        :param probe: Checks the health of the server; called when the circuit is half-open.
+        :raises CircuitOpenError: If the circuit is open or the probe failed.
+        """
+        circuit = self._circuits.get(host)
+        if circuit is None or circuit.opened_at is None:
+            return
+        if circuit.probing or self.state(host) == "open":
+            raise CircuitOpenError(host)
+        circuit.probing = True
+        try:
+            await probe()
+        except Exception as e:
+            circuit.opened_at = time.monotonic()
+            logger.debug(f"Probe of {host} failed: {e!r}")
+            raise CircuitOpenError(host) from e
+        finally:
+            circuit.probing = False
+        logger.info(f"Circuit for {host} closed")
+        circuit.opened_at = None
+        circuit.failures = 0
+
+    def record_success(self, host: str) -> None:
+        """Record a request that reached a healthy server."""
+        circuit = self._circuits.get(host)
+        if circuit is not None:
+            circuit.failures = 0
+
+    def record_failure(self, host: str) -> None:
+        """Record a failed request; opens the circuit once the threshold is reached."""
+        circuit = self._circuits.setdefault(host, _Circuit())
+        circuit.failures += 1
+        if circuit.opened_at is None and circuit.failures >= self.failure_threshold:
+            logger.warning(
+                f"Circuit for {host} opened after {circuit.failures} consecutive failures"
+            )
+            circuit.opened_at = time.monotonic()
+
+    def record_status(self, host: str, status: int) -> None:
+        """Record a response by its status."""
+        if status in self.failure_statuses:
+            self.record_failure(host)
+        else:
+            self.record_success(host)
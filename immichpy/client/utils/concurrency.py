@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Async concurrency limiter whose limit adapts to server latency (additive increase, multiplicative decrease).
+
+    The limit starts at `initial` and grows by one for every observed latency that stays within
+    `tolerance` times the baseline, the best of the last `window` latencies (i.e. the server is not slowing
+    down under the extra load). When the latency rises above that, the limit is halved. The limit always
+    stays between 1 and `max_limit`. Since the baseline only covers recent latencies, a single unusually
+    fast response does not keep the limit low forever.
+
+    If the work behind requests differs in size (e.g. archives of different sizes), pass the `size` to
+    `record_latency` so latencies are compared per unit of size instead of absolutely. If it differs in
+    kind (e.g. searches and thumbnail requests), pass a `key` per kind so each is compared to its own
+    baseline.
+
+    Use it as an async context manager around the work it should limit. With `adaptive=False` it behaves
+    like a plain semaphore of size `max_limit`.
+
+    :param max_limit: The maximum number of concurrent holders.
+    :param initial: The starting limit. Defaults to 1 if adaptive, else `max_limit`.
+    :param adaptive: Whether to adapt the limit from recorded latencies.
+    :param tolerance: How much slower than the best observed latency a request may be while still counting as "flat".
+    :param min_latency: Latencies below this value (in seconds) are treated as this value, so tiny absolute jitter on fast responses does not shrink the limit.
+    :param window: The number of recent latencies the baseline is taken from.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        *,
+        initial: Optional[int] = None,
+        adaptive: bool = True,
+        tolerance: float = 1.5,
+        min_latency: float = 0.1,
+        window: int = 20,
+    ) -> None:
+        if max_limit < 1:
+            raise ValueError("max_limit must be >= 1")
+        if tolerance < 1:
+            raise ValueError("tolerance must be >= 1")
+        if window < 1:
+            raise ValueError("window must be >= 1")
+        self.max_limit = max_limit
+        self.adaptive = adaptive
+        self.tolerance = tolerance
+        self.min_latency = min_latency
+        default_initial = 1 if adaptive else max_limit
+        self.limit = max(1, min(initial or default_initial, max_limit))
+        self.window = window
+        self._latencies: dict[str, deque[float]] = {}
+        self._active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def active(self) -> int:
+        """The number of current holders."""
+        return self._active
+
+    def baseline(self, key: str = "") -> Optional[float]:
+        """
+        Get the best recent latency (per unit of size) of a kind of request.
+
+        :param key: The kind of request, see `record_latency`.
+        :return: The baseline, or None before the first latency of that kind was recorded.
+        """
+        return min(self._latencies.get(key, ()), default=None)
+
+    async def acquire(self) -> None:
+        """Wait until a slot under the current limit is free and take it."""
+        while self._active >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except BaseException:
+                # Pass a wakeup this waiter can no longer use on to the next one.
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._active += 1
+
+    async def release(self) -> None:
+        """Give a slot back."""
+        self._active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        # Wake as many waiters as there are free slots; each re-checks the limit before taking one.
+        free = self.limit - self._active
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    async def __aenter__(self) -> "AdaptiveConcurrencyLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.release()
+
+    def _set_limit(self, limit: int) -> None:
+        limit = max(1, min(limit, self.max_limit))
+        if limit != self.limit:
+            logger.debug(f"Adjusting concurrency limit {self.limit} -> {limit}")
+            self.limit = limit
+            # Waiters are otherwise only woken on release; wake them now so a grown limit takes effect.
+            self._wake()
+
+    def record_latency(
+        self, seconds: float, size: Optional[float] = None, *, key: str = ""
+    ) -> None:
+        """
+        Feed an observed latency (e.g. time to first byte) into the controller.
+
+        :param seconds: The latency in seconds.
+        :param size: The size of the work behind the request, e.g. the archive size in bytes. If given, the
+            latency is compared per unit of size. Pass it for all latencies of a key or for none.
+        :param key: The kind of request. Latencies are only compared to the baseline of the same key.
+        """
+        if not self.adaptive:
+            return
+        latency = max(seconds, self.min_latency)
+        if size:
+            latency /= size
+        latencies = self._latencies.get(key)
+        if latencies is None:
+            latencies = self._latencies[key] = deque(maxlen=self.window)
+        latencies.append(latency)
+        baseline = min(latencies)
+        if latency <= baseline * self.tolerance:
+            self._set_limit(self.limit + 1)
+        else:
+            self._set_limit(self.limit // 2)
+
+    def record_overload(self) -> None:
+        """Signal that the server is overloaded (e.g. it answered 429 or 503); halves the limit."""
+        if self.adaptive:
+            self._set_limit(self.limit // 2)
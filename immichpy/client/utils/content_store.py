@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import errno
+import logging
+import os
+import shutil
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncGenerator, Awaitable, Callable, Union
+
+from immichpy.client.types import LinkMode
+from immichpy.client.utils.upload import compute_sha1_sync
+
+logger = logging.getLogger(__name__)
+
+# ioctl request number of FICLONE on Linux (_IOW(0x94, 9, int)).
+FICLONE = 0x40049409
+# Errors with which a filesystem refuses a hard link or reflink; `auto` mode then tries the next mode.
+LINK_UNSUPPORTED = frozenset(
+    {
+        errno.EXDEV,
+        errno.EPERM,
+        errno.EMLINK,
+        errno.ENOTSUP,
+        errno.EOPNOTSUPP,
+        errno.ENOSYS,
+        errno.ENOTTY,
+        errno.EINVAL,
+    }
+)
+
+
+def checksum_to_hex(checksum: str) -> str:
+    """
+    Normalize an asset checksum to a lowercase hex SHA1 digest.
+
+    Immich reports checksums as base64 encoded SHA1 hashes; hex digests are accepted as well.
+
+    :param checksum: The checksum, base64 or hex encoded.
+    :return: The hex digest.
+    """
+    if len(checksum) == 40:
+        try:
+            bytes.fromhex(checksum)
+            return checksum.lower()
+        except ValueError:
+            pass
+    try:
+        raw = base64.b64decode(checksum, validate=True)
+    except binascii.Error:
+        raw = b""
+    if len(raw) != 20:
+        raise ValueError(f"Not a SHA1 checksum: {checksum!r}")
+    return raw.hex()
+
+
+def reflink(src: Path, dst: Path) -> None:
+    """
+    Create a copy-on-write clone of `src` at `dst` (btrfs, XFS, ...).
+
+    :param src: The source file.
+    :param dst: The destination path. Must not exist.
+    :raises OSError: If the platform or filesystem does not support reflinks.
+    """
+    if sys.platform != "linux":
+        raise OSError(errno.EOPNOTSUPP, "reflinks are only supported on Linux")
+    import fcntl
+
+    with src.open("rb") as fsrc, dst.open("xb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            dst.unlink()
+            raise
+
+
+class ContentStore:
+    """
+    Content-addressed store for original asset files.
+
+    Each unique original (identified by its SHA1 checksum) is downloaded once into the store and then
+    linked into every requested output location. This avoids re-downloading the same asset when exporting
+    several overlapping albums or shared links.
+
+    Note that hard links share their content with the store: modifying a linked file in place modifies the
+    stored object (and every other link) too. Use `link_mode="reflink"` or `"copy"` if outputs are edited.
+
+    :param directory: The directory to keep stored objects in. It is created if it does not exist.
+    :param link_mode: How to place objects into output trees. `auto` tries a hard link, then a reflink, then falls back to a plain copy (e.g. across filesystems).
+    :param verify: Whether to verify the SHA1 of downloaded objects against the expected checksum.
+    """
+
+    def __init__(
+        self,
+        directory: Union[Path, str],
+        *,
+        link_mode: LinkMode = "auto",
+        verify: bool = True,
+    ) -> None:
+        self.directory = Path(directory)
+        self.link_mode = link_mode
+        self.verify = verify
+        # Per-checksum locks and the number of callers holding or waiting for each.
+        self._locks: dict[str, tuple[asyncio.Lock, int]] = {}
+        (self.directory / "objects").mkdir(parents=True, exist_ok=True)
+        (self.directory / "tmp").mkdir(parents=True, exist_ok=True)
+
+    def object_path(self, checksum: str) -> Path:
+        """
+        Get the path of the stored object for a checksum, whether or not it exists yet.
+
+        :param checksum: The checksum, base64 or hex encoded.
+        :return: The object path.
+        """
+        digest = checksum_to_hex(checksum)
+        return self.directory / "objects" / digest[:2] / digest[2:]
+
+    def __contains__(self, checksum: str) -> bool:
+        return self.object_path(checksum).is_file()
+
+    async def get_or_fetch(
+        self, checksum: str, fetch: Callable[[Path], Awaitable[Path]]
+    ) -> Path:
+        """
+        Return the stored object for a checksum, downloading it first if it is missing.
+
+        Concurrent calls for the same checksum share a single download.
+
+        :param checksum: The checksum, base64 or hex encoded.
+        :param fetch: A function that downloads the object into the given temporary directory and returns the path of the downloaded file.
+        :return: The object path.
+        """
+        digest = checksum_to_hex(checksum)
+        obj = self.object_path(digest)
+        async with self._lock(digest):
+            if obj.is_file():
+                return obj
+            tmp_dir = self.directory / "tmp" / digest
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            downloaded = await fetch(tmp_dir)
+            if self.verify:
+                actual = await asyncio.to_thread(compute_sha1_sync, downloaded)
+                if actual != digest:
+                    downloaded.unlink()
+                    raise ValueError(
+                        f"Checksum mismatch for downloaded object: expected {digest}, got {actual}"
+                    )
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(downloaded, obj)
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return obj
+
+    @asynccontextmanager
+    async def _lock(self, digest: str) -> AsyncGenerator[None, None]:
+        lock, users = self._locks.get(digest, (asyncio.Lock(), 0))
+        self._locks[digest] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[digest]
+            if users == 1:
+                del self._locks[digest]
+            else:
+                self._locks[digest] = (lock, users - 1)
+
+    def _place(self, obj: Path, dest: Path) -> None:
+        modes = (
+            ["hardlink", "reflink", "copy"]
+            if self.link_mode == "auto"
+            else [self.link_mode]
+        )
+        for mode in modes:
+            try:
+                if mode == "hardlink":
+                    os.link(obj, dest)
+                elif mode == "reflink":
+                    reflink(obj, dest)
+                else:
+                    with obj.open("rb") as fsrc, dest.open("xb") as fdst:
+                        shutil.copyfileobj(fsrc, fdst)
+                return
+            except FileExistsError:
+                raise
+            except OSError as e:
+                if mode == modes[-1] or e.errno not in LINK_UNSUPPORTED:
+                    raise
+                logger.debug(f"Could not {mode} {obj} to {dest}: {e}")
+
+    async def link(self, checksum: str, dest: Path) -> Path:
+        """
+        Place a stored object at `dest`. Existing files at `dest` are left untouched.
+
+        :param checksum: The checksum, base64 or hex encoded.
+        :param dest: The output path.
+        :return: The output path.
+        """
+        obj = self.object_path(checksum)
+        if dest.exists():
+            logger.info(f"File already exists: {dest}")
+            return dest
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            await asyncio.to_thread(self._place, obj, dest)
+        except FileExistsError:
+            # created concurrently, e.g. by another export into the same tree
+            logger.info(f"File already exists: {dest}")
+        return dest
+
+    async def materialize(
+        self,
+        checksum: str,
+        dest: Path,
+        fetch: Callable[[Path], Awaitable[Path]],
+    ) -> Path:
+        """
+        Place the object for a checksum at `dest`, downloading it into the store only if it is not stored yet.
+
+        :param checksum: The checksum, base64 or hex encoded.
+        :param dest: The output path.
+        :param fetch: A function that downloads the object into the given temporary directory and returns the path of the downloaded file.
+        :return: The output path.
+        """
+        if dest.exists():
+            logger.info(f"File already exists: {dest}")
+            return dest
+        await self.get_or_fetch(checksum, fetch)
+        return await self.link(checksum, dest)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from pathlib import Path
+
+# Every disk cache entry is a body file and a JSON metadata sidecar with the same stem.
+DATA_SUFFIX = ".bin"
+META_SUFFIX = ".json"
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """
+    Write a file atomically.
+
+    The data is written to a temporary file in the same directory and then moved into place, so concurrent
+    readers (and other processes sharing the directory) never see a partial file.
+
+    :param path: The file to write.
+    :param data: The content.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from email.message import Message
 from mimetypes import guess_extension
+import os
 from pathlib import Path
-from typing import Awaitable, Callable, Optional
+from typing import Any, AsyncIterator, BinaryIO, Awaitable, Callable, Optional
 
+import aiohttp
 import logging
 from rich.progress import (
     Progress,
@@ -18,11 +23,21 @@ from rich.progress import (
 )
 
 
-from immichpy.client.generated.rest import RESTResponseType
-from immichpy.client.types import HeadersType
+from immichpy.client.generated.exceptions import ApiException
+from immichpy.client.generated.rest import RESTResponse, RESTResponseType
+from immichpy.client.types import FsyncPolicy, HeadersType
 
 logger = logging.getLogger(__name__)
 
+CHUNK_SIZE = 1024 * 1024
+
+# Errors after which a streamed body can be resumed with a Range request.
+RESUMABLE_ERRORS = (
+    aiohttp.ClientPayloadError,
+    aiohttp.ClientConnectionError,
+    asyncio.TimeoutError,
+)
+
 
 def h(name: str, headers: HeadersType) -> Optional[str]:
     """
@@ -122,6 +137,271 @@ def resolve_output_filename(
     return f"{base}{ext}" if ext else base
 
 
+async def raise_for_status(resp: RESTResponseType) -> None:
+    """
+    Raise the matching `ApiException` subclass if a raw response is not successful.
+
+    The `*_without_preload_content` methods return the raw response without checking the status,
+    so streaming helpers have to do it themselves.
+
+    :param resp: The raw response.
+    """
+    if 200 <= resp.status <= 299:
+        return
+    http_resp = RESTResponse(resp)
+    try:
+        body = (await http_resp.read()).decode("utf-8", errors="replace")
+    finally:
+        resp.close()
+    raise ApiException.from_response(http_resp=http_resp, body=body, data=None)
+
+
+def bind_request(
+    method: Callable[..., Awaitable[RESTResponseType]], **kwargs: Any
+) -> Callable[[Optional[HeadersType]], Awaitable[RESTResponseType]]:
+    """
+    Bind the arguments of a `*_without_preload_content` call into a `make_request` function.
+
+    :param method: The SDK method to call.
+    :param kwargs: The arguments of the call. Headers in `_headers` are sent with every request, merged with the extra headers.
+    :return: A function that makes the request. It takes an optional dictionary of extra headers.
+    """
+    headers = kwargs.pop("_headers", None) or {}
+
+    def make_request(
+        extra_headers: Optional[HeadersType],
+    ) -> Awaitable[RESTResponseType]:
+        return method(_headers={**headers, **(extra_headers or {})}, **kwargs)
+
+    return make_request
+
+
+async def iter_response_bytes(
+    make_request: Callable[[Optional[HeadersType]], Awaitable[RESTResponseType]],
+    *,
+    chunk_size: int = CHUNK_SIZE,
+    resume_attempts: int = 3,
+    on_restart: Optional[Callable[[], Any]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Stream a response body chunk by chunk without touching the disk.
+
+    The body is only read from the network when the consumer asks for the next chunk, so a slow consumer
+    applies backpressure all the way to the server. If the connection drops mid-stream, the request is
+    repeated with a `Range` header and streaming continues where it stopped. If the first response had an
+    `ETag`, it is sent as `If-Range`, so the server only sends the rest if the content did not change.
+
+    If the server answers a resumed request with the full body (200) and the same `ETag` (or none), it does
+    not support ranges and the already delivered prefix is skipped. With a different `ETag` the content
+    changed: `on_restart` is called and streaming restarts from the first byte of the new content. Without
+    `on_restart`, a `RuntimeError` is raised instead, since the delivered prefix cannot be taken back.
+
+    :param make_request: A function that makes a request and returns a RESTResponseType. It takes an optional dictionary of headers.
+    :param chunk_size: The maximum size of each yielded chunk in bytes.
+    :param resume_attempts: How often to resume after a connection error before giving up.
+    :param on_restart: Called when the content changed while resuming, before its first chunk is yielded. Consumers must discard the chunks they received so far. If None, a changed content raises `RuntimeError`.
+    :return: An async iterator over the response body.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be >= 1")
+
+    offset = 0
+    attempts = 0
+    etag: Optional[str] = None
+    extra_headers: Optional[HeadersType] = None
+    while True:
+        resp = await make_request(extra_headers)
+        try:
+            await raise_for_status(resp)
+            skip = 0
+            if extra_headers is None:
+                etag = h("ETag", resp.headers)
+            elif resp.status != 206:
+                if etag is not None and h("ETag", resp.headers) != etag:
+                    if on_restart is None:
+                        raise RuntimeError(
+                            f"Content changed while resuming after {offset} bytes"
+                        )
+                    logger.warning(
+                        "Content changed while resuming, restarting from zero"
+                    )
+                    offset = 0
+                    etag = h("ETag", resp.headers)
+                    on_restart()
+                else:
+                    skip = offset
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                if skip:
+                    dropped = min(skip, len(chunk))
+                    chunk, skip = chunk[dropped:], skip - dropped
+                if not chunk:
+                    continue
+                offset += len(chunk)
+                yield chunk
+            return
+        except RESUMABLE_ERRORS as e:
+            if attempts >= resume_attempts:
+                raise
+            attempts += 1
+            logger.warning(
+                f"Stream interrupted after {offset} bytes ({e!r}), resuming (attempt {attempts}/{resume_attempts})"
+            )
+            extra_headers = {"Range": f"bytes={offset}-"}
+            # If-Range needs a strong validator.
+            if etag is not None and not etag.startswith("W/"):
+                extra_headers["If-Range"] = etag
+        finally:
+            if not resp.closed:
+                resp.close()
+
+
+async def read_response_bytes(
+    make_request: Callable[[Optional[HeadersType]], Awaitable[RESTResponseType]],
+    *,
+    resume_attempts: int = 3,
+) -> bytes:
+    """
+    Read a whole response body into memory, resuming with `Range` requests on connection errors.
+
+    If the content changed while resuming, reading restarts from zero.
+
+    :param make_request: A function that makes a request and returns a RESTResponseType. It takes an optional dictionary of headers.
+    :param resume_attempts: How often to resume after a connection error before giving up.
+    :return: The response body.
+    """
+    buf = bytearray()
+    async for chunk in iter_response_bytes(
+        make_request, resume_attempts=resume_attempts, on_restart=buf.clear
+    ):
+        buf += chunk
+    return bytes(buf)
+
+
+class AsyncFileWriter:
+    """
+    Write chunks to a file from a dedicated writer thread so disk I/O never blocks the event loop.
+
+    Writes are executed in submission order by a single worker thread. At most `max_pending` chunks
+    are buffered; `write` waits for the oldest pending chunk once the limit is reached, which gives
+    natural backpressure on the network side when the disk is slower.
+
+    :param path: The file to write to. It is created if it does not exist.
+    :param offset: The byte offset to start writing at. Existing content before the offset is kept, everything after it is discarded.
+    :param preallocate: The expected final file size in bytes. If set and `os.posix_fallocate` is available, the space is reserved up front to reduce fragmentation.
+    :param fsync: When to flush written data to stable storage: `never`, on `close`, or `always` (after every chunk and on close).
+    :param max_pending: The maximum number of chunks queued for the writer thread.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        offset: int = 0,
+        preallocate: Optional[int] = None,
+        fsync: FsyncPolicy = "never",
+        max_pending: int = 4,
+    ) -> None:
+        if max_pending < 1:
+            raise ValueError("max_pending must be >= 1")
+        self.path = path
+        self.offset = offset
+        self.preallocate = preallocate
+        self.fsync = fsync
+        self.max_pending = max_pending
+        self._file: Optional[BinaryIO] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: deque[asyncio.Future[None]] = deque()
+
+    def _open(self) -> None:
+        f = self.path.open("r+b" if self.path.exists() else "wb")
+        try:
+            f.truncate(self.offset)
+            f.seek(self.offset)
+            if (
+                self.preallocate
+                and self.preallocate > self.offset
+                and hasattr(os, "posix_fallocate")
+            ):
+                try:
+                    os.posix_fallocate(
+                        f.fileno(), self.offset, self.preallocate - self.offset
+                    )
+                except OSError as e:
+                    # Not supported by every filesystem (e.g. some network mounts); purely an optimization.
+                    logger.debug(f"Preallocation failed for {self.path}: {e}")
+        except BaseException:
+            f.close()
+            raise
+        self._file = f
+
+    def _write(self, chunk: bytes) -> None:
+        assert self._file is not None
+        self._file.write(chunk)
+        if self.fsync == "always":
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _close(self, *, sync: bool) -> None:
+        if self._file is None:
+            return
+        f, self._file = self._file, None
+        try:
+            # Drop any preallocated space the server did not fill (e.g. short responses).
+            f.truncate(f.tell())
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        finally:
+            f.close()
+
+    async def __aenter__(self) -> "AsyncFileWriter":
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="immichpy-writer"
+        )
+        try:
+            await self._run(self._open)
+        except BaseException:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        try:
+            # Always wait for queued writes, the file must not be closed underneath the writer thread.
+            results = await asyncio.gather(*self._pending, return_exceptions=True)
+            self._pending.clear()
+            await self._run(
+                self._close, sync=exc_type is None and self.fsync != "never"
+            )
+        finally:
+            assert self._executor is not None
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if exc_type is None:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+    def _run(self, fn: Callable[..., None], *args, **kwargs) -> asyncio.Future[None]:
+        assert self._executor is not None, "AsyncFileWriter used outside its context"
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, lambda: fn(*args, **kwargs))
+
+    async def write(self, chunk: bytes) -> None:
+        """
+        Queue a chunk for writing. Raises the error of any previously failed write.
+
+        :param chunk: The bytes to write.
+        """
+        while len(self._pending) >= self.max_pending:
+            await self._pending.popleft()
+        for fut in self._pending:
+            if fut.done() and not fut.cancelled() and fut.exception() is not None:
+                await fut
+        self._pending.append(self._run(self._write, chunk))
+
+
 async def download_file(
     make_request: Callable[[Optional[HeadersType]], Awaitable[RESTResponseType]],
     out_dir: Path,
@@ -131,6 +411,8 @@ async def download_file(
     progress: Optional[Progress] = None,
     task_id: Optional[TaskID] = None,
     resumeable: bool = True,
+    preallocate: bool = False,
+    fsync: FsyncPolicy = "never",
 ) -> Path:
     """
     Download a file and show a progress bar. Allow resuming a download.
@@ -142,7 +424,11 @@ async def download_file(
     :param progress: A rich Progress instance to use. If not provided, a new one will be created. If provided, show_progress is ignored.
     :param task_id: The task ID in the progress instance. If not provided, a new task will be created.
     :param resumeable: Whether the download can be resumed from an existing partial `.temp` file via HTTP Range requests.
+    :param preallocate: Whether to reserve the full file size on disk before writing (only if `Content-Length` is known and the platform supports `posix_fallocate`). An interrupted preallocated download restarts instead of resuming, since the `.temp` file already has its final size.
+    :param fsync: When to flush the file to stable storage: `never` (default), on `close`, or `always` (after every chunk).
     :return: The path to the downloaded file.
+
+    File writes run in a dedicated writer thread, so slow disks do not stall other coroutines.
     """
     resp = None
     temp_path = None
@@ -225,12 +511,17 @@ async def download_file(
         if resumed and file_size > 0:
             progress.update(task_id, completed=file_size)
         async with resp:
-            mode = "ab" if (resumed and file_size > 0) else "wb"
-            with temp_path.open(mode) as f:
-                async for chunk in resp.content.iter_chunked(1024 * 1024):
+            offset = file_size if resumed else 0
+            async with AsyncFileWriter(
+                temp_path,
+                offset=offset,
+                preallocate=total_size if preallocate and total_size else None,
+                fsync=fsync,
+            ) as writer:
+                async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
                     if not chunk:
                         continue
-                    f.write(chunk)
+                    await writer.write(chunk)
                     progress.update(task_id, advance=len(chunk))
 
         temp_path.replace(out_path)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from immichpy.client.types import CacheStats
+from immichpy.client.utils.disk_cache import DATA_SUFFIX, META_SUFFIX, atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Request headers that select a different representation or user and are part of the cache key.
+KEY_HEADERS = ("accept", "authorization", "x-api-key", "x-immich-share-key", "cookie")
+
+
+class CachedResponse(BaseModel):
+    """A response stored by `HttpCache`, together with its validators."""
+
+    etag: Optional[str] = Field(None, description="The ETag the server sent.")
+    last_modified: Optional[str] = Field(
+        None, description="The Last-Modified date the server sent."
+    )
+    headers: list[tuple[str, str]] = Field(
+        ..., description="The response headers of the full response."
+    )
+    body: bytes = Field(..., description="The response body.")
+    _parsed: dict[str, Any] = PrivateAttr(default_factory=dict)
+
+    @property
+    def parsed(self) -> dict[str, Any]:
+        """Deserialized bodies by response type, shared by all requests revalidating this entry."""
+        return self._parsed
+
+    def validators(self) -> dict[str, str]:
+        """The conditional request headers to revalidate this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """
+    HTTP cache for GET requests that revalidates responses with ETag / Last-Modified.
+
+    Successful JSON responses that carry an `ETag` or `Last-Modified` header are stored. Later requests for
+    the same URL send `If-None-Match` / `If-Modified-Since`; when the server answers `304 Not Modified`, the
+    stored response is used, and the model deserialized from it the first time is copied instead of parsing
+    the JSON again. Responses streamed with the `*_without_preload_content` methods are not stored.
+
+    Entries are kept in memory (least recently used evicted beyond `max_entries`) and, if a `directory` is
+    given, also on disk so they survive restarts. Entries are keyed by URL and the headers selecting the
+    representation and user, so a cache can be shared between clients with different credentials.
+
+    :param directory: The directory to persist entries in. `None` keeps entries in memory only.
+    :param max_entries: The maximum number of entries kept in memory.
+    """
+
+    def __init__(
+        self,
+        directory: Union[Path, str, None] = None,
+        *,
+        max_entries: int = 1024,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.directory = Path(directory) if directory is not None else None
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def make_key(url: str, headers: Optional[dict[str, str]] = None) -> str:
+        """
+        Build the cache key for a GET request.
+
+        :param url: The full request URL, including the query string.
+        :param headers: The request headers.
+        :return: The cache key.
+        """
+        lowered = {k.lower(): v for k, v in (headers or {}).items()}
+        raw = "\n".join([url, *(lowered.get(h, "") for h in KEY_HEADERS)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> CacheStats:
+        """Return revalidation hit/miss counters and the size of the in-memory entries."""
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            entries=len(self._entries),
+            bytes=sum(len(e.body) for e in self._entries.values()),
+        )
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        assert self.directory is not None
+        return (
+            self.directory / f"{key}{DATA_SUFFIX}",
+            self.directory / f"{key}{META_SUFFIX}",
+        )
+
+    def _load(self, key: str) -> Optional[CachedResponse]:
+        data_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            return CachedResponse(body=data_path.read_bytes(), **meta)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.debug(f"Ignoring unreadable HTTP cache entry {key}")
+            return None
+
+    def _store(self, key: str, entry: CachedResponse) -> None:
+        data_path, meta_path = self._paths(key)
+        meta = entry.model_dump(mode="json", exclude={"body"})
+        atomic_write(data_path, entry.body)
+        atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Look up an entry, falling back to the disk if it is not in memory.
+
+        :param key: The cache key, see `make_key`.
+        :return: The entry or None.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        if self.directory is None:
+            return None
+        entry = await asyncio.to_thread(self._load, key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    async def put(self, key: str, entry: CachedResponse) -> None:
+        """
+        Store an entry in memory and, if configured, on disk.
+
+        :param key: The cache key, see `make_key`.
+        :param entry: The response to store.
+        """
+        self._remember(key, entry)
+        if self.directory is not None:
+            await asyncio.to_thread(self._store, key, entry)
+
+    def clear(self) -> None:
+        """Remove all entries from memory and disk."""
+        self._entries.clear()
+        if self.directory is None:
+            return
+        for pattern in (f"*{DATA_SUFFIX}", f"*{META_SUFFIX}"):
+            for path in self.directory.glob(pattern):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Iterable, Iterator, Optional
+
+from immichpy.client.generated.models.map_marker_response_dto import (
+    MapMarkerResponseDto,
+)
+
+EARTH_RADIUS_KM = 6371.0088
+
+_Point = tuple[float, float, float]
+# (point, marker id, split axis, left, right)
+_Node = tuple[_Point, str, int, Optional["_Node"], Optional["_Node"]]
+
+
+def _to_xyz(lat: float, lon: float) -> _Point:
+    phi, lam = math.radians(lat), math.radians(lon)
+    return (
+        math.cos(phi) * math.cos(lam),
+        math.cos(phi) * math.sin(lam),
+        math.sin(phi),
+    )
+
+
+def _chord(a: _Point, b: _Point) -> float:
+    return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2)
+
+
+def _chord_to_km(chord: float) -> float:
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, chord / 2))
+
+
+def _km_to_chord(km: float) -> float:
+    return 2 * math.sin(min(math.pi, km / EARTH_RADIUS_KM) / 2)
+
+
+def _build(points: list[tuple[_Point, str]], depth: int = 0) -> Optional[_Node]:
+    if not points:
+        return None
+    axis = depth % 3
+    points.sort(key=lambda p: p[0][axis])
+    mid = len(points) // 2
+    point, marker_id = points[mid]
+    return (
+        point,
+        marker_id,
+        axis,
+        _build(points[:mid], depth + 1),
+        _build(points[mid + 1 :], depth + 1),
+    )
+
+
+class MapMarkerIndex:
+    """
+    In-memory spatial index over map markers for fast local bounding box, radius and nearest neighbour queries.
+
+    Bounding box queries use a uniform latitude/longitude grid. Radius and nearest neighbour queries use
+    a k-d tree over points on the unit sphere, so distances are exact great-circle distances, also across
+    the antimeridian and near the poles. The tree is rebuilt lazily on the first such query after changes.
+
+    :param markers: The initial markers. Markers without coordinates are ignored.
+    :param cell_size: The size of a grid cell in degrees.
+    """
+
+    def __init__(
+        self,
+        markers: Iterable[MapMarkerResponseDto] = (),
+        *,
+        cell_size: float = 1.0,
+    ) -> None:
+        if cell_size <= 0:
+            raise ValueError("cell_size must be > 0")
+        self.cell_size = cell_size
+        self._markers: dict[str, MapMarkerResponseDto] = {}
+        self._cells: dict[tuple[int, int], set[str]] = {}
+        self._tree: Optional[_Node] = None
+        self._dirty = False
+        self.update(markers)
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        return math.floor(lat / self.cell_size), math.floor(lon / self.cell_size)
+
+    def update(self, markers: Iterable[MapMarkerResponseDto]) -> None:
+        """
+        Insert new markers and replace existing ones with the same ID.
+
+        :param markers: The markers to upsert.
+        """
+        for marker in markers:
+            if marker.lat is None or marker.lon is None:
+                continue
+            self._discard(marker.id)
+            self._markers[marker.id] = marker
+            self._cells.setdefault(self._cell(marker.lat, marker.lon), set()).add(
+                marker.id
+            )
+            self._dirty = True
+
+    def remove(self, ids: Iterable[str]) -> None:
+        """
+        Remove markers by asset ID. Unknown IDs are ignored.
+
+        :param ids: The asset IDs.
+        """
+        for marker_id in ids:
+            self._discard(marker_id)
+
+    def _discard(self, marker_id: str) -> None:
+        old = self._markers.pop(marker_id, None)
+        if old is None:
+            return
+        cell = self._cell(old.lat, old.lon)
+        ids = self._cells[cell]
+        ids.discard(marker_id)
+        if not ids:
+            del self._cells[cell]
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._markers)
+
+    def __contains__(self, marker_id: str) -> bool:
+        return marker_id in self._markers
+
+    def __iter__(self) -> Iterator[MapMarkerResponseDto]:
+        return iter(self._markers.values())
+
+    def get(self, marker_id: str) -> Optional[MapMarkerResponseDto]:
+        """Get a marker by asset ID."""
+        return self._markers.get(marker_id)
+
+    def bbox(
+        self, min_lat: float, min_lon: float, max_lat: float, max_lon: float
+    ) -> list[MapMarkerResponseDto]:
+        """
+        Find all markers inside a bounding box (edges included).
+
+        If `min_lon` is greater than `max_lon`, the box crosses the antimeridian.
+
+        :param min_lat: The southern edge.
+        :param min_lon: The western edge.
+        :param max_lat: The northern edge.
+        :param max_lon: The eastern edge.
+        :return: The markers inside the box.
+        """
+        if min_lon > max_lon:
+            return self.bbox(min_lat, min_lon, max_lat, 180.0) + self.bbox(
+                min_lat, -180.0, max_lat, max_lon
+            )
+        lo_i, lo_j = self._cell(min_lat, min_lon)
+        hi_i, hi_j = self._cell(max_lat, max_lon)
+        result = []
+        if (hi_i - lo_i + 1) * (hi_j - lo_j + 1) > len(self._cells):
+            # the box spans more cells than are populated; scan the populated ones instead
+            cells = [
+                ids
+                for (i, j), ids in self._cells.items()
+                if lo_i <= i <= hi_i and lo_j <= j <= hi_j
+            ]
+        else:
+            cells = [
+                self._cells[(i, j)]
+                for i in range(lo_i, hi_i + 1)
+                for j in range(lo_j, hi_j + 1)
+                if (i, j) in self._cells
+            ]
+        for ids in cells:
+            for marker_id in ids:
+                m = self._markers[marker_id]
+                if min_lat <= m.lat <= max_lat and min_lon <= m.lon <= max_lon:
+                    result.append(m)
+        return result
+
+    def _ensure_tree(self) -> Optional[_Node]:
+        if self._dirty:
+            self._tree = _build(
+                [(_to_xyz(m.lat, m.lon), m.id) for m in self._markers.values()]
+            )
+            self._dirty = False
+        return self._tree
+
+    def radius(
+        self, lat: float, lon: float, radius_km: float
+    ) -> list[tuple[MapMarkerResponseDto, float]]:
+        """
+        Find all markers within a great-circle distance of a point.
+
+        :param lat: The latitude of the center.
+        :param lon: The longitude of the center.
+        :param radius_km: The radius in kilometers.
+        :return: (marker, distance in km) pairs, closest first.
+        """
+        query = _to_xyz(lat, lon)
+        limit = _km_to_chord(radius_km)
+        found: list[tuple[float, str]] = []
+        stack = [self._ensure_tree()]
+        while stack:
+            node = stack.pop()
+            if node is None:
+                continue
+            point, marker_id, axis, left, right = node
+            d = _chord(query, point)
+            if d <= limit:
+                found.append((d, marker_id))
+            diff = query[axis] - point[axis]
+            stack.append(left if diff <= 0 else right)
+            if abs(diff) <= limit:
+                stack.append(right if diff <= 0 else left)
+        found.sort()
+        return [(self._markers[i], _chord_to_km(d)) for d, i in found]
+
+    def nearest(
+        self, lat: float, lon: float, k: int = 1
+    ) -> list[tuple[MapMarkerResponseDto, float]]:
+        """
+        Find the `k` markers closest to a point.
+
+        :param lat: The latitude of the point.
+        :param lon: The longitude of the point.
+        :param k: The number of markers to return.
+        :return: (marker, distance in km) pairs, closest first.
+        """
+        if k < 1:
+            raise ValueError("k must be >= 1")
+        query = _to_xyz(lat, lon)
+        best: list[tuple[float, str]] = []  # max-heap by negated distance
+
+        def visit(node: Optional[_Node]) -> None:
+            if node is None:
+                return
+            point, marker_id, axis, left, right = node
+            d = _chord(query, point)
+            if len(best) < k:
+                heapq.heappush(best, (-d, marker_id))
+            elif d < -best[0][0]:
+                heapq.heapreplace(best, (-d, marker_id))
+            diff = query[axis] - point[axis]
+            near, far = (left, right) if diff <= 0 else (right, left)
+            visit(near)
+            if len(best) < k or abs(diff) < -best[0][0]:
+                visit(far)
+
+        visit(self._ensure_tree())
+        return [
+            (self._markers[i], _chord_to_km(-d)) for d, i in sorted(best, reverse=True)
+        ]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import AsyncGenerator, Awaitable, Callable
+
+from immichpy.client.generated.models.asset_response_dto import AssetResponseDto
+from immichpy.client.generated.models.search_asset_response_dto import (
+    SearchAssetResponseDto,
+)
+
+
+async def iter_search_pages(
+    fetch_page: Callable[[int], Awaitable[SearchAssetResponseDto]],
+    *,
+    start_page: int = 1,
+    prefetch: int = 2,
+) -> AsyncGenerator[AssetResponseDto, None]:
+    """
+    Iterate over the assets of a page/size paginated search, fetching upcoming pages concurrently.
+
+    Up to `prefetch` pages after the current one are requested while the current page is consumed.
+    Iteration stops at the first page without a `next_page`; requests for pages after it, and all
+    outstanding requests when the iterator is closed early, are cancelled.
+
+    :param fetch_page: A function that fetches a page by its number.
+    :param start_page: The first page to fetch.
+    :param prefetch: The number of pages to request ahead. 0 fetches pages one after another.
+    :return: An async iterator over the assets of all pages, in order.
+    """
+    if prefetch < 0:
+        raise ValueError("prefetch must be >= 0")
+
+    pending: deque[asyncio.Future[SearchAssetResponseDto]] = deque()
+    next_page = start_page
+
+    def fill() -> None:
+        nonlocal next_page
+        while len(pending) <= prefetch:
+            pending.append(asyncio.ensure_future(fetch_page(next_page)))
+            next_page += 1
+
+    fill()
+    try:
+        while pending:
+            result = await pending.popleft()
+            if not result.next_page or not result.items:
+                for item in result.items:
+                    yield item
+                return
+            fill()
+            for item in result.items:
+                yield item
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
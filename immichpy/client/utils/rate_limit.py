@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+import time
+from typing import AsyncGenerator, Mapping, Optional
+from urllib.parse import urlsplit
+
+from immichpy.client.utils.concurrency import AdaptiveConcurrencyLimiter
+
+# Statuses with which an overloaded server asks clients to back off.
+OVERLOAD_STATUSES = frozenset({429, 503})
+
+
+class TokenBucket:
+    """
+    Async token bucket: allows `rate` acquisitions per second on average and bursts of up to `burst`.
+
+    Waiters are served in FIFO order.
+
+    :param rate: The number of tokens added per second.
+    :param burst: The capacity of the bucket. Defaults to `rate` (at least 1).
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        if burst is not None and burst < 1:
+            raise ValueError("burst must be >= 1")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class RateLimiter:
+    """
+    Client-side limiter applied to every request of an `AsyncClient`.
+
+    Combines an optional global token bucket, optional token buckets per operation group (the first path
+    segment of the endpoint, e.g. "assets", "search" or "albums") and an optional cap on the number of
+    requests in flight. With `adaptive=True`, the cap starts low and grows while latencies stay flat; it is
+    halved when latencies rise or the server answers 429 / 503 (see `AdaptiveConcurrencyLimiter`). Latencies
+    are compared per operation group, so slow searches do not count as the server slowing down for fast
+    requests of other groups.
+
+    A request holds its in-flight slot until the response headers have arrived.
+
+    :param rate: The global number of requests per second. `None` means unlimited.
+    :param burst: The global burst size. Defaults to `rate`.
+    :param groups: Token buckets for individual operation groups, applied in addition to the global one.
+    :param max_in_flight: The maximum number of concurrent requests. `None` means unlimited.
+    :param adaptive: Whether to adapt the in-flight cap to latencies and overload responses. Requires `max_in_flight`.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        groups: Optional[Mapping[str, TokenBucket]] = None,
+        max_in_flight: Optional[int] = None,
+        adaptive: bool = False,
+    ) -> None:
+        if adaptive and max_in_flight is None:
+            raise ValueError("adaptive requires max_in_flight")
+        self.bucket = TokenBucket(rate, burst) if rate is not None else None
+        self.groups = dict(groups or {})
+        self.concurrency = (
+            AdaptiveConcurrencyLimiter(max_in_flight, adaptive=adaptive)
+            if max_in_flight is not None
+            else None
+        )
+
+    @staticmethod
+    def operation_group(url: str, base_url: str) -> str:
+        """
+        Get the operation group of a request URL.
+
+        :param url: The request URL.
+        :param base_url: The base URL of the API, e.g. "http://localhost:2283/api".
+        :return: The first path segment after the base URL.
+        """
+        path = urlsplit(url).path
+        base_path = urlsplit(base_url).path.rstrip("/")
+        if path.startswith(base_path):
+            path = path[len(base_path) :]
+        return path.strip("/").split("/", 1)[0]
+
+    @asynccontextmanager
+    async def limit(self, group: str) -> AsyncGenerator[None, None]:
+        """
+        Wait for the buckets and an in-flight slot, and hold the slot while the context is active.
+
+        :param group: The operation group of the request.
+        """
+        if self.bucket is not None:
+            await self.bucket.acquire()
+        group_bucket = self.groups.get(group)
+        if group_bucket is not None:
+            await group_bucket.acquire()
+        if self.concurrency is None:
+            yield
+            return
+        async with self.concurrency:
+            yield
+
+    def record(self, group: str, latency: float, status: Optional[int] = None) -> None:
+        """
+        Feed the outcome of a request into the adaptive in-flight cap.
+
+        :param group: The operation group of the request.
+        :param latency: The time until the response headers arrived, in seconds.
+        :param status: The response status, or None if the request failed.
+        """
+        if self.concurrency is None:
+            return
+        if status in OVERLOAD_STATUSES:
+            self.concurrency.record_overload()
+        elif status is not None:
+            self.concurrency.record_latency(latency, key=group)
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+from contextlib import aclosing
+from pathlib import Path
+from typing import Any, Optional, Sequence, Type, Union
+
+from pydantic import BaseModel
+
+from immichpy.client.generated import (
+    SyncAckSetDto,
+    SyncAlbumToAssetV1,
+    SyncAlbumV1,
+    SyncAssetExifV1,
+    SyncAssetFaceV1,
+    SyncAssetV1,
+    SyncEntityType,
+    SyncMemoryAssetV1,
+    SyncMemoryV1,
+    SyncPartnerV1,
+    SyncPersonV1,
+    SyncRequestType,
+    SyncStackV1,
+    SyncStreamDto,
+)
+from immichpy.client.types import SyncEvent
+from immichpy.client.utils.sync_stream import SyncAckBatcher
+from immichpy.client.wrapper.sync_api_wrapped import SyncApiWrapped
+
+logger = logging.getLogger(__name__)
+
+# Table name -> (model of the rows, primary key columns). Columns are the model's field names.
+REPLICA_TABLES: dict[str, tuple[Type[BaseModel], tuple[str, ...]]] = {
+    "assets": (SyncAssetV1, ("id",)),
+    "asset_exif": (SyncAssetExifV1, ("asset_id",)),
+    "albums": (SyncAlbumV1, ("id",)),
+    "album_assets": (SyncAlbumToAssetV1, ("album_id", "asset_id")),
+    "asset_faces": (SyncAssetFaceV1, ("id",)),
+    "people": (SyncPersonV1, ("id",)),
+    "stacks": (SyncStackV1, ("id",)),
+    "memories": (SyncMemoryV1, ("id",)),
+    "memory_assets": (SyncMemoryAssetV1, ("memory_id", "asset_id")),
+    "partners": (SyncPartnerV1, ("shared_by_id", "shared_with_id")),
+}
+
+REPLICA_INDEXES: dict[str, tuple[str, ...]] = {
+    "assets": (
+        "owner_id",
+        "file_created_at",
+        "local_date_time",
+        "checksum",
+        "stack_id",
+    ),
+    "asset_exif": ("city", "country", "date_time_original"),
+    "albums": ("owner_id",),
+    "album_assets": ("asset_id",),
+    "asset_faces": ("asset_id", "person_id"),
+    "people": ("owner_id", "name"),
+    "stacks": ("primary_asset_id",),
+    "memories": ("owner_id", "memory_at"),
+    "memory_assets": ("asset_id",),
+}
+
+REPLICA_UPSERTS: dict[SyncEntityType, str] = {
+    SyncEntityType.ASSETV1: "assets",
+    SyncEntityType.PARTNERASSETV1: "assets",
+    SyncEntityType.PARTNERASSETBACKFILLV1: "assets",
+    SyncEntityType.ALBUMASSETCREATEV1: "assets",
+    SyncEntityType.ALBUMASSETUPDATEV1: "assets",
+    SyncEntityType.ALBUMASSETBACKFILLV1: "assets",
+    SyncEntityType.ASSETEXIFV1: "asset_exif",
+    SyncEntityType.PARTNERASSETEXIFV1: "asset_exif",
+    SyncEntityType.PARTNERASSETEXIFBACKFILLV1: "asset_exif",
+    SyncEntityType.ALBUMASSETEXIFCREATEV1: "asset_exif",
+    SyncEntityType.ALBUMASSETEXIFUPDATEV1: "asset_exif",
+    SyncEntityType.ALBUMASSETEXIFBACKFILLV1: "asset_exif",
+    SyncEntityType.ALBUMV1: "albums",
+    SyncEntityType.ALBUMTOASSETV1: "album_assets",
+    SyncEntityType.ALBUMTOASSETBACKFILLV1: "album_assets",
+    SyncEntityType.ASSETFACEV1: "asset_faces",
+    SyncEntityType.PERSONV1: "people",
+    SyncEntityType.STACKV1: "stacks",
+    SyncEntityType.PARTNERSTACKV1: "stacks",
+    SyncEntityType.PARTNERSTACKBACKFILLV1: "stacks",
+    SyncEntityType.MEMORYV1: "memories",
+    SyncEntityType.MEMORYTOASSETV1: "memory_assets",
+    SyncEntityType.PARTNERV1: "partners",
+}
+
+# Entity type -> [(table, {column: field of the delete event})]
+REPLICA_DELETES: dict[SyncEntityType, list[tuple[str, dict[str, str]]]] = {
+    SyncEntityType.ASSETDELETEV1: [
+        ("assets", {"id": "asset_id"}),
+        ("asset_exif", {"asset_id": "asset_id"}),
+        ("album_assets", {"asset_id": "asset_id"}),
+        ("asset_faces", {"asset_id": "asset_id"}),
+        ("memory_assets", {"asset_id": "asset_id"}),
+    ],
+    SyncEntityType.ALBUMDELETEV1: [
+        ("albums", {"id": "album_id"}),
+        ("album_assets", {"album_id": "album_id"}),
+    ],
+    SyncEntityType.ALBUMTOASSETDELETEV1: [
+        ("album_assets", {"album_id": "album_id", "asset_id": "asset_id"}),
+    ],
+    SyncEntityType.ASSETFACEDELETEV1: [("asset_faces", {"id": "asset_face_id"})],
+    SyncEntityType.PERSONDELETEV1: [("people", {"id": "person_id"})],
+    SyncEntityType.STACKDELETEV1: [("stacks", {"id": "stack_id"})],
+    SyncEntityType.MEMORYDELETEV1: [
+        ("memories", {"id": "memory_id"}),
+        ("memory_assets", {"memory_id": "memory_id"}),
+    ],
+    SyncEntityType.MEMORYTOASSETDELETEV1: [
+        ("memory_assets", {"memory_id": "memory_id", "asset_id": "asset_id"}),
+    ],
+    SyncEntityType.PARTNERDELETEV1: [
+        (
+            "partners",
+            {"shared_by_id": "shared_by_id", "shared_with_id": "shared_with_id"},
+        ),
+    ],
+}
+REPLICA_DELETES[SyncEntityType.PARTNERASSETDELETEV1] = REPLICA_DELETES[
+    SyncEntityType.ASSETDELETEV1
+]
+REPLICA_DELETES[SyncEntityType.PARTNERSTACKDELETEV1] = REPLICA_DELETES[
+    SyncEntityType.STACKDELETEV1
+]
+
+DEFAULT_REPLICA_TYPES: list[SyncRequestType] = [
+    SyncRequestType.ASSETSV1,
+    SyncRequestType.ASSETEXIFSV1,
+    SyncRequestType.ALBUMSV1,
+    SyncRequestType.ALBUMTOASSETSV1,
+    SyncRequestType.ALBUMASSETSV1,
+    SyncRequestType.ALBUMASSETEXIFSV1,
+    SyncRequestType.ASSETFACESV1,
+    SyncRequestType.PEOPLEV1,
+    SyncRequestType.STACKSV1,
+    SyncRequestType.MEMORIESV1,
+    SyncRequestType.MEMORYTOASSETSV1,
+    SyncRequestType.PARTNERSV1,
+    SyncRequestType.PARTNERASSETSV1,
+    SyncRequestType.PARTNERASSETEXIFSV1,
+    SyncRequestType.PARTNERSTACKSV1,
+]
+
+
+def _quote(name: str) -> str:
+    # some field names are SQL keywords (e.g. `order`)
+    return f'"{name}"'
+
+
+def _to_sql(value: Any) -> Any:
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+class SyncReplica:
+    """
+    Local SQLite replica of server state, kept up to date from the sync stream.
+
+    The replica holds assets, EXIF data, albums and their assets, faces, people, stacks, memories and
+    partners (including partner and shared album assets) in indexed tables whose columns are the fields
+    of the matching `Sync*V1` models. Once synced, arbitrary queries run locally without any server load.
+
+    Changes are written in transactions of `batch_size` events. Each transaction is committed before
+    its events are acknowledged, so an interrupted sync never loses changes: the next `sync` resumes
+    after the last committed batch, and replayed events are idempotent upserts.
+
+    :param path: The path of the SQLite database. It is created if it does not exist.
+    """
+
+    def __init__(self, path: Union[Path, str]) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        with self.conn:
+            for table, (model, pk) in REPLICA_TABLES.items():
+                columns = ", ".join(map(_quote, model.model_fields))
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ({columns}, PRIMARY KEY ({', '.join(map(_quote, pk))}))"
+                )
+            for table, columns in REPLICA_INDEXES.items():
+                for column in columns:
+                    self.conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({_quote(column)})"
+                    )
+
+    def apply(self, event: SyncEvent) -> None:
+        """
+        Apply a single sync event to the replica inside the current transaction.
+
+        Events of types the replica does not store are ignored. Call `commit` to persist the changes.
+
+        :param event: The sync event.
+        """
+        if event.type == SyncEntityType.SYNCRESETV1:
+            self.clear()
+        elif event.data is None:
+            return
+        elif (table := REPLICA_UPSERTS.get(event.type)) is not None:
+            row = event.data.model_dump(mode="json")
+            columns = REPLICA_TABLES[table][0].model_fields
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(map(_quote, columns))}) VALUES ({', '.join('?' * len(columns))})",
+                [_to_sql(row.get(column)) for column in columns],
+            )
+        else:
+            for table, keys in REPLICA_DELETES.get(event.type, []):
+                where = " AND ".join(f"{_quote(column)} = ?" for column in keys)
+                self.conn.execute(
+                    f"DELETE FROM {table} WHERE {where}",
+                    [getattr(event.data, field) for field in keys.values()],
+                )
+
+    def clear(self) -> None:
+        """Remove all rows from the replica (inside the current transaction)."""
+        for table in REPLICA_TABLES:
+            self.conn.execute(f"DELETE FROM {table}")
+
+    def commit(self) -> None:
+        """Commit the current transaction."""
+        self.conn.commit()
+
+    def query(self, sql: str, parameters: Sequence[Any] = ()) -> list[sqlite3.Row]:
+        """
+        Run a read query against the replica.
+
+        :param sql: The SQL query.
+        :param parameters: The query parameters.
+        :return: The result rows. Columns can be accessed by name.
+        """
+        return self.conn.execute(sql, parameters).fetchall()
+
+    def _apply_batch(self, events: list[SyncEvent]) -> None:
+        for event in events:
+            self.apply(event)
+        self.commit()
+
+    def _clear_and_commit(self) -> None:
+        self.clear()
+        self.commit()
+
+    async def sync(
+        self,
+        sync_api: SyncApiWrapped,
+        types: Optional[list[SyncRequestType]] = None,
+        batch_size: int = 1000,
+        reset: bool = False,
+        **kwargs: Any,
+    ) -> int:
+        """
+        Pull all changes since the last sync from the server into the replica.
+
+        Events are written in a worker thread, so the event loop is not blocked by SQLite. If the server
+        asks for a reset (`SyncResetV1`), the replica is cleared and synced again from scratch.
+
+        The sync stream requires session authentication (`access_token`); the server rejects API keys.
+        The server keeps one sync checkpoint per session, so do not share the session with other consumers
+        that acknowledge sync events, such as `ChangeFeed`.
+
+        :param sync_api: The sync API to stream changes from, e.g. `client.sync`.
+        :param types: The entity types to sync. Defaults to all types the replica stores.
+        :param batch_size: The number of events per transaction and acknowledgement.
+        :param reset: Whether to discard the server-side sync state and sync everything again.
+        :param kwargs: Additional arguments to pass to the `iter_sync_stream` method.
+        :return: The number of applied events.
+        :raises RuntimeError: If the server asks for another reset while syncing with `reset=True`.
+        """
+        pending: list[SyncEvent] = []
+
+        async def commit_and_ack(acks: list[str]) -> None:
+            batch = pending.copy()
+            pending.clear()
+            await asyncio.to_thread(self._apply_batch, batch)
+            await sync_api.send_sync_ack(SyncAckSetDto(acks=acks))
+
+        applied = 0
+        reset_requested = False
+        dto = SyncStreamDto(types=types or DEFAULT_REPLICA_TYPES, reset=reset or None)
+        async with SyncAckBatcher(commit_and_ack, max_pending=batch_size) as batcher:
+            async with aclosing(sync_api.iter_sync_stream(dto, **kwargs)) as events:
+                async for event in events:
+                    if event.type == SyncEntityType.SYNCRESETV1:
+                        if reset:
+                            raise RuntimeError(
+                                "Server requested another sync reset while rebuilding the replica"
+                            )
+                        reset_requested = True
+                        break
+                    pending.append(event)
+                    await batcher.add(event)
+                    applied += 1
+        if reset_requested:
+            logger.info("Server requested a sync reset, rebuilding the replica")
+            await asyncio.to_thread(self._clear_and_commit)
+            return await self.sync(
+                sync_api, types=types, batch_size=batch_size, reset=True, **kwargs
+            )
+        return applied
+
+    def close(self) -> None:
+        """Commit pending changes and close the database."""
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self) -> "SyncReplica":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
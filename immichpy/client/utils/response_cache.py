@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import time
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from pydantic import BaseModel
+
+from immichpy.client.types import CacheStats
+
+T = TypeVar("T")
+
+# Request options that do not change the response and are left out of cache keys.
+IGNORED_KWARGS = frozenset({"_request_timeout", "_host_index"})
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True, exclude_unset=True)
+    return str(value)
+
+
+def _size(value: Any) -> int:
+    if isinstance(value, BaseModel):
+        return len(value.model_dump_json())
+    if isinstance(value, list):
+        return sum(_size(v) for v in value)
+    return len(json.dumps(value, default=_json_default))
+
+
+class ResponseCache:
+    """
+    In-memory TTL and LRU cache for responses of read-only API operations.
+
+    Entries are keyed by operation name plus the serialized arguments (DTOs included) and expire `ttl`
+    seconds after they were stored. When more than `max_entries` entries or (if set) more than `max_bytes`
+    bytes of serialized responses are cached, the least recently used entries are evicted first.
+
+    `call` returns a deep copy of the cached response, so callers may modify what they get. `get` and
+    `put` work on the stored objects themselves.
+
+    `AsyncClient` adds a hash of its credentials to the keys, so one cache can be shared between clients
+    of different users (see `AsyncClient.with_credentials`).
+
+    :param ttl: The time in seconds an entry stays valid.
+    :param max_entries: The maximum number of entries.
+    :param max_bytes: The maximum total size of all entries in bytes (as serialized JSON). `None` means unlimited.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float = 60.0,
+        max_entries: int = 256,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        if ttl <= 0:
+            raise ValueError("ttl must be > 0")
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # key -> (operation, expires at, value, size)
+        self._entries: OrderedDict[str, tuple[str, float, Any, int]] = OrderedDict()
+        self._size = 0
+
+    @staticmethod
+    def make_key(operation: str, /, *args: Any, **kwargs: Any) -> str:
+        """
+        Build the cache key for a call.
+
+        :param operation: The operation name, e.g. "search_asset_statistics".
+        :param args: The positional arguments of the call.
+        :param kwargs: The keyword arguments of the call.
+        :return: The cache key.
+        """
+        kwargs = {k: v for k, v in kwargs.items() if k not in IGNORED_KWARGS}
+        payload = json.dumps([args, kwargs], default=_json_default, sort_keys=True)
+        return f"{operation}:{payload}"
+
+    @property
+    def size(self) -> int:
+        """The total size of all cached responses in bytes."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> CacheStats:
+        """Return hit/miss counters and the current cache size."""
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            entries=len(self._entries),
+            bytes=self._size,
+        )
+
+    def _pop(self, key: str) -> None:
+        _, _, _, nbytes = self._entries.pop(key)
+        self._size -= nbytes
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """
+        Look up a cached response and mark it as most recently used.
+
+        :param key: The cache key, see `make_key`.
+        :return: A (found, response) pair.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            if entry is not None:
+                self._pop(key)
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[2]
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a response, evicting least recently used entries if a limit is exceeded.
+
+        Responses larger than `max_bytes` are not cached.
+
+        :param key: The cache key, see `make_key`.
+        :param value: The response.
+        """
+        nbytes = _size(value)
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self._pop(key)
+        operation = key.split(":", 1)[0]
+        self._entries[key] = (operation, time.monotonic() + self.ttl, value, nbytes)
+        self._size += nbytes
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._size > self.max_bytes
+        ):
+            self._pop(next(iter(self._entries)))
+
+    def invalidate(self, operation: Optional[str] = None) -> int:
+        """
+        Remove cached responses.
+
+        :param operation: Only remove responses of this operation. `None` removes all responses.
+        :return: The number of removed entries.
+        """
+        keys = [
+            key
+            for key, entry in self._entries.items()
+            if operation is None or entry[0] == operation
+        ]
+        for key in keys:
+            self._pop(key)
+        return len(keys)
+
+    async def call(
+        self,
+        operation: str,
+        func: Callable[..., Awaitable[T]],
+        /,
+        *args: Any,
+        **kwargs: Any,
+    ) -> T:
+        """
+        Return the cached response of a call or perform the call and cache its response.
+
+        The response is a copy; the cached one is never handed out.
+
+        :param operation: The operation name used in the cache key.
+        :param func: The async function to call on a miss.
+        :param args: The positional arguments of the call.
+        :param kwargs: The keyword arguments of the call.
+        :return: The response.
+        """
+        return await self._call(
+            self.make_key(operation, *args, **kwargs), func, *args, **kwargs
+        )
+
+    async def _call(
+        self, key: str, func: Callable[..., Awaitable[T]], /, *args: Any, **kwargs: Any
+    ) -> T:
+        found, value = self.get(key)
+        if not found:
+            value = await func(*args, **kwargs)
+            self.put(key, value)
+        return copy.deepcopy(value)
+
+
+def _auth_scope(api: Any) -> str:
+    """A hash of the credentials an API instance sends, so users never share cache entries."""
+    config = api.api_client.configuration
+    credentials = json.dumps([config.api_key, config.access_token], sort_keys=True)
+    return hashlib.sha256(credentials.encode("utf-8")).hexdigest()[:16]
+
+
+def cached_operation(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Make an API method use the `response_cache` of its API instance, if one is set.
+
+    Arguments are bound to parameter names first, so positional and keyword calls share cache entries.
+    The credentials of the API client are part of the key. If `func` is validated by pydantic, the
+    `raw_function` of the wrapped method is the cached method without validation (see `disable_validation`),
+    and both share cache entries.
+
+    :param func: The unbound API method.
+    :return: The wrapped method.
+    """
+    wrapper = _cached(func)
+    raw = getattr(func, "raw_function", None)
+    if raw is not None:
+        # functools.wraps copied the uncached `raw_function` of `func`; replace it with a cached one.
+        setattr(wrapper, "raw_function", _cached(raw))
+    return wrapper
+
+
+def _cached(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    signature = inspect.signature(func)
+    operation = getattr(func, "__name__", repr(func))
+
+    @functools.wraps(func)
+    async def wrapper(self: Any, *args: Any, **kwargs: Any) -> T:
+        cache: Optional[ResponseCache] = getattr(self, "response_cache", None)
+        if cache is None:
+            return await func(self, *args, **kwargs)
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        del arguments["self"]
+        key = cache.make_key(operation, _auth_scope(self), **arguments)
+        return await cache._call(key, functools.partial(func, self), **arguments)
+
+    return wrapper
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+from email.utils import parsedate_to_datetime
+import random
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+# Methods that are idempotent by definition.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+# POST endpoints that only read data. Uploads (`/assets`) and archive downloads (`/download/archive`) are
+# left out: a retried upload reports `duplicate` instead of `created`, and archives are large streams.
+IDEMPOTENT_POSTS = frozenset(
+    {
+        "/assets/bulk-upload-check",
+        "/assets/exist",
+        "/download/info",
+        "/search/large-assets",
+        "/search/metadata",
+        "/search/random",
+        "/search/smart",
+        "/search/statistics",
+    }
+)
+# Statuses that indicate a transient failure.
+RETRY_STATUSES = frozenset({408, 429, 502, 503, 504})
+# Errors that indicate a transient failure.
+RETRY_ERRORS: tuple[type[BaseException], ...] = (
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    asyncio.TimeoutError,
+)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a `Retry-After` header.
+
+    :param value: The header value, either a number of seconds or an HTTP date.
+    :return: The delay in seconds, or None if the value is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """
+    Caps the number of retries relative to the number of requests, so retries cannot multiply the load on a struggling server.
+
+    Every request deposits `ratio` tokens (up to `capacity`); every retry withdraws one. The budget starts
+    full, so short bursts of failures are retried while sustained failures are retried for at most `ratio`
+    of the requests.
+
+    :param ratio: The number of retries allowed per request, on average.
+    :param capacity: The maximum number of banked retries.
+    """
+
+    def __init__(self, ratio: float = 0.2, capacity: int = 10) -> None:
+        if ratio < 0:
+            raise ValueError("ratio must be >= 0")
+        if capacity < 0:
+            raise ValueError("capacity must be >= 0")
+        self.ratio = ratio
+        self.capacity = capacity
+        self.balance = float(capacity)
+
+    def deposit(self) -> None:
+        """Record a request."""
+        self.balance = min(self.capacity, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Take a retry from the budget.
+
+        :return: Whether the retry is allowed.
+        """
+        if self.balance < 1:
+            return False
+        self.balance -= 1
+        return True
+
+
+class RetryPolicy:
+    """
+    Decides whether and when failed requests of an `AsyncClient` are retried.
+
+    Requests are retried on connection errors, timeouts and the statuses in `statuses`, but only if they are
+    idempotent: all methods except POST and PATCH, and POSTs to the endpoints in `idempotent_posts` (read-only
+    searches, download info and bulk upload checks). To also retry uploads, which the server deduplicates by
+    checksum but then answers with `duplicate` instead of `created`, add "/assets" to `idempotent_posts`.
+    The delay honours `Retry-After` and otherwise grows exponentially from `backoff` up to `max_backoff`
+    with full jitter. Retries are additionally limited by `budget`.
+
+    Request bodies are rebuilt for every attempt. File objects in form data are rewound before a retry;
+    requests with non-seekable streams are not retried.
+
+    :param attempts: The maximum number of attempts, including the first one.
+    :param backoff: The base delay in seconds.
+    :param max_backoff: The maximum delay in seconds, also applied to `Retry-After`.
+    :param jitter: Whether to randomize delays (full jitter).
+    :param statuses: The response statuses to retry.
+    :param idempotent_posts: The POST endpoint paths (relative to the API base URL) that are safe to retry.
+    :param budget: The retry budget. Defaults to `RetryBudget()`.
+    """
+
+    def __init__(
+        self,
+        *,
+        attempts: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        statuses: Iterable[int] = RETRY_STATUSES,
+        idempotent_posts: Iterable[str] = IDEMPOTENT_POSTS,
+        budget: Optional[RetryBudget] = None,
+    ) -> None:
+        if attempts < 1:
+            raise ValueError("attempts must be >= 1")
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+        self.idempotent_posts = frozenset(idempotent_posts)
+        self.budget = budget if budget is not None else RetryBudget()
+
+    def is_idempotent(self, method: str, url: str, base_url: str) -> bool:
+        """
+        Check whether a request may be sent more than once.
+
+        :param method: The HTTP method.
+        :param url: The request URL.
+        :param base_url: The base URL of the API.
+        :return: Whether the request is idempotent.
+        """
+        if method in IDEMPOTENT_METHODS:
+            return True
+        if method != "POST":
+            return False
+        path = urlsplit(url).path
+        base_path = urlsplit(base_url).path.rstrip("/")
+        if path.startswith(base_path):
+            path = path[len(base_path) :]
+        return path.rstrip("/") in self.idempotent_posts
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Get the delay before the next attempt.
+
+        :param attempt: The number of the attempt that failed, starting at 1.
+        :param retry_after: The `Retry-After` header of the failed response, if any.
+        :return: The delay in seconds.
+        """
+        parsed = parse_retry_after(retry_after)
+        if parsed is not None:
+            return min(parsed, self.max_backoff)
+        delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+def record_positions(post_params: Optional[list[Any]]) -> dict[int, int]:
+    """
+    Record the positions of seekable file objects in form parameters.
+
+    :param post_params: The form parameters as (name, value) pairs.
+    :return: The positions by parameter index.
+    """
+    positions = {}
+    for index, (_, value) in enumerate(post_params or []):
+        stream = value[1] if isinstance(value, tuple) and len(value) == 3 else value
+        if hasattr(stream, "read") and getattr(stream, "seekable", lambda: False)():
+            positions[index] = stream.tell()
+    return positions
+
+
+def rewind_post_params(
+    post_params: Optional[list[Any]], positions: dict[int, int]
+) -> bool:
+    """
+    Rewind file objects in form parameters to the positions they had before the first attempt.
+
+    :param post_params: The form parameters as (name, value) pairs.
+    :param positions: Positions recorded by `record_positions`.
+    :return: Whether all parameters can be sent again.
+    """
+    for index, (_, value) in enumerate(post_params or []):
+        stream = value[1] if isinstance(value, tuple) and len(value) == 3 else value
+        if not hasattr(stream, "read"):
+            continue
+        if index not in positions:
+            return False
+        stream.seek(positions[index])
+    return True
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Optional,
+    Type,
+)
+
+from pydantic import BaseModel
+
+from immichpy.client.generated import (
+    SyncAlbumDeleteV1,
+    SyncAlbumToAssetDeleteV1,
+    SyncAlbumToAssetV1,
+    SyncAlbumUserDeleteV1,
+    SyncAlbumUserV1,
+    SyncAlbumV1,
+    SyncAssetDeleteV1,
+    SyncAssetExifV1,
+    SyncAssetFaceDeleteV1,
+    SyncAssetFaceV1,
+    SyncAssetMetadataDeleteV1,
+    SyncAssetMetadataV1,
+    SyncAssetV1,
+    SyncAuthUserV1,
+    SyncEntityType,
+    SyncMemoryAssetDeleteV1,
+    SyncMemoryAssetV1,
+    SyncMemoryDeleteV1,
+    SyncMemoryV1,
+    SyncPartnerDeleteV1,
+    SyncPartnerV1,
+    SyncPersonDeleteV1,
+    SyncPersonV1,
+    SyncRequestType,
+    SyncStackDeleteV1,
+    SyncStackV1,
+    SyncUserDeleteV1,
+    SyncUserMetadataDeleteV1,
+    SyncUserMetadataV1,
+    SyncUserV1,
+)
+from immichpy.client.generated.rest import RESTResponseType
+from immichpy.client.types import SyncEvent
+from immichpy.client.utils.download import CHUNK_SIZE, raise_for_status
+
+logger = logging.getLogger(__name__)
+
+# The model of the `data` payload for each entity type. Control events carry no payload.
+SYNC_ENTITY_MODELS: dict[SyncEntityType, Optional[Type[BaseModel]]] = {
+    SyncEntityType.AUTHUSERV1: SyncAuthUserV1,
+    SyncEntityType.USERV1: SyncUserV1,
+    SyncEntityType.USERDELETEV1: SyncUserDeleteV1,
+    SyncEntityType.ASSETV1: SyncAssetV1,
+    SyncEntityType.ASSETDELETEV1: SyncAssetDeleteV1,
+    SyncEntityType.ASSETEXIFV1: SyncAssetExifV1,
+    SyncEntityType.ASSETMETADATAV1: SyncAssetMetadataV1,
+    SyncEntityType.ASSETMETADATADELETEV1: SyncAssetMetadataDeleteV1,
+    SyncEntityType.PARTNERV1: SyncPartnerV1,
+    SyncEntityType.PARTNERDELETEV1: SyncPartnerDeleteV1,
+    SyncEntityType.PARTNERASSETV1: SyncAssetV1,
+    SyncEntityType.PARTNERASSETBACKFILLV1: SyncAssetV1,
+    SyncEntityType.PARTNERASSETDELETEV1: SyncAssetDeleteV1,
+    SyncEntityType.PARTNERASSETEXIFV1: SyncAssetExifV1,
+    SyncEntityType.PARTNERASSETEXIFBACKFILLV1: SyncAssetExifV1,
+    SyncEntityType.PARTNERSTACKBACKFILLV1: SyncStackV1,
+    SyncEntityType.PARTNERSTACKDELETEV1: SyncStackDeleteV1,
+    SyncEntityType.PARTNERSTACKV1: SyncStackV1,
+    SyncEntityType.ALBUMV1: SyncAlbumV1,
+    SyncEntityType.ALBUMDELETEV1: SyncAlbumDeleteV1,
+    SyncEntityType.ALBUMUSERV1: SyncAlbumUserV1,
+    SyncEntityType.ALBUMUSERBACKFILLV1: SyncAlbumUserV1,
+    SyncEntityType.ALBUMUSERDELETEV1: SyncAlbumUserDeleteV1,
+    SyncEntityType.ALBUMASSETCREATEV1: SyncAssetV1,
+    SyncEntityType.ALBUMASSETUPDATEV1: SyncAssetV1,
+    SyncEntityType.ALBUMASSETBACKFILLV1: SyncAssetV1,
+    SyncEntityType.ALBUMASSETEXIFCREATEV1: SyncAssetExifV1,
+    SyncEntityType.ALBUMASSETEXIFUPDATEV1: SyncAssetExifV1,
+    SyncEntityType.ALBUMASSETEXIFBACKFILLV1: SyncAssetExifV1,
+    SyncEntityType.ALBUMTOASSETV1: SyncAlbumToAssetV1,
+    SyncEntityType.ALBUMTOASSETDELETEV1: SyncAlbumToAssetDeleteV1,
+    SyncEntityType.ALBUMTOASSETBACKFILLV1: SyncAlbumToAssetV1,
+    SyncEntityType.MEMORYV1: SyncMemoryV1,
+    SyncEntityType.MEMORYDELETEV1: SyncMemoryDeleteV1,
+    SyncEntityType.MEMORYTOASSETV1: SyncMemoryAssetV1,
+    SyncEntityType.MEMORYTOASSETDELETEV1: SyncMemoryAssetDeleteV1,
+    SyncEntityType.STACKV1: SyncStackV1,
+    SyncEntityType.STACKDELETEV1: SyncStackDeleteV1,
+    SyncEntityType.PERSONV1: SyncPersonV1,
+    SyncEntityType.PERSONDELETEV1: SyncPersonDeleteV1,
+    SyncEntityType.ASSETFACEV1: SyncAssetFaceV1,
+    SyncEntityType.ASSETFACEDELETEV1: SyncAssetFaceDeleteV1,
+    SyncEntityType.USERMETADATAV1: SyncUserMetadataV1,
+    SyncEntityType.USERMETADATADELETEV1: SyncUserMetadataDeleteV1,
+    SyncEntityType.SYNCACKV1: None,
+    SyncEntityType.SYNCRESETV1: None,
+    SyncEntityType.SYNCCOMPLETEV1: None,
+}
+
+# The request type that has to be requested to receive each entity type. Control events are always sent.
+SYNC_REQUEST_TYPES: dict[SyncEntityType, SyncRequestType] = {
+    SyncEntityType.AUTHUSERV1: SyncRequestType.AUTHUSERSV1,
+    SyncEntityType.USERV1: SyncRequestType.USERSV1,
+    SyncEntityType.USERDELETEV1: SyncRequestType.USERSV1,
+    SyncEntityType.ASSETV1: SyncRequestType.ASSETSV1,
+    SyncEntityType.ASSETDELETEV1: SyncRequestType.ASSETSV1,
+    SyncEntityType.ASSETEXIFV1: SyncRequestType.ASSETEXIFSV1,
+    SyncEntityType.ASSETMETADATAV1: SyncRequestType.ASSETMETADATAV1,
+    SyncEntityType.ASSETMETADATADELETEV1: SyncRequestType.ASSETMETADATAV1,
+    SyncEntityType.PARTNERV1: SyncRequestType.PARTNERSV1,
+    SyncEntityType.PARTNERDELETEV1: SyncRequestType.PARTNERSV1,
+    SyncEntityType.PARTNERASSETV1: SyncRequestType.PARTNERASSETSV1,
+    SyncEntityType.PARTNERASSETBACKFILLV1: SyncRequestType.PARTNERASSETSV1,
+    SyncEntityType.PARTNERASSETDELETEV1: SyncRequestType.PARTNERASSETSV1,
+    SyncEntityType.PARTNERASSETEXIFV1: SyncRequestType.PARTNERASSETEXIFSV1,
+    SyncEntityType.PARTNERASSETEXIFBACKFILLV1: SyncRequestType.PARTNERASSETEXIFSV1,
+    SyncEntityType.PARTNERSTACKBACKFILLV1: SyncRequestType.PARTNERSTACKSV1,
+    SyncEntityType.PARTNERSTACKDELETEV1: SyncRequestType.PARTNERSTACKSV1,
+    SyncEntityType.PARTNERSTACKV1: SyncRequestType.PARTNERSTACKSV1,
+    SyncEntityType.ALBUMV1: SyncRequestType.ALBUMSV1,
+    SyncEntityType.ALBUMDELETEV1: SyncRequestType.ALBUMSV1,
+    SyncEntityType.ALBUMUSERV1: SyncRequestType.ALBUMUSERSV1,
+    SyncEntityType.ALBUMUSERBACKFILLV1: SyncRequestType.ALBUMUSERSV1,
+    SyncEntityType.ALBUMUSERDELETEV1: SyncRequestType.ALBUMUSERSV1,
+    SyncEntityType.ALBUMASSETCREATEV1: SyncRequestType.ALBUMASSETSV1,
+    SyncEntityType.ALBUMASSETUPDATEV1: SyncRequestType.ALBUMASSETSV1,
+    SyncEntityType.ALBUMASSETBACKFILLV1: SyncRequestType.ALBUMASSETSV1,
+    SyncEntityType.ALBUMASSETEXIFCREATEV1: SyncRequestType.ALBUMASSETEXIFSV1,
+    SyncEntityType.ALBUMASSETEXIFUPDATEV1: SyncRequestType.ALBUMASSETEXIFSV1,
+    SyncEntityType.ALBUMASSETEXIFBACKFILLV1: SyncRequestType.ALBUMASSETEXIFSV1,
+    SyncEntityType.ALBUMTOASSETV1: SyncRequestType.ALBUMTOASSETSV1,
+    SyncEntityType.ALBUMTOASSETDELETEV1: SyncRequestType.ALBUMTOASSETSV1,
+    SyncEntityType.ALBUMTOASSETBACKFILLV1: SyncRequestType.ALBUMTOASSETSV1,
+    SyncEntityType.MEMORYV1: SyncRequestType.MEMORIESV1,
+    SyncEntityType.MEMORYDELETEV1: SyncRequestType.MEMORIESV1,
+    SyncEntityType.MEMORYTOASSETV1: SyncRequestType.MEMORYTOASSETSV1,
+    SyncEntityType.MEMORYTOASSETDELETEV1: SyncRequestType.MEMORYTOASSETSV1,
+    SyncEntityType.STACKV1: SyncRequestType.STACKSV1,
+    SyncEntityType.STACKDELETEV1: SyncRequestType.STACKSV1,
+    SyncEntityType.PERSONV1: SyncRequestType.PEOPLEV1,
+    SyncEntityType.PERSONDELETEV1: SyncRequestType.PEOPLEV1,
+    SyncEntityType.ASSETFACEV1: SyncRequestType.ASSETFACESV1,
+    SyncEntityType.ASSETFACEDELETEV1: SyncRequestType.ASSETFACESV1,
+    SyncEntityType.USERMETADATAV1: SyncRequestType.USERMETADATAV1,
+    SyncEntityType.USERMETADATADELETEV1: SyncRequestType.USERMETADATAV1,
+}
+
+
+def parse_sync_line(line: bytes | str) -> Optional[SyncEvent]:
+    """
+    Parse one line of the sync stream into a typed event.
+
+    :param line: A single JSON line of the form `{"type": ..., "data": ..., "ack": ...}`.
+    :return: The event, or None if the entity type is unknown to this client version.
+    """
+    raw = json.loads(line)
+    try:
+        entity_type = SyncEntityType(raw["type"])
+    except ValueError:
+        logger.warning(f"Skipping unknown sync entity type: {raw['type']}")
+        return None
+    model = SYNC_ENTITY_MODELS.get(entity_type)
+    data = raw.get("data")
+    return SyncEvent.model_construct(
+        type=entity_type,
+        data=model.model_validate(data) if model is not None and data else None,
+        ack=raw["ack"],
+    )
+
+
+async def iter_response_lines(
+    resp: RESTResponseType, *, chunk_size: int = CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Split a streamed response body into lines as it arrives.
+
+    Only the current partial line is buffered, so memory stays bounded by the longest line
+    rather than the size of the body. Empty lines are skipped.
+
+    :param resp: The raw response.
+    :param chunk_size: The maximum number of bytes to read from the network at once.
+    :return: An async iterator over the lines, without line terminators.
+    """
+    buf = b""
+    async for chunk in resp.content.iter_chunked(chunk_size):
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buf.strip():
+        yield buf
+
+
+async def iter_sync_events(
+    resp: RESTResponseType, *, chunk_size: int = CHUNK_SIZE
+) -> AsyncGenerator[SyncEvent, None]:
+    """
+    Parse a raw sync stream response into typed events, one line at a time.
+
+    The response is closed when the iterator is exhausted or closed.
+
+    :param resp: The raw response of `SyncApi.get_sync_stream_without_preload_content`.
+    :param chunk_size: The maximum number of bytes to read from the network at once.
+    :return: An async iterator over the events.
+    """
+    try:
+        await raise_for_status(resp)
+        async for line in iter_response_lines(resp, chunk_size=chunk_size):
+            event = parse_sync_line(line)
+            if event is not None:
+                yield event
+    finally:
+        if not resp.closed:
+            resp.close()
+
+
+class SyncAckBatcher:
+    """
+    Collect ack tokens of processed sync events and send them to the server in batches.
+
+    The server keeps one checkpoint per entity type, so only the latest ack of each type is sent.
+    Pending acks are flushed once `max_pending` events were added or `max_interval` seconds passed
+    since the last flush (checked whenever an event is added), on `SyncCompleteV1` checkpoints,
+    and when leaving the `async with` block, also if it is left with an error. Only acks of events
+    that were added are ever sent, so after a crash the next stream resumes right after the last
+    processed event that was flushed.
+
+    :param send_acks: A function that sends a list of ack tokens, e.g. wrapping `SyncApi.send_sync_ack`.
+    :param max_pending: The number of processed events after which pending acks are flushed.
+    :param max_interval: The number of seconds after which pending acks are flushed.
+    """
+
+    def __init__(
+        self,
+        send_acks: Callable[[list[str]], Awaitable[Any]],
+        *,
+        max_pending: int = 500,
+        max_interval: float = 5.0,
+    ) -> None:
+        if max_pending < 1:
+            raise ValueError("max_pending must be >= 1")
+        self.send_acks = send_acks
+        self.max_pending = max_pending
+        self.max_interval = max_interval
+        self._pending: dict[SyncEntityType, str] = {}
+        self._count = 0
+        self._last_flush = time.monotonic()
+
+    @property
+    def pending(self) -> int:
+        """The number of processed events whose acks were not sent yet."""
+        return self._count
+
+    async def add(self, event: SyncEvent) -> None:
+        """
+        Mark an event as processed, flushing if a batch limit is reached.
+
+        :param event: The processed event.
+        """
+        self._pending[event.type] = event.ack
+        self._count += 1
+        if (
+            event.type == SyncEntityType.SYNCCOMPLETEV1
+            or self._count >= self.max_pending
+            or time.monotonic() - self._last_flush >= self.max_interval
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Send all pending acks."""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        acks = list(self._pending.values())
+        await self.send_acks(acks)
+        logger.debug(f"Acknowledged {self._count} sync events with {len(acks)} acks")
+        self._pending.clear()
+        self._count = 0
+
+    async def __aenter__(self) -> "SyncAckBatcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.flush()
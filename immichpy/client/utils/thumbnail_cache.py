@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Union
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from immichpy.client.generated.models.asset_media_size import AssetMediaSize
+from immichpy.client.types import CacheStats
+from immichpy.client.utils.disk_cache import DATA_SUFFIX, META_SUFFIX, atomic_write
+
+logger = logging.getLogger(__name__)
+
+
+class CachedThumbnail(BaseModel):
+    """A thumbnail served from the local cache."""
+
+    data: bytes = Field(..., description="The image content.")
+    etag: Optional[str] = Field(
+        None, description="The ETag the server sent with the image, if any."
+    )
+    content_type: Optional[str] = Field(
+        None, description="The Content-Type the server sent with the image, if any."
+    )
+
+
+class ThumbnailCache:
+    """
+    Disk-backed LRU cache for asset thumbnails and previews.
+
+    Entries are keyed by asset ID, size and an optional version (e.g. the asset checksum or `updatedAt`).
+    The total size of all cache files, images and their metadata, is capped at `max_bytes`; the least
+    recently used entries are evicted first. Every entry is written to a temporary file and atomically moved into place, so
+    concurrent readers (and other processes sharing the directory) never see partial files.
+
+    The recency order is kept in memory and mirrored to file modification times, so it survives restarts.
+
+    :param directory: The directory to store cached images in. It is created if it does not exist.
+    :param max_bytes: The maximum total size of all cache files in bytes.
+    """
+
+    def __init__(
+        self, directory: Union[Path, str], *, max_bytes: int = 256 * 1024 * 1024
+    ) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be >= 0")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def make_key(
+        asset_id: Union[UUID, str],
+        size: Optional[AssetMediaSize] = None,
+        version: Optional[str] = None,
+    ) -> str:
+        """
+        Build the cache key for an asset image.
+
+        :param asset_id: The asset ID.
+        :param size: The image size. `None` means the server default.
+        :param version: Anything that changes when the asset changes, e.g. its checksum or `updatedAt`.
+        :return: The cache key.
+        """
+        size_value = size.value if size is not None else ""
+        raw = f"{asset_id}:{size_value}:{version or ''}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @property
+    def size(self) -> int:
+        """The total size of all cache files in bytes."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def stats(self) -> CacheStats:
+        """Return hit/miss counters and the current cache size."""
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            entries=len(self._entries),
+            bytes=self._size,
+        )
+
+    def _data_path(self, key: str) -> Path:
+        return self.directory / f"{key}{DATA_SUFFIX}"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}{META_SUFFIX}"
+
+    def _load(self) -> None:
+        files = []
+        for path in self.directory.glob(f"*{DATA_SUFFIX}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            try:
+                meta_size = self._meta_path(path.stem).stat().st_size
+            except FileNotFoundError:
+                meta_size = 0
+            files.append((st.st_mtime_ns, path.stem, st.st_size + meta_size))
+        for _, key, nbytes in sorted(files):
+            self._entries[key] = nbytes
+            self._size += nbytes
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            key, nbytes = self._entries.popitem(last=False)
+            self._size -= nbytes
+            self._unlink(key)
+
+    def _unlink(self, key: str) -> None:
+        for path in (self._data_path(key), self._meta_path(key)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def get_sync(self, key: str) -> Optional[CachedThumbnail]:
+        """
+        Look up a cached image and mark it as most recently used.
+
+        :param key: The cache key, see `make_key`.
+        :return: The cached image or None on a miss.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+        try:
+            data = self._data_path(key).read_bytes()
+            meta_path = self._meta_path(key)
+            meta = json.loads(meta_path.read_text()) if meta_path.exists() else {}
+            os.utime(self._data_path(key))
+        except (OSError, ValueError):
+            # Removed or corrupted by someone else; treat as a miss.
+            logger.debug(f"Dropping unreadable cache entry {key}")
+            self.discard_sync(key)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return CachedThumbnail(
+            data=data, etag=meta.get("etag"), content_type=meta.get("content_type")
+        )
+
+    def put_sync(
+        self,
+        key: str,
+        data: bytes,
+        *,
+        etag: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> None:
+        """
+        Store an image, evicting least recently used entries if the cache grows beyond `max_bytes`.
+
+        Entries larger than `max_bytes` are not cached.
+
+        :param key: The cache key, see `make_key`.
+        :param data: The image content.
+        :param etag: The ETag the server sent with the image, used for revalidation.
+        :param content_type: The Content-Type the server sent with the image.
+        """
+        fields = {"etag": etag, "content_type": content_type}
+        meta = json.dumps({k: v for k, v in fields.items() if v is not None}).encode()
+        nbytes = len(data) + len(meta)
+        if nbytes > self.max_bytes:
+            return
+        atomic_write(self._meta_path(key), meta)
+        atomic_write(self._data_path(key), data)
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+            self._entries[key] = nbytes
+            self._size += nbytes
+            self._evict()
+
+    def discard_sync(self, key: str) -> None:
+        """
+        Remove an entry from the cache.
+
+        :param key: The cache key, see `make_key`.
+        """
+        with self._lock:
+            self._size -= self._entries.pop(key, 0)
+        self._unlink(key)
+
+    def clear_sync(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._size = 0
+        for key in keys:
+            self._unlink(key)
+
+    async def get(self, key: str) -> Optional[CachedThumbnail]:
+        """Async version of `get_sync`; the file is read in a worker thread."""
+        return await asyncio.to_thread(self.get_sync, key)
+
+    async def put(
+        self,
+        key: str,
+        data: bytes,
+        *,
+        etag: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> None:
+        """Async version of `put_sync`; the file is written in a worker thread."""
+        await asyncio.to_thread(
+            self.put_sync, key, data, etag=etag, content_type=content_type
+        )
+
+    async def discard(self, key: str) -> None:
+        """Async version of `discard_sync`."""
+        await asyncio.to_thread(self.discard_sync, key)
+
+    async def clear(self) -> None:
+        """Async version of `clear_sync`."""
+        await asyncio.to_thread(self.clear_sync)
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from array import array
+from itertools import chain
+import math
+from typing import Any, Iterable, Iterator, Sequence
+
+from immichpy.client.generated.models.time_bucket_asset_response_dto import (
+    TimeBucketAssetResponseDto,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None  # type: ignore[assignment]
+
+# Columns stored as float64 arrays (missing values become NaN).
+NUMERIC_COLUMNS = ("ratio", "local_offset_hours", "latitude", "longitude")
+# Columns stored as boolean arrays.
+BOOL_COLUMNS = ("is_favorite", "is_image", "is_trashed")
+# Maps the JSON keys of a time bucket response to column names.
+COLUMN_NAMES: dict[str, str] = {
+    (field.alias or name): name
+    for name, field in TimeBucketAssetResponseDto.model_fields.items()
+}
+
+
+def _numeric(values: list[Any]) -> Sequence[float]:
+    if np is not None:
+        return np.array(values, dtype=np.float64)
+    return array("d", (math.nan if v is None else v for v in values))
+
+
+def _bool(values: list[Any]) -> Sequence[Any]:
+    # NumPy bool arrays, or signed char arrays of 0 and 1 without NumPy.
+    if np is not None:
+        return np.array(values, dtype=np.bool_)
+    return array("b", values)
+
+
+def _concat(parts: list[Any]) -> Any:
+    if np is not None and isinstance(parts[0], np.ndarray):
+        return np.concatenate(parts)
+    if isinstance(parts[0], array):
+        combined = parts[0][:]
+        for part in parts[1:]:
+            combined.extend(part)
+        return combined
+    return list(chain.from_iterable(parts))
+
+
+class TimelineRow:
+    """
+    Lazy view of a single asset in `TimelineColumns`. Attributes are read from the columns on access.
+    """
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: TimelineColumns, index: int) -> None:
+        self._columns = columns
+        self._index = index
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            value = self._columns[name][self._index]
+        except KeyError:
+            raise AttributeError(name) from None
+        if name in BOOL_COLUMNS:
+            return bool(value)
+        return value.item() if hasattr(value, "item") else value
+
+    def to_dict(self) -> dict[str, Any]:
+        """Copy the row into a dictionary of column name to value."""
+        return {name: getattr(self, name) for name in self._columns.names}
+
+    def __repr__(self) -> str:
+        return f"TimelineRow({self.to_dict()!r})"
+
+
+class TimelineColumns:
+    """
+    Column-oriented view of the assets of one or more timeline buckets.
+
+    Built directly from the JSON body of `get_time_bucket` without validating every element. Numeric
+    columns (`ratio`, `local_offset_hours`, `latitude`, `longitude`) are float64 arrays with NaN for
+    missing values and boolean columns (`is_favorite`, `is_image`, `is_trashed`) are boolean arrays.
+    Both are NumPy arrays if NumPy is installed, so they can be used in vectorized computations, and
+    `array.array` otherwise. All other columns are the parsed lists themselves.
+
+    Access a column by name (`columns["ratio"]`), a lazy row view by position (`columns.row(0)`),
+    or iterate over all rows.
+
+    :param columns: The columns by name. All columns must have the same length.
+    """
+
+    def __init__(self, columns: dict[str, Sequence[Any]]) -> None:
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+        self.columns = columns
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> TimelineColumns:
+        """
+        Create the view from a parsed time bucket response.
+
+        :param data: The JSON object returned by `get_time_bucket`.
+        :return: The columnar view.
+        """
+        columns: dict[str, Sequence[Any]] = {}
+        for key, values in data.items():
+            name = COLUMN_NAMES.get(key, key)
+            if name in NUMERIC_COLUMNS:
+                columns[name] = _numeric(values)
+            elif name in BOOL_COLUMNS:
+                columns[name] = _bool(values)
+            else:
+                columns[name] = values
+        return cls(columns)
+
+    @classmethod
+    def concat(cls, parts: Iterable[TimelineColumns]) -> TimelineColumns:
+        """
+        Concatenate several views, e.g. of all buckets of a timeline. Only columns present in all parts are kept.
+
+        :param parts: The views to concatenate.
+        :return: The combined view.
+        """
+        parts = list(parts)
+        if not parts:
+            return cls({})
+        names = [n for n in parts[0].names if all(n in p.columns for p in parts)]
+        return cls({n: _concat([p.columns[n] for p in parts]) for n in names})
+
+    @property
+    def names(self) -> list[str]:
+        """The names of all columns."""
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, name: str) -> Sequence[Any]:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def row(self, index: int) -> TimelineRow:
+        """
+        Get a lazy view of a single asset.
+
+        :param index: The position of the asset. Negative values count from the end.
+        :return: The row view.
+        """
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row index out of range")
+        return TimelineRow(self, index)
+
+    def __iter__(self) -> Iterator[TimelineRow]:
+        return (TimelineRow(self, i) for i in range(self._length))
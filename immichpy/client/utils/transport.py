@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import gzip
+import inspect
+import socket
+import ssl
+from typing import Any, Callable, Optional, Union
+
+import aiohttp
+from multidict import CIMultiDict
+from pydantic import BaseModel, Field
+
+# `happy_eyeballs_delay` needs aiohttp 3.10+, `socket_factory` needs 3.12+.
+_CONNECTOR_PARAMS = inspect.signature(aiohttp.TCPConnector).parameters
+
+SocketOption = tuple[int, int, Union[int, bytes]]
+
+
+class TransportConfig(BaseModel):
+    """
+    Connection pool and timeout settings of an `AsyncClient`.
+
+    The defaults are tuned for many concurrent requests against a single Immich server:
+
+    - Connections are kept alive for slightly less than the 5 second keep-alive timeout of the Node.js
+      server behind Immich, so idle connections are closed by the client before the server closes them
+      and a request never lands on a half-closed socket.
+    - DNS results are cached for 5 minutes instead of aiohttp's 10 seconds; a self-hosted server rarely
+      moves and a lookup per new connection adds latency under load.
+    - There is no total timeout. With a bounded pool, requests queue for a free connection, and a total
+      timeout would count that wait against them. Instead, establishing a connection and every read are
+      bounded, so a dead server is still detected quickly while long downloads keep streaming.
+    - Proxy settings are not read from the environment; aiohttp looks them up on every request, which cost
+      about a third of the throughput in `bin/bench/transport.py`. `Configuration.proxy` is still honoured.
+
+    aiohttp already sets `TCP_NODELAY` on every connection; `socket_options` adds further options such as
+    `(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)`.
+
+    For a server on the same host, `unix_socket` connects to a Unix domain socket instead (e.g. one the
+    reverse proxy listens on) and skips TCP and TLS entirely. The base URL still sets the `Host` header and
+    the path, e.g. `http://immich/api`. `connector_factory` plugs in any other aiohttp connector; DNS, happy
+    eyeballs and socket options do not apply to either.
+
+    Responses are always compressed when the server supports it: aiohttp asks for gzip and deflate, and
+    for br and zstd if Brotli (`aiohttp[speedups]`) or zstd support is installed, and decompresses them
+    transparently. With `compress_threshold`, JSON request bodies of at least that size, such as bulk
+    upload checks or bulk asset updates, are sent gzip-compressed as well. Like the connector settings,
+    this only applies to the session created from this config.
+    """
+
+    limit: int = Field(
+        100, description="The maximum number of connections. 0 means unlimited."
+    )
+    limit_per_host: int = Field(
+        0, description="The maximum number of connections per host. 0 means unlimited."
+    )
+    keepalive_timeout: Optional[float] = Field(
+        4.0,
+        description="The time in seconds an idle connection is kept open. None keeps connections open until the server closes them.",
+    )
+    ttl_dns_cache: Optional[int] = Field(
+        300,
+        description="The time in seconds DNS results are cached. None caches them forever.",
+    )
+    use_dns_cache: bool = Field(True, description="Whether to cache DNS results.")
+    happy_eyeballs_delay: Optional[float] = Field(
+        0.25,
+        description="The delay in seconds before trying the next address of a host (RFC 8305). None tries addresses one after another. Requires aiohttp 3.10+.",
+    )
+    socket_options: list[SocketOption] = Field(
+        default_factory=list,
+        description="Options set with `setsockopt` on every new socket, as (level, option, value). Requires aiohttp 3.12+.",
+    )
+    trust_env: bool = Field(
+        False,
+        description="Whether to read proxy settings (`HTTP_PROXY`, `HTTPS_PROXY`, `NO_PROXY`) and `.netrc` from the environment.",
+    )
+    unix_socket: Optional[str] = Field(
+        None, description="The path of a Unix domain socket to connect to."
+    )
+    connector_factory: Optional[Callable[[], aiohttp.BaseConnector]] = Field(
+        None,
+        description="Creates the connector of the session; overrides all other connector settings.",
+    )
+    compress_threshold: Optional[int] = Field(
+        None,
+        description="Send JSON request bodies of at least this many bytes gzip-compressed. None never compresses them.",
+    )
+    compress_level: int = Field(
+        6, ge=1, le=9, description="The gzip level of compressed request bodies."
+    )
+    total_timeout: Optional[float] = Field(
+        None,
+        description="The timeout in seconds for a whole request, including waiting for a connection from the pool.",
+    )
+    pool_timeout: Optional[float] = Field(
+        None,
+        description="The timeout in seconds for getting a connection, including waiting for one from the pool.",
+    )
+    connect_timeout: Optional[float] = Field(
+        10.0, description="The timeout in seconds for establishing a new connection."
+    )
+    read_timeout: Optional[float] = Field(
+        60.0,
+        description="The timeout in seconds between two reads from a connection.",
+    )
+
+    def timeout(self) -> aiohttp.ClientTimeout:
+        """Get the default timeout of a request."""
+        return aiohttp.ClientTimeout(
+            total=self.total_timeout,
+            connect=self.pool_timeout,
+            sock_connect=self.connect_timeout,
+            sock_read=self.read_timeout,
+        )
+
+    def request_timeout(self, value: Any = None) -> aiohttp.ClientTimeout:
+        """
+        Convert the `_request_timeout` argument of an API call.
+
+        :param value: None for the default timeout, a number for the total timeout, a (connect, read) pair or
+            an `aiohttp.ClientTimeout`.
+        :return: The timeout of the request.
+        """
+        if value is None:
+            return self.timeout()
+        if isinstance(value, aiohttp.ClientTimeout):
+            return value
+        if isinstance(value, tuple):
+            connect, read = value
+            return aiohttp.ClientTimeout(
+                total=self.total_timeout, sock_connect=connect, sock_read=read
+            )
+        return aiohttp.ClientTimeout(total=value)
+
+    def compress_json(self, data: str) -> Optional[bytes]:
+        """
+        Compress a serialized JSON request body if it reaches `compress_threshold`.
+
+        :param data: The JSON text of the body.
+        :return: The gzip-compressed body, or None if the body should be sent as is.
+        """
+        if self.compress_threshold is None or len(data) < self.compress_threshold:
+            return None
+        return gzip.compress(data.encode("utf-8"), compresslevel=self.compress_level)
+
+    def connector(
+        self, ssl_context: Optional[ssl.SSLContext] = None
+    ) -> aiohttp.BaseConnector:
+        """
+        Create a connector with these settings.
+
+        :param ssl_context: The SSL context for HTTPS connections.
+        :return: The connector of `connector_factory`, an `aiohttp.UnixConnector` if `unix_socket` is set,
+            and an `aiohttp.TCPConnector` otherwise.
+        """
+        if self.connector_factory is not None:
+            return self.connector_factory()
+        kwargs: dict[str, Any] = {
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+        }
+        if self.keepalive_timeout is None:
+            kwargs["keepalive_timeout"] = None
+        elif self.keepalive_timeout > 0:
+            kwargs["keepalive_timeout"] = self.keepalive_timeout
+        else:
+            kwargs["force_close"] = True
+        if self.unix_socket is not None:
+            return aiohttp.UnixConnector(self.unix_socket, **kwargs)
+
+        kwargs["use_dns_cache"] = self.use_dns_cache
+        kwargs["ttl_dns_cache"] = self.ttl_dns_cache
+        kwargs["ssl"] = ssl_context if ssl_context is not None else True
+        if "happy_eyeballs_delay" in _CONNECTOR_PARAMS:
+            kwargs["happy_eyeballs_delay"] = self.happy_eyeballs_delay
+        if self.socket_options:
+            if "socket_factory" not in _CONNECTOR_PARAMS:
+                raise ValueError("socket_options requires aiohttp>=3.12")
+            kwargs["socket_factory"] = self._socket_factory
+        return aiohttp.TCPConnector(**kwargs)
+
+    def session(
+        self, ssl_context: Optional[ssl.SSLContext] = None
+    ) -> aiohttp.ClientSession:
+        """
+        Create a session with these settings. Must be called from a running event loop.
+
+        :param ssl_context: The SSL context for HTTPS connections.
+        :return: A new `aiohttp.ClientSession`.
+        """
+        kwargs: dict[str, Any] = {}
+        if self.compress_threshold is not None:
+            kwargs["request_class"] = self._request_class()
+        return aiohttp.ClientSession(
+            connector=self.connector(ssl_context),
+            timeout=self.timeout(),
+            trust_env=self.trust_env,
+            **kwargs,
+        )
+
+    def _request_class(self) -> type[aiohttp.ClientRequest]:
+        # The generated REST client serializes JSON bodies to text right before handing them to aiohttp,
+        # so large ones are compressed where aiohttp builds the request, after all request preparation.
+        transport = self
+
+        class CompressingRequest(aiohttp.ClientRequest):
+            def __init__(self, *args: Any, **kwargs: Any) -> None:
+                data = kwargs.get("data")
+                headers = CIMultiDict(kwargs.get("headers") or {})
+                if (
+                    isinstance(data, str)
+                    and "json" in headers.get("Content-Type", "").lower()
+                    and "Content-Encoding" not in headers
+                ):
+                    compressed = transport.compress_json(data)
+                    if compressed is not None:
+                        headers["Content-Encoding"] = "gzip"
+                        kwargs.update(data=compressed, headers=headers)
+                super().__init__(*args, **kwargs)
+
+        return CompressingRequest
+
+    def _socket_factory(self, addr_info: tuple) -> socket.socket:
+        family, type_, proto, _, _ = addr_info
+        sock = socket.socket(family=family, type=type_, proto=proto)
+        for level, option, value in self.socket_options:
+            sock.setsockopt(level, option, value)
+        return sock
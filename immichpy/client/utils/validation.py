@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import functools
+import types
+from typing import Any, Callable
+
+
+@functools.lru_cache(maxsize=None)
+def _raw_functions(cls: type) -> tuple[tuple[str, Callable[..., Any]], ...]:
+    # Generated methods and wrappers such as `cached_operation` expose their unvalidated version.
+    raw = []
+    for name in dir(cls):
+        function = getattr(getattr(cls, name), "raw_function", None)
+        if function is not None:
+            raw.append((name, function))
+    return tuple(raw)
+
+
+def disable_validation(api: object) -> None:
+    """
+    Bypass pydantic's `@validate_call` for all generated and cached methods of an API group instance.
+
+    Arguments are then passed to the serializer as they are, without being validated or coerced, so they
+    must already have the annotated types (e.g. DTO instances, not dicts). Methods of the wrapper classes
+    that call generated methods use the unvalidated ones as well.
+
+    :param api: An API group, e.g. `client.assets`.
+    """
+    for name, function in _raw_functions(type(api)):
+        setattr(api, name, types.MethodType(function, api))
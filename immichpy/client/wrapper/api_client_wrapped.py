@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar
+import copy
+import logging
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+import uuid
+
+from pydantic_core import to_jsonable_python
+
+from immichpy.client.generated import rest
+from immichpy.client.generated.api.server_api import ServerApi
+from immichpy.client.generated.api_client import ApiClient
+from immichpy.client.generated.api_response import ApiResponse, T as ApiResponseT
+from immichpy.client.utils.buffered_response import BufferedRESTResponse
+from immichpy.client.utils.circuit_breaker import CircuitBreaker
+from immichpy.client.utils.http_cache import CachedResponse, HttpCache
+from immichpy.client.utils.rate_limit import RateLimiter
+from immichpy.client.utils.retry import (
+    RETRY_ERRORS,
+    RetryPolicy,
+    record_positions,
+    rewind_post_params,
+)
+from immichpy.client.utils.transport import TransportConfig
+
+logger = logging.getLogger(__name__)
+
+# Element types of lists that are serialized in one call (e.g. the IDs of bulk DTOs).
+_SCALAR_TYPES = frozenset({str, int, float, bool, uuid.UUID})
+
+# Set while the circuit breaker probes the server, so the probe bypasses the breaker and retries.
+_probing: ContextVar[bool] = ContextVar("_probing", default=False)
+
+
+def _is_json(content_type: Optional[str]) -> bool:
+    return content_type is not None and "json" in content_type.lower()
+
+
+def _consume_exception(future: asyncio.Future[Any]) -> None:
+    # followers retrieve the exception themselves; avoid "exception was never retrieved" without any
+    if not future.cancelled():
+        future.exception()
+
+
+class _CachingRESTResponse(rest.RESTResponse):
+    # Stores the response in the HTTP cache once its body is read. The `*_without_preload_content` methods
+    # hand out the underlying response instead, so streamed bodies are never buffered for the cache.
+
+    def __init__(self, response: rest.RESTResponse, cache: HttpCache, key: str) -> None:
+        super().__init__(response.response)
+        self._cache = cache
+        self._key = key
+
+    async def read(self):
+        if self.data is None:
+            body = await super().read()
+            headers = self.headers
+            entry = CachedResponse(
+                etag=headers.get("ETag"),
+                last_modified=headers.get("Last-Modified"),
+                headers=list(headers.items()),
+                body=body,
+            )
+            await self._cache.put(self._key, entry)
+        return self.data
+
+
+class ApiClientWrapped(ApiClient):
+    """
+    Wrapper for the generated ApiClient that adds optional transport features.
+
+    :param configuration: The configuration of the client.
+    :param http_cache: Revalidate GET responses with ETag / Last-Modified, see `HttpCache`.
+    :param coalesce_requests: Share one in-flight request and one deserialized result among identical
+        concurrent GET requests (same URL and credentials). Every caller gets its own copy of the result.
+    :param rate_limiter: Limit the rate and concurrency of all requests, see `RateLimiter`.
+    :param retry_policy: Retry transient failures of idempotent requests, see `RetryPolicy`.
+    :param circuit_breaker: Fail fast while a server is unhealthy, see `CircuitBreaker`.
+    :param transport: Connection pool and timeout settings, see `TransportConfig`. The connector settings
+        only apply to the session created by the client, not to one assigned to `rest_client.pool_manager`.
+    """
+
+    def __init__(
+        self,
+        configuration=None,
+        header_name=None,
+        header_value=None,
+        cookie=None,
+        *,
+        http_cache: Optional[HttpCache] = None,
+        coalesce_requests: bool = False,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[TransportConfig] = None,
+    ) -> None:
+        super().__init__(configuration, header_name, header_value, cookie)
+        self.http_cache = http_cache
+        self.coalesce_requests = coalesce_requests
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.transport = transport
+        self._in_flight: dict[str, asyncio.Future[Optional[BufferedRESTResponse]]] = {}
+
+    def with_configuration(self, configuration) -> ApiClientWrapped:
+        """
+        Create a client with another configuration (e.g. other credentials) that shares the REST client,
+        and with it the connection pool, and the transport features of this client.
+
+        :param configuration: The configuration of the new client.
+        :return: The new client.
+        """
+        client = copy.copy(self)
+        client.configuration = configuration
+        client.default_headers = dict(self.default_headers)
+        client.client_side_validation = configuration.client_side_validation
+        return client
+
+    async def call_api(
+        self,
+        method,
+        url,
+        header_params=None,
+        body=None,
+        post_params=None,
+        _request_timeout=None,
+    ) -> rest.RESTResponse:
+        args = (method, url, header_params, body, post_params, _request_timeout)
+        if method != "GET":
+            return await self._send(*args)
+        if self.coalesce_requests:
+            return await self._call_coalesced(*args)
+        return await self._call_cached(*args)
+
+    async def _call_coalesced(
+        self, method, url, header_params, body, post_params, _request_timeout
+    ) -> rest.RESTResponse:
+        args = (method, url, header_params, body, post_params, _request_timeout)
+        key = HttpCache.make_key(url, header_params)
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            shared = await asyncio.shield(flight)
+            if shared is not None:
+                return BufferedRESTResponse(
+                    shared.status,
+                    shared.reason,
+                    shared.headers.items(),
+                    shared.body,
+                    shared.shared_results,
+                )
+            # the leader's response could not be shared (e.g. a binary stream)
+            return await self._call_cached(*args)
+
+        flight = asyncio.get_running_loop().create_future()
+        flight.add_done_callback(_consume_exception)
+        self._in_flight[key] = flight
+        try:
+            response = await self._call_cached(*args)
+            shared = None
+            if _is_json(response.headers.get("Content-Type")):
+                if not isinstance(response, BufferedRESTResponse):
+                    response = BufferedRESTResponse(
+                        response.status,
+                        response.reason,
+                        response.headers.items(),
+                        await response.read(),
+                    )
+                shared = response
+            flight.set_result(shared)
+            return response
+        except asyncio.CancelledError:
+            flight.set_result(None)  # let followers send their own request
+            raise
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def _call_cached(
+        self, method, url, header_params, body, post_params, _request_timeout
+    ) -> rest.RESTResponse:
+        cache = self.http_cache
+        if cache is None:
+            return await self._send(
+                method, url, header_params, body, post_params, _request_timeout
+            )
+
+        key = cache.make_key(url, header_params)
+        entry = await cache.get(key)
+        if entry is not None:
+            header_params = {**(header_params or {}), **entry.validators()}
+        response = await self._send(
+            method, url, header_params, body, post_params, _request_timeout
+        )
+
+        if response.status == 304 and entry is not None:
+            response.response.release()
+            cache.hits += 1
+            return BufferedRESTResponse(
+                200, "OK", entry.headers, entry.body, entry.parsed
+            )
+
+        cache.misses += 1
+        headers = response.headers
+        if (
+            response.status == 200
+            and _is_json(headers.get("Content-Type"))
+            and (headers.get("ETag") or headers.get("Last-Modified"))
+        ):
+            return _CachingRESTResponse(response, cache, key)
+        return response
+
+    async def _send(
+        self, method, url, header_params, body, post_params, _request_timeout
+    ) -> rest.RESTResponse:
+        args = (method, url, header_params, body, post_params, _request_timeout)
+        policy = self.retry_policy
+        if policy is None or _probing.get():
+            return await self._attempt(*args)
+
+        idempotent = policy.is_idempotent(method, url, self.configuration.host)
+        positions = record_positions(post_params) if idempotent else {}
+        policy.budget.deposit()
+        attempt = 1
+        while True:
+            may_retry = idempotent and attempt < policy.attempts
+            try:
+                response = await self._attempt(*args)
+            except RETRY_ERRORS as e:
+                if not (
+                    may_retry
+                    and rewind_post_params(post_params, positions)
+                    and policy.budget.withdraw()
+                ):
+                    raise
+                delay = policy.delay(attempt)
+                logger.debug(f"Retrying {method} {url} in {delay:.2f}s after {e!r}")
+            else:
+                if not (
+                    response.status in policy.statuses
+                    and may_retry
+                    and rewind_post_params(post_params, positions)
+                    and policy.budget.withdraw()
+                ):
+                    return response
+                delay = policy.delay(attempt, response.headers.get("Retry-After"))
+                response.response.release()
+                logger.debug(
+                    f"Retrying {method} {url} in {delay:.2f}s after status {response.status}"
+                )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _attempt(
+        self, method, url, header_params, body, post_params, _request_timeout
+    ) -> rest.RESTResponse:
+        args = (method, url, header_params, body, post_params, _request_timeout)
+        breaker = self.circuit_breaker
+        if breaker is None or _probing.get():
+            return await self._limited(*args)
+
+        host = urlsplit(url).netloc
+        await breaker.before_request(host, self._probe)
+        try:
+            response = await self._limited(*args)
+        except RETRY_ERRORS:
+            breaker.record_failure(host)
+            raise
+        breaker.record_status(host, response.status)
+        return response
+
+    async def _probe(self) -> None:
+        assert self.circuit_breaker is not None
+        token = _probing.set(True)
+        try:
+            await ServerApi(self).ping_server(
+                _request_timeout=self.circuit_breaker.probe_timeout
+            )
+        finally:
+            _probing.reset(token)
+
+    async def _limited(
+        self, method, url, header_params, body, post_params, _request_timeout
+    ) -> rest.RESTResponse:
+        transport = self.transport
+        if transport is not None:
+            _request_timeout = transport.request_timeout(_request_timeout)
+            rest_client = self.rest_client
+            if rest_client.pool_manager is None:
+                rest_client.pool_manager = transport.session(rest_client.ssl_context)
+        args = (method, url, header_params, body, post_params, _request_timeout)
+        limiter = self.rate_limiter
+        if limiter is None:
+            return await super().call_api(*args)
+
+        group = limiter.operation_group(url, self.configuration.host)
+        async with limiter.limit(group):
+            start = time.monotonic()
+            status = None
+            try:
+                response = await super().call_api(*args)
+                status = response.status
+                return response
+            finally:
+                limiter.record(group, time.monotonic() - start, status)
+
+    def sanitize_for_serialization(self, obj):
+        # Long lists of IDs are the bulk of large request bodies; convert them in one call instead of
+        # recursing into every element.
+        if type(obj) is list and obj and all(type(v) in _SCALAR_TYPES for v in obj):
+            return to_jsonable_python(obj)
+        return super().sanitize_for_serialization(obj)
+
+    def response_deserialize(
+        self,
+        response_data: rest.RESTResponse,
+        response_types_map: Optional[Dict[str, ApiResponseT]] = None,
+    ) -> ApiResponse[ApiResponseT]:
+        response_type = (response_types_map or {}).get(str(response_data.status))
+        if not isinstance(response_data, BufferedRESTResponse) or response_type is None:
+            return super().response_deserialize(response_data, response_types_map)
+
+        shared = response_data.shared_results
+        key = str(response_type)
+        if key not in shared:
+            result = super().response_deserialize(response_data, response_types_map)
+            shared[key] = result.data
+        # copies keep the shared result intact when a caller modifies theirs
+        return ApiResponse(
+            status_code=response_data.status,
+            data=copy.deepcopy(shared[key]),
+            headers=response_data.headers,
+            raw_data=response_data.body,
+        )
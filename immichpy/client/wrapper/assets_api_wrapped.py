@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 from uuid import UUID
 
 from pydantic import StrictStr
@@ -17,8 +17,19 @@ from immichpy.client.utils.upload import (
     update_albums,
     upload_files,
 )
-from immichpy.client.utils.download import download_file, resolve_output_filename
-from immichpy.client.types import HeadersType, UploadResult, UploadStats
+from immichpy.client.utils.download import (
+    CHUNK_SIZE,
+    bind_request,
+    download_file,
+    h,
+    iter_response_bytes,
+    raise_for_status,
+    read_response_bytes,
+    resolve_output_filename,
+)
+from immichpy.client.utils.content_store import ContentStore
+from immichpy.client.utils.thumbnail_cache import ThumbnailCache
+from immichpy.client.types import FsyncPolicy, HeadersType, UploadResult, UploadStats
 
 
 class AssetsApiWrapped(AssetsApi):
@@ -32,6 +43,10 @@ class AssetsApiWrapped(AssetsApi):
         slug: Optional[StrictStr] = None,
         filename: Optional[str] = None,
         show_progress: bool = False,
+        store: Optional[ContentStore] = None,
+        checksum: Optional[str] = None,
+        preallocate: bool = False,
+        fsync: FsyncPolicy = "never",
         **kwargs: Any,
     ) -> Path:
         """
@@ -43,6 +58,10 @@ class AssetsApiWrapped(AssetsApi):
         :param slug: Public share slug for custom share URLs (the last path segment of `/s/<slug>`). Allows access without authentication. Typically you pass either `slug` or `key`.
         :param filename: The filename to use. If not provided, we use the original filename from the headers or default to "orig-" + asset_id.
         :param show_progress: Whether to show a progress bar while downloading.
+        :param store: A content-addressed store. If provided, each unique original is downloaded once into the store and then linked to `out_dir`. In that case `filename` is used as-is and defaults to the asset's original file name.
+        :param checksum: The asset checksum (as returned by the server), used with `store`. If not provided, it is looked up with `get_asset_info`.
+        :param preallocate: Whether to reserve the full file size on disk before writing, if the server sends `Content-Length`.
+        :param fsync: When to flush the file to stable storage: `never` (default), on `close`, or `always` (after every chunk).
         :param kwargs: Additional arguments to pass to the `download_asset_without_preload_content` method.
         :return: The path to the downloaded file.
 
@@ -60,6 +79,26 @@ class AssetsApiWrapped(AssetsApi):
                 **kwargs,
             )
 
+        if store is not None:
+            if checksum is None or filename is None:
+                info = await self.get_asset_info(id=id, key=key, slug=slug)
+                checksum = checksum or info.checksum
+                filename = filename or info.original_file_name
+
+            async def fetch(tmp_dir: Path) -> Path:
+                return await download_file(
+                    make_request=make_request,
+                    out_dir=tmp_dir,
+                    resolve_filename=lambda headers: "object",
+                    show_progress=show_progress,
+                    preallocate=preallocate,
+                    fsync=fsync,
+                )
+
+            return await store.materialize(
+                checksum, out_dir / Path(filename).name, fetch
+            )
+
         return await download_file(
             make_request=make_request,
             out_dir=out_dir,
@@ -69,6 +108,8 @@ class AssetsApiWrapped(AssetsApi):
                 default_base=f"orig-{id}",
             ),
             show_progress=show_progress,
+            preallocate=preallocate,
+            fsync=fsync,
         )
 
     async def play_asset_video_to_file(
@@ -79,6 +120,8 @@ class AssetsApiWrapped(AssetsApi):
         slug: Optional[StrictStr] = None,
         filename: Optional[str] = None,
         show_progress: bool = False,
+        preallocate: bool = False,
+        fsync: FsyncPolicy = "never",
         **kwargs: Any,
     ) -> Path:
         """
@@ -90,6 +133,8 @@ class AssetsApiWrapped(AssetsApi):
         :param slug: Public share slug for custom share URLs (the last path segment of `/s/<slug>`). Allows access without authentication. Typically you pass either `slug` or `key`.
         :param filename: The filename to use. If not provided, we use the original filename from the headers or default to "video-" + asset_id.
         :param show_progress: Whether to show a progress bar while downloading.
+        :param preallocate: Whether to reserve the full file size on disk before writing, if the server sends `Content-Length`.
+        :param fsync: When to flush the file to stable storage: `never` (default), on `close`, or `always` (after every chunk).
         :param kwargs: Additional arguments to pass to the [AssetsApi.play_asset_video_without_preload_content][] method.
         :return: The path to the downloaded file.
         """
@@ -113,6 +158,8 @@ class AssetsApiWrapped(AssetsApi):
                 default_base=f"video-{id}",
             ),
             show_progress=show_progress,
+            preallocate=preallocate,
+            fsync=fsync,
         )
 
     async def view_asset_to_file(
@@ -124,6 +171,8 @@ class AssetsApiWrapped(AssetsApi):
         slug: Optional[StrictStr] = None,
         filename: Optional[str] = None,
         show_progress: bool = False,
+        preallocate: bool = False,
+        fsync: FsyncPolicy = "never",
         **kwargs: Any,
     ) -> Path:
         """
@@ -136,6 +185,8 @@ class AssetsApiWrapped(AssetsApi):
         :param slug: Public share slug for custom share URLs (the last path segment of `/s/<slug>`). Allows access without authentication. Typically you pass either `slug` or `key`.
         :param filename: The filename to use. If not provided, we use the original filename from the headers or default to "thumb-" + asset_id.
         :param show_progress: Whether to show a progress bar while downloading.
+        :param preallocate: Whether to reserve the full file size on disk before writing, if the server sends `Content-Length`.
+        :param fsync: When to flush the file to stable storage: `never` (default), on `close`, or `always` (after every chunk).
         :param kwargs: Additional arguments to pass to the [AssetsApi.view_asset_without_preload_content][] method.
         :return: The path to the downloaded file.
         """
@@ -160,7 +211,237 @@ class AssetsApiWrapped(AssetsApi):
                 default_base=f"thumb-{id}",
             ),
             show_progress=show_progress,
+            preallocate=preallocate,
+            fsync=fsync,
+        )
+
+    def iter_asset_bytes(
+        self,
+        id: UUID,
+        key: Optional[StrictStr] = None,
+        slug: Optional[StrictStr] = None,
+        chunk_size: int = CHUNK_SIZE,
+        resume_attempts: int = 3,
+        **kwargs: Any,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream an asset's original file as chunks of bytes without writing it to disk.
+
+        The body is read from the network only as fast as the chunks are consumed. Dropped connections are resumed via HTTP Range requests; if the file changed in the meantime, a `RuntimeError` is raised.
+
+        :param id: The asset ID.
+        :param key: Public share key (the last path segment of a public share URL, i.e. `/share/<key>`). Typically you pass either `key` or `slug`.
+        :param slug: Public share slug for custom share URLs (the last path segment of `/s/<slug>`). Typically you pass either `slug` or `key`.
+        :param chunk_size: The maximum size of each chunk in bytes.
+        :param resume_attempts: How often to resume after a connection error before giving up.
+        :param kwargs: Additional arguments to pass to the `download_asset_without_preload_content` method.
+        :return: An async iterator over the file content.
+        :raises RuntimeError: If the content changed while resuming a dropped connection.
+        """
+
+        make_request = bind_request(
+            self.download_asset_without_preload_content,
+            id=id,
+            key=key,
+            slug=slug,
+            **kwargs,
+        )
+
+        return iter_response_bytes(
+            make_request, chunk_size=chunk_size, resume_attempts=resume_attempts
+        )
+
+    async def read_asset(
+        self,
+        id: UUID,
+        key: Optional[StrictStr] = None,
+        slug: Optional[StrictStr] = None,
+        resume_attempts: int = 3,
+        **kwargs: Any,
+    ) -> bytes:
+        """
+        Read an asset's original file into memory.
+
+        :param id: The asset ID.
+        :param key: Public share key (the last path segment of a public share URL, i.e. `/share/<key>`). Typically you pass either `key` or `slug`.
+        :param slug: Public share slug for custom share URLs (the last path segment of `/s/<slug>`). Typically you pass either `slug` or `key`.
+        :param resume_attempts: How often to resume after a connection error before giving up.
+        :param kwargs: Additional arguments to pass to the `download_asset_without_preload_content` method.
+        :return: The file content.
+        """
+
+        make_request = bind_request(
+            self.download_asset_without_preload_content,
+            id=id,
+            key=key,
+            slug=slug,
+            **kwargs,
+        )
+
+        return await read_response_bytes(make_request, resume_attempts=resume_attempts)
+
+    def iter_asset_video_bytes(
+        self,
+        id: UUID,
+        key: Optional[StrictStr] = None,
+        slug: Optional[StrictStr] = None,
+        chunk_size: int = CHUNK_SIZE,
+        resume_attempts: int = 3,
+        **kwargs: Any,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream an asset's video as chunks of bytes without writing it to disk.
+
+        :param id: The asset ID.
+        :param key: Public share key (the last path segment of a public share URL, i.e. `/share/<key>`). Typically you pass either `key` or `slug`.
+        :param slug: Public share slug for custom share URLs (the last path segment of `/s/<slug>`). Typically you pass either `slug` or `key`.
+        :param chunk_size: The maximum size of each chunk in bytes.
+        :param resume_attempts: How often to resume after a connection error before giving up.
+        :param kwargs: Additional arguments to pass to the [AssetsApi.play_asset_video_without_preload_content][] method.
+        :return: An async iterator over the video content.
+        :raises RuntimeError: If the content changed while resuming a dropped connection.
+        """
+
+        make_request = bind_request(
+            self.play_asset_video_without_preload_content,
+            id=id,
+            key=key,
+            slug=slug,
+            **kwargs,
+        )
+
+        return iter_response_bytes(
+            make_request, chunk_size=chunk_size, resume_attempts=resume_attempts
+        )
+
+    def iter_asset_thumbnail_bytes(
+        self,
+        id: UUID,
+        key: Optional[StrictStr] = None,
+        size: Optional[AssetMediaSize] = None,
+        slug: Optional[StrictStr] = None,
+        chunk_size: int = CHUNK_SIZE,
+        resume_attempts: int = 3,
+        **kwargs: Any,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream an asset's thumbnail as chunks of bytes without writing it to disk.
+
+        :param id: The asset ID.
+        :param key: Public share key (the last path segment of a public share URL, i.e. `/share/<key>`). Typically you pass either `key` or `slug`.
+        :param size: Thumbnail size.
+        :param slug: Public share slug for custom share URLs (the last path segment of `/s/<slug>`). Typically you pass either `slug` or `key`.
+        :param chunk_size: The maximum size of each chunk in bytes.
+        :param resume_attempts: How often to resume after a connection error before giving up.
+        :param kwargs: Additional arguments to pass to the [AssetsApi.view_asset_without_preload_content][] method.
+        :return: An async iterator over the thumbnail content.
+        :raises RuntimeError: If the content changed while resuming a dropped connection.
+        """
+
+        make_request = bind_request(
+            self.view_asset_without_preload_content,
+            id=id,
+            key=key,
+            size=size,
+            slug=slug,
+            **kwargs,
+        )
+
+        return iter_response_bytes(
+            make_request, chunk_size=chunk_size, resume_attempts=resume_attempts
+        )
+
+    async def read_asset_thumbnail(
+        self,
+        id: UUID,
+        key: Optional[StrictStr] = None,
+        size: Optional[AssetMediaSize] = None,
+        slug: Optional[StrictStr] = None,
+        resume_attempts: int = 3,
+        **kwargs: Any,
+    ) -> bytes:
+        """
+        Read an asset's thumbnail into memory.
+
+        :param id: The asset ID.
+        :param key: Public share key (the last path segment of a public share URL, i.e. `/share/<key>`). Typically you pass either `key` or `slug`.
+        :param size: Thumbnail size.
+        :param slug: Public share slug for custom share URLs (the last path segment of `/s/<slug>`). Typically you pass either `slug` or `key`.
+        :param resume_attempts: How often to resume after a connection error before giving up.
+        :param kwargs: Additional arguments to pass to the [AssetsApi.view_asset_without_preload_content][] method.
+        :return: The thumbnail content.
+        """
+
+        make_request = bind_request(
+            self.view_asset_without_preload_content,
+            id=id,
+            key=key,
+            size=size,
+            slug=slug,
+            **kwargs,
+        )
+
+        return await read_response_bytes(make_request, resume_attempts=resume_attempts)
+
+    async def view_asset_cached(
+        self,
+        id: UUID,
+        cache: ThumbnailCache,
+        key: Optional[StrictStr] = None,
+        size: Optional[AssetMediaSize] = None,
+        slug: Optional[StrictStr] = None,
+        version: Optional[str] = None,
+        **kwargs: Any,
+    ) -> bytes:
+        """
+        Get an asset's thumbnail through a local disk cache.
+
+        If `version` is given (e.g. the asset's `checksum` or `updated_at` from a previous response), a cached
+        image is returned without contacting the server, since a changed asset gets a new cache key.
+        Without `version`, a cached image is revalidated with `If-None-Match`; the server then answers with
+        an empty `304 Not Modified` unless the thumbnail changed.
+
+        :param id: The asset ID.
+        :param cache: The cache to serve from and store into.
+        :param key: Public share key (the last path segment of a public share URL, i.e. `/share/<key>`). Typically you pass either `key` or `slug`.
+        :param size: Thumbnail size.
+        :param slug: Public share slug for custom share URLs (the last path segment of `/s/<slug>`). Typically you pass either `slug` or `key`.
+        :param version: Anything that changes when the asset changes, e.g. its checksum or `updatedAt`.
+        :param kwargs: Additional arguments to pass to the [AssetsApi.view_asset_without_preload_content][] method.
+        :return: The thumbnail content.
+        """
+        cache_key = cache.make_key(id, size, version)
+        cached = await cache.get(cache_key)
+        if cached is not None and version is not None:
+            return cached.data
+
+        headers = dict(kwargs.pop("_headers", None) or {})
+        if cached is not None and cached.etag:
+            headers["If-None-Match"] = cached.etag
+
+        resp = await self.view_asset_without_preload_content(
+            id=id,
+            key=key,
+            size=size,
+            slug=slug,
+            _headers=headers,
+            **kwargs,
+        )
+        try:
+            if resp.status == 304 and cached is not None:
+                return cached.data
+            await raise_for_status(resp)
+            data = await resp.read()
+        finally:
+            resp.close()
+
+        await cache.put(
+            cache_key,
+            data,
+            etag=h("ETag", resp.headers),
+            content_type=h("Content-Type", resp.headers),
         )
+        return data
 
     async def upload(
         self,
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import asyncio
+import time
 from uuid import UUID, uuid4
 from pathlib import Path
 from typing import Any, Optional
@@ -18,8 +20,9 @@ from pydantic import StrictStr
 from immichpy.client.generated.api.download_api import DownloadApi
 from immichpy.client.generated.models.asset_ids_dto import AssetIdsDto
 from immichpy.client.generated.models.download_info_dto import DownloadInfoDto
+from immichpy.client.utils.concurrency import AdaptiveConcurrencyLimiter
 from immichpy.client.utils.download import download_file
-from immichpy.client.types import HeadersType
+from immichpy.client.types import FsyncPolicy, HeadersType
 
 
 class DownloadApiWrapped(DownloadApi):
@@ -32,21 +35,31 @@ class DownloadApiWrapped(DownloadApi):
         key: Optional[StrictStr] = None,
         slug: Optional[StrictStr] = None,
         show_progress: bool = False,
+        concurrency: int = 1,
+        adaptive: bool = False,
+        preallocate: bool = False,
+        fsync: FsyncPolicy = "never",
         **kwargs: Any,
     ) -> list[Path]:
         """
         Download one or more asset archives and save them to ZIP files.
 
-        Note: This method intentionally downloads archives **sequentially** (not in parallel) by default.
+        Note: This method downloads archives **sequentially** (not in parallel) by default.
         Immich has to build ZIP archives server-side; parallelizing many archive requests can put significant
         CPU/disk load on the Immich server and may lead to timeouts or degraded performance for other users.
-        If you choose to parallelize, keep concurrency low and do so at your own risk.
+        If you raise `concurrency`, keep it low or enable `adaptive`, which starts with one archive at a time
+        and only adds parallelism while the server's time to first byte (the time it needs to start building
+        an archive) per byte of archive stays flat. Parallelism is halved again as soon as it rises.
 
         :param download_info: The download info (two-step flow; downloads all archives returned by `get_download_info`).
         :param out_dir: The directory to write the ZIP archive to.
         :param key: Public share key (the last path segment of a public share URL, i.e. `/share/<key>`). Allows access without authentication. Typically you pass either `key` or `slug`.
         :param slug: Public share slug for custom share URLs (the last path segment of `/s/<slug>`). Allows access without authentication. Typically you pass either `slug` or `key`.
         :param show_progress: Whether to show progress bars (per-archive bytes + overall archive count).
+        :param concurrency: The maximum number of archives to download at the same time. Defaults to 1.
+        :param adaptive: Whether to adapt the number of parallel downloads (up to `concurrency`) to the server's time to first byte.
+        :param preallocate: Whether to reserve the full file size on disk before writing, if the server sends `Content-Length`.
+        :param fsync: When to flush the file to stable storage: `never` (default), on `close`, or `always` (after every chunk).
         :param kwargs: Additional arguments to pass to the underlying SDK calls.
 
         :return: The list of paths to the downloaded archives.
@@ -54,6 +67,8 @@ class DownloadApiWrapped(DownloadApi):
         For exact request/response behavior, inspect `DownloadApi.download_archive_without_preload_content`
         in the generated client.
         """
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
         out_dir.mkdir(parents=True, exist_ok=True)
 
         # Normalize to a list of archive requests.
@@ -70,7 +85,7 @@ class DownloadApiWrapped(DownloadApi):
             for archive in info.archives
         ]
 
-        out_paths: list[Path] = []
+        limiter = AdaptiveConcurrencyLimiter(concurrency, adaptive=adaptive)
 
         progress_columns = [
             SpinnerColumn(),
@@ -87,32 +102,59 @@ class DownloadApiWrapped(DownloadApi):
                 f"[cyan]Downloading {len(archive_requests)} archives",
                 total=len(archive_requests),
             )
-            for asset_ids_dto, expected_size in archive_requests:
+
+            async def download_archive(
+                asset_ids_dto: AssetIdsDto, expected_size: int
+            ) -> Path:
                 filename = f"archive-{uuid4()}.zip"
+                ttfb_recorded = False
 
-                def make_request(extra_headers: Optional[HeadersType]):
-                    return self.download_archive_without_preload_content(
+                async def make_request(extra_headers: Optional[HeadersType]):
+                    nonlocal ttfb_recorded
+                    started = time.monotonic()
+                    resp = await self.download_archive_without_preload_content(
                         asset_ids_dto=asset_ids_dto,
                         key=key,
                         slug=slug,
                         _headers=kwargs.get("_headers", {}) | (extra_headers or {}),
                         **kwargs,
                     )
-
-                download_task = progress.add_task(
-                    f"[green]{filename}",
-                    total=expected_size or None,
-                )
-                await download_file(
-                    make_request=make_request,
-                    out_dir=out_dir,
-                    resolve_filename=lambda headers: filename,
-                    show_progress=show_progress,
-                    progress=progress,
-                    task_id=download_task,
-                    resumeable=False,  # zip files are not resumable
-                )
-                out_paths.append(out_dir / filename)
+                    if not ttfb_recorded:
+                        ttfb_recorded = True
+                        limiter.record_latency(
+                            time.monotonic() - started, size=expected_size or None
+                        )
+                    return resp
+
+                async with limiter:
+                    download_task = progress.add_task(
+                        f"[green]{filename}",
+                        total=expected_size or None,
+                    )
+                    await download_file(
+                        make_request=make_request,
+                        out_dir=out_dir,
+                        resolve_filename=lambda headers: filename,
+                        show_progress=show_progress,
+                        progress=progress,
+                        task_id=download_task,
+                        resumeable=False,  # zip files are not resumable
+                        preallocate=preallocate,
+                        fsync=fsync,
+                    )
                 progress.update(archives_task, advance=1)
-
-        return out_paths
+                return out_dir / filename
+
+            tasks = [
+                asyncio.ensure_future(download_archive(asset_ids_dto, expected_size))
+                for asset_ids_dto, expected_size in archive_requests
+            ]
+            try:
+                out_paths = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+        return list(out_paths)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Optional
+
+from immichpy.client.generated.api.map_api import MapApi
+from immichpy.client.utils.map_index import MapMarkerIndex
+
+
+class MapApiWrapped(MapApi):
+    """Wrapper for the MapApi that provides convenience methods."""
+
+    async def get_map_marker_index(
+        self,
+        cell_size: float = 1.0,
+        **kwargs: Any,
+    ) -> MapMarkerIndex:
+        """
+        Fetch all map markers and build a local spatial index over them.
+
+        Bounding box, radius and nearest neighbour queries on the index run locally without further requests.
+
+        :param cell_size: The size of a grid cell of the index in degrees.
+        :param kwargs: Additional arguments (filters) to pass to the `get_map_markers` method.
+        :return: The spatial index.
+        """
+        return MapMarkerIndex(await self.get_map_markers(**kwargs), cell_size=cell_size)
+
+    async def refresh_map_marker_index(
+        self,
+        index: MapMarkerIndex,
+        file_created_after: Optional[datetime] = None,
+        **kwargs: Any,
+    ) -> int:
+        """
+        Update a spatial index with the current map markers.
+
+        With `file_created_after`, only markers of assets created after that date are fetched and upserted,
+        which is cheap but does not notice removed or moved markers of older assets. Without it, all markers
+        are fetched and markers that no longer exist are removed from the index.
+
+        :param index: The index to update in place.
+        :param file_created_after: Only fetch markers of assets created after this date.
+        :param kwargs: Additional arguments (filters) to pass to the `get_map_markers` method.
+        :return: The number of markers fetched.
+        """
+        markers = await self.get_map_markers(
+            file_created_after=file_created_after, **kwargs
+        )
+        if file_created_after is None:
+            current = {m.id for m in markers}
+            index.remove([m.id for m in index if m.id not in current])
+        index.update(markers)
+        return len(markers)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncGenerator, Mapping, Optional
+
+from immichpy.client.generated.api.search_api import SearchApi
+from immichpy.client.generated.models.asset_response_dto import AssetResponseDto
+from immichpy.client.generated.models.metadata_search_dto import MetadataSearchDto
+from immichpy.client.generated.models.smart_search_dto import SmartSearchDto
+from immichpy.client.utils.pagination import iter_search_pages
+from immichpy.client.types import SmartSearchMatch
+from immichpy.client.utils.response_cache import ResponseCache, cached_operation
+
+# The maximum page size accepted by the search endpoints.
+SEARCH_PAGE_SIZE = 1000
+# The rank offset of reciprocal rank fusion; dampens the weight of the top ranks.
+RRF_K = 60
+
+
+class SearchApiWrapped(SearchApi):
+    """Wrapper for the SearchApi that provides convenience methods."""
+
+    response_cache: Optional[ResponseCache] = None
+    """Opt-in cache for `search_asset_statistics`, `get_explore_data` and `get_search_suggestions`."""
+
+    search_asset_statistics = cached_operation(SearchApi.search_asset_statistics)
+    get_explore_data = cached_operation(SearchApi.get_explore_data)
+    get_search_suggestions = cached_operation(SearchApi.get_search_suggestions)
+
+    def iter_search_assets(
+        self,
+        metadata_search_dto: MetadataSearchDto,
+        page_size: int = SEARCH_PAGE_SIZE,
+        prefetch: int = 2,
+        **kwargs: Any,
+    ) -> AsyncGenerator[AssetResponseDto, None]:
+        """
+        Iterate over all assets matching a metadata search, following the pagination automatically.
+
+        Upcoming pages are requested concurrently while the current page is consumed. Pagination starts
+        at `metadata_search_dto.page` (or the first page); its `size` is replaced by `page_size`.
+
+        :param metadata_search_dto: The search filters.
+        :param page_size: The number of assets per page (at most 1000).
+        :param prefetch: The number of pages to request ahead of the current one.
+        :param kwargs: Additional arguments to pass to the `search_assets` method.
+        :return: An async iterator over the matching assets.
+        """
+
+        async def fetch_page(page: int):
+            dto = metadata_search_dto.model_copy(
+                update={"page": page, "size": page_size}
+            )
+            return (await self.search_assets(dto, **kwargs)).assets
+
+        return iter_search_pages(
+            fetch_page,
+            start_page=int(metadata_search_dto.page or 1),
+            prefetch=prefetch,
+        )
+
+    def iter_search_smart(
+        self,
+        smart_search_dto: SmartSearchDto,
+        page_size: int = SEARCH_PAGE_SIZE,
+        prefetch: int = 2,
+        **kwargs: Any,
+    ) -> AsyncGenerator[AssetResponseDto, None]:
+        """
+        Iterate over all assets matching a smart search, following the pagination automatically.
+
+        Upcoming pages are requested concurrently while the current page is consumed. Pagination starts
+        at `smart_search_dto.page` (or the first page); its `size` is replaced by `page_size`.
+
+        :param smart_search_dto: The search query and filters.
+        :param page_size: The number of assets per page (at most 1000).
+        :param prefetch: The number of pages to request ahead of the current one.
+        :param kwargs: Additional arguments to pass to the `search_smart` method.
+        :return: An async iterator over the matching assets, best matches first.
+        """
+
+        async def fetch_page(page: int):
+            dto = smart_search_dto.model_copy(update={"page": page, "size": page_size})
+            return (await self.search_smart(dto, **kwargs)).assets
+
+        return iter_search_pages(
+            fetch_page,
+            start_page=int(smart_search_dto.page or 1),
+            prefetch=prefetch,
+        )
+
+    async def search_smart_many(
+        self,
+        queries: Mapping[str, SmartSearchDto],
+        pages: int = 1,
+        page_size: int = 100,
+        concurrency: int = 4,
+        **kwargs: Any,
+    ) -> list[SmartSearchMatch]:
+        """
+        Run several smart searches concurrently and merge their results.
+
+        Each query fetches up to `pages` pages, starting at its `page` (or the first page). At most `concurrency`
+        requests run at the same time. Assets matched by several queries appear once, with their rank in each
+        query and a reciprocal rank fusion score (the sum of `1 / (60 + rank)` over all queries).
+
+        :param queries: The searches by label, e.g. the tag to assign to the matches.
+        :param pages: The maximum number of pages to fetch per query.
+        :param page_size: The number of assets per page (at most 1000).
+        :param concurrency: The maximum number of concurrent requests.
+        :param kwargs: Additional arguments to pass to the `search_smart` method.
+        :return: The matched assets, best score first.
+        """
+        if pages < 1:
+            raise ValueError("pages must be >= 1")
+        if concurrency < 1:
+            raise ValueError("concurrency must be >= 1")
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(dto: SmartSearchDto) -> list[AssetResponseDto]:
+            assets: list[AssetResponseDto] = []
+            page = int(dto.page or 1)
+            for _ in range(pages):
+                update = {"page": page, "size": page_size}
+                async with semaphore:
+                    result = await self.search_smart(
+                        dto.model_copy(update=update), **kwargs
+                    )
+                assets.extend(result.assets.items)
+                if not result.assets.next_page or not result.assets.items:
+                    break
+                page += 1
+            return assets
+
+        tasks = [asyncio.ensure_future(run(dto)) for dto in queries.values()]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        matches: dict[str, SmartSearchMatch] = {}
+        for label, assets in zip(queries, results):
+            for rank, asset in enumerate(assets, start=1):
+                match = matches.get(asset.id)
+                if match is None:
+                    match = SmartSearchMatch.model_construct(
+                        asset=asset, ranks={}, score=0.0
+                    )
+                    matches[asset.id] = match
+                if label in match.ranks:
+                    continue  # the same asset on several pages of one query
+                match.ranks[label] = rank
+                match.score += 1 / (RRF_K + rank)
+        return sorted(matches.values(), key=lambda m: m.score, reverse=True)
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from immichpy.client.generated.api.server_api import ServerApi
+from immichpy.client.utils.response_cache import ResponseCache, cached_operation
+
+
+class ServerApiWrapped(ServerApi):
+    """Wrapper for the ServerApi that provides convenience methods."""
+
+    response_cache: Optional[ResponseCache] = None
+    """Opt-in cache for `get_server_statistics`."""
+
+    get_server_statistics = cached_operation(ServerApi.get_server_statistics)
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import aclosing
+from datetime import datetime, timezone
+import logging
+from typing import Any, AsyncGenerator, Awaitable, Callable, Optional
+from uuid import UUID
+
+from immichpy.client.generated.api.sync_api import SyncApi
+from immichpy.client.generated.api.users_api import UsersApi
+from immichpy.client.generated.models.asset_delta_sync_dto import AssetDeltaSyncDto
+from immichpy.client.generated.models.asset_full_sync_dto import AssetFullSyncDto
+from immichpy.client.generated.models.asset_response_dto import AssetResponseDto
+from immichpy.client.generated.models.sync_ack_set_dto import SyncAckSetDto
+from immichpy.client.generated.models.sync_stream_dto import SyncStreamDto
+from immichpy.client.types import SyncEvent
+from immichpy.client.utils.download import CHUNK_SIZE
+from immichpy.client.utils.sync_stream import SyncAckBatcher, iter_sync_events
+
+logger = logging.getLogger(__name__)
+
+# Large pages keep the number of round trips low while a page still fits comfortably in memory.
+FULL_SYNC_PAGE_SIZE = 5000
+
+
+class SyncApiWrapped(SyncApi):
+    """Wrapper for the SyncApi that provides convenience methods."""
+
+    async def iter_sync_stream(
+        self,
+        sync_stream_dto: SyncStreamDto,
+        chunk_size: int = CHUNK_SIZE,
+        **kwargs: Any,
+    ) -> AsyncGenerator[SyncEvent, None]:
+        """
+        Stream sync changes as typed events.
+
+        The JSON lines body is parsed line by line as it arrives and each line's `data` is parsed into the
+        matching `Sync*V1` model for its `SyncEntityType`, so memory use does not grow with the size of the
+        change log. Nothing is acknowledged automatically: send the `ack` tokens of processed events with
+        `send_sync_ack` to advance the server-side checkpoint.
+
+        :param sync_stream_dto: The entity types to sync and whether to reset the sync state.
+        :param chunk_size: The maximum number of bytes to read from the network at once.
+        :param kwargs: Additional arguments to pass to the `get_sync_stream_without_preload_content` method.
+        :return: An async iterator over the sync events.
+
+        For exact request/response behavior, inspect `SyncApi.get_sync_stream_without_preload_content`
+        in the generated client.
+        """
+        resp = await self.get_sync_stream_without_preload_content(
+            sync_stream_dto=sync_stream_dto, **kwargs
+        )
+        async with aclosing(iter_sync_events(resp, chunk_size=chunk_size)) as events:
+            async for event in events:
+                yield event
+
+    async def consume_sync_stream(
+        self,
+        sync_stream_dto: SyncStreamDto,
+        handler: Callable[[SyncEvent], Awaitable[Any]],
+        ack_batch_size: int = 500,
+        ack_interval: float = 5.0,
+        **kwargs: Any,
+    ) -> int:
+        """
+        Stream sync changes into a handler and acknowledge them automatically in batches.
+
+        Each event is acknowledged only after `handler` returned for it. Acks are batched by count
+        (`ack_batch_size`) and time (`ack_interval`), flushed on every `SyncCompleteV1` checkpoint and
+        when the stream ends. If the handler raises, the acks of all events processed before are flushed
+        before the error is re-raised, so calling this method again resumes with the failed event.
+
+        :param sync_stream_dto: The entity types to sync and whether to reset the sync state.
+        :param handler: An async function that processes a single event.
+        :param ack_batch_size: The number of processed events after which acks are sent.
+        :param ack_interval: The number of seconds after which acks are sent.
+        :param kwargs: Additional arguments to pass to the `get_sync_stream_without_preload_content` method.
+        :return: The number of processed events.
+        """
+
+        async def send_acks(acks: list[str]) -> None:
+            await self.send_sync_ack(SyncAckSetDto(acks=acks))
+
+        processed = 0
+        async with SyncAckBatcher(
+            send_acks, max_pending=ack_batch_size, max_interval=ack_interval
+        ) as batcher:
+            async with aclosing(
+                self.iter_sync_stream(sync_stream_dto, **kwargs)
+            ) as events:
+                async for event in events:
+                    await handler(event)
+                    await batcher.add(event)
+                    processed += 1
+        return processed
+
+    async def iter_full_sync(
+        self,
+        user_id: Optional[UUID] = None,
+        limit: int = FULL_SYNC_PAGE_SIZE,
+        updated_until: Optional[datetime] = None,
+        delta: bool = False,
+        on_deleted: Optional[Callable[[list[str]], Awaitable[Any]]] = None,
+        **kwargs: Any,
+    ) -> AsyncGenerator[AssetResponseDto, None]:
+        """
+        Iterate over all assets of a user with `get_full_sync_for_user`, following the keyset pagination.
+
+        The next page is requested while the current page is being consumed, so network latency overlaps
+        with processing. With `delta=True`, the full pass is followed by a `get_delta_sync` for changes made
+        after `updated_until`, so a consumer that processes everything ends up in sync with the server.
+
+        :param user_id: The user whose assets to sync. Defaults to the current user.
+        :param limit: The number of assets per page.
+        :param updated_until: Only include assets updated until this date. Defaults to now.
+        :param delta: Whether to follow up with a delta sync for changes made during the full pass.
+        :param on_deleted: An async function called with the IDs of assets deleted during the full pass (only with `delta=True`).
+        :param kwargs: Additional arguments to pass to the underlying SDK calls.
+        :return: An async iterator over the assets.
+        """
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        updated_until = updated_until or datetime.now(timezone.utc)
+
+        def fetch_page(last_id: Optional[UUID]) -> asyncio.Task[list[AssetResponseDto]]:
+            return asyncio.ensure_future(
+                self.get_full_sync_for_user(
+                    AssetFullSyncDto(
+                        lastId=last_id,
+                        limit=limit,
+                        updatedUntil=updated_until,
+                        userId=user_id,
+                    ),
+                    **kwargs,
+                )
+            )
+
+        next_page: Optional[asyncio.Task[list[AssetResponseDto]]] = fetch_page(None)
+        try:
+            while next_page is not None:
+                page = await next_page
+                next_page = (
+                    fetch_page(UUID(page[-1].id)) if len(page) >= limit else None
+                )
+                for asset in page:
+                    yield asset
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+                # Retrieve the outcome so a failed prefetch is not reported as never retrieved.
+                await asyncio.gather(next_page, return_exceptions=True)
+
+        if not delta:
+            return
+        if user_id is None:
+            user_id = UUID((await UsersApi(self.api_client).get_my_user(**kwargs)).id)
+        changes = await self.get_delta_sync(
+            AssetDeltaSyncDto(updatedAfter=updated_until, userIds=[user_id]), **kwargs
+        )
+        if changes.needs_full_sync:
+            logger.warning("Server requested a full sync right after a full sync")
+        if changes.deleted and on_deleted is not None:
+            await on_deleted(changes.deleted)
+        for asset in changes.upserted:
+            yield asset
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import json
+from typing import Any, AsyncIterator
+
+from pydantic import StrictStr
+
+from immichpy.client.generated.api.timeline_api import TimelineApi
+from immichpy.client.utils.download import raise_for_status
+from immichpy.client.utils.timeline import TimelineColumns
+
+
+class TimelineApiWrapped(TimelineApi):
+    """Wrapper for the TimelineApi that provides convenience methods."""
+
+    async def get_time_bucket_columns(
+        self,
+        time_bucket: StrictStr,
+        **kwargs: Any,
+    ) -> TimelineColumns:
+        """
+        Get the assets of a time bucket as a columnar view.
+
+        The response is parsed straight into columns without validating every element, which is much
+        faster than `get_time_bucket` for large buckets.
+
+        :param time_bucket: The time bucket identifier, e.g. "2024-01-01".
+        :param kwargs: Additional arguments (filters) to pass to the `get_time_bucket_without_preload_content` method.
+        :return: The assets of the bucket.
+        """
+        resp = await self.get_time_bucket_without_preload_content(
+            time_bucket=time_bucket, **kwargs
+        )
+        try:
+            await raise_for_status(resp)
+            data = json.loads(await resp.read())
+        finally:
+            if not resp.closed:
+                resp.close()
+        return TimelineColumns.from_json(data)
+
+    async def iter_time_bucket_columns(
+        self,
+        prefetch: int = 4,
+        **kwargs: Any,
+    ) -> AsyncIterator[tuple[str, TimelineColumns]]:
+        """
+        Iterate over all time buckets of a timeline as columnar views, in timeline order.
+
+        Up to `prefetch` buckets after the current one are fetched concurrently. Combine the results with
+        `TimelineColumns.concat` for timeline-wide analytics.
+
+        :param prefetch: The number of buckets to request ahead of the current one.
+        :param kwargs: Additional arguments (filters) to pass to `get_time_buckets` and `get_time_bucket_columns`.
+        :return: An async iterator over (time bucket, assets) pairs.
+        """
+        if prefetch < 0:
+            raise ValueError("prefetch must be >= 0")
+        buckets = [b.time_bucket for b in await self.get_time_buckets(**kwargs)]
+        remaining = iter(buckets)
+        pending: deque[tuple[str, asyncio.Future[TimelineColumns]]] = deque()
+
+        def fill() -> None:
+            while len(pending) <= prefetch:
+                bucket = next(remaining, None)
+                if bucket is None:
+                    return
+                pending.append(
+                    (
+                        bucket,
+                        asyncio.ensure_future(
+                            self.get_time_bucket_columns(bucket, **kwargs)
+                        ),
+                    )
+                )
+
+        fill()
+        try:
+            while pending:
+                bucket, task = pending.popleft()
+                columns = await task
+                fill()
+                yield bucket, columns
+        finally:
+            for _, task in pending:
+                task.cancel()
+            await asyncio.gather(*(t for _, t in pending), return_exceptions=True)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from typing import Optional
+
+import pytest
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from immichpy import AsyncClient
+from immichpy.client.generated.api_client import ApiClient
+from immichpy.client.generated.models.asset_bulk_delete_dto import AssetBulkDeleteDto
+from immichpy.client.generated.exceptions import NotFoundException
+from immichpy.client.generated.rest import RESTResponse
+
+VERSION = {"major": 2, "minor": 5, "patch": 2}
+
+
+class FakeResponse:
+    def __init__(
+        self, status: int, body: bytes = b"", headers: Optional[dict] = None
+    ) -> None:
+        self.status = status
+        self.reason = "OK"
+        self.headers = CIMultiDictProxy(CIMultiDict(headers or {}))
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    def release(self) -> None:
+        pass
+
+
+class SlowServer:
+    """Answers every request after a short delay and counts the requests."""
+
+    def __init__(self, status: int = 200, body: dict = VERSION) -> None:
+        self.status = status
+        self.body = body
+        self.requests: list[str] = []
+
+    async def __call__(self, method, url, headers=None, **kwargs) -> RESTResponse:
+        self.requests.append(url)
+        await asyncio.sleep(0.01)
+        return RESTResponse(
+            FakeResponse(
+                self.status,
+                json.dumps(self.body).encode(),
+                {"Content-Type": "application/json"},
+            )
+        )
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_gets_share_one_request(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = AsyncClient(base_url="http://localhost", coalesce_requests=True)
+    server = SlowServer()
+    monkeypatch.setattr(client.base_client.rest_client, "request", server)
+
+    results = await asyncio.gather(
+        *(client.server.get_server_version() for _ in range(10))
+    )
+
+    assert len(server.requests) == 1
+    assert all(r == results[0] for r in results)
+    assert len({id(r) for r in results}) == len(results)
+    results[0].minor = 6
+    assert results[1].minor == 5
+
+    await client.server.get_server_version()
+    assert len(server.requests) == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_different_requests_are_not_coalesced(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = AsyncClient(base_url="http://localhost", coalesce_requests=True)
+    server = SlowServer()
+    monkeypatch.setattr(client.base_client.rest_client, "request", server)
+
+    await asyncio.gather(
+        client.server.get_server_version(),
+        client.server.get_server_version(_headers={"x-api-key": "other"}),
+    )
+
+    assert len(server.requests) == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = AsyncClient(base_url="http://localhost", coalesce_requests=True)
+    server = SlowServer(status=404, body={"message": "not found"})
+    monkeypatch.setattr(client.base_client.rest_client, "request", server)
+
+    results = await asyncio.gather(
+        *(client.server.get_server_version() for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert len(server.requests) == 1
+    assert all(isinstance(r, NotFoundException) for r in results)
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_followers_retry_when_leader_is_cancelled(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = AsyncClient(base_url="http://localhost", coalesce_requests=True)
+    server = SlowServer()
+    monkeypatch.setattr(client.base_client.rest_client, "request", server)
+
+    leader = asyncio.ensure_future(client.server.get_server_version())
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(client.server.get_server_version())
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert (await follower).patch == 2
+    assert len(server.requests) == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_without_coalescing_every_call_is_sent(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = AsyncClient(base_url="http://localhost")
+    server = SlowServer()
+    monkeypatch.setattr(client.base_client.rest_client, "request", server)
+
+    await asyncio.gather(*(client.server.get_server_version() for _ in range(3)))
+
+    assert len(server.requests) == 3
+    await client.close()
+
+
+def test_scalar_lists_serialize_like_generated_client() -> None:
+    client = AsyncClient(base_url="http://localhost")
+    ids = [uuid.uuid4() for _ in range(3)]
+    dto = AssetBulkDeleteDto(ids=ids, force=True)
+
+    sanitized = client.base_client.sanitize_for_serialization(dto)
+
+    assert sanitized == ApiClient().sanitize_for_serialization(dto)
+    assert sanitized["ids"] == [str(i) for i in ids]
+    mixed = [ids[0], "a", 1, None]
+    assert client.base_client.sanitize_for_serialization(mixed) == [
+        str(ids[0]),
+        "a",
+        1,
+        None,
+    ]
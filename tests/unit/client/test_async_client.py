@@ -1,9 +1,15 @@
+from typing import Any
+
 import pytest
+from pydantic import ValidationError
 
 from immichpy import AsyncClient
 from immichpy.client.generated.api.assets_api import AssetsApi
 from immichpy.client.generated.api.users_api import UsersApi
 
+# Not a UUID; typed as Any to get past the type checker and reach the client-side validation.
+INVALID_ID: Any = "not-a-uuid"
+
 
 @pytest.mark.asyncio
 async def test_client_requires_base_url():
@@ -32,3 +38,33 @@ async def test_client_passes_parameters():
 async def test_client_normalizes_base_url():
     async with AsyncClient(base_url="http://localhost:2283/api/") as client:
         assert client.base_client.configuration.host == "http://localhost:2283/api"
+
+
+@pytest.mark.asyncio
+async def test_client_validates_requests_by_default():
+    async with AsyncClient(base_url="http://localhost:2283/api") as client:
+        with pytest.raises(ValidationError):
+            await client.assets.get_asset_info(INVALID_ID)
+
+
+@pytest.mark.asyncio
+async def test_client_skips_validation_when_disabled(monkeypatch: pytest.MonkeyPatch):
+    client = AsyncClient(base_url="http://localhost:2283/api", validate_requests=False)
+    urls = []
+
+    async def request(method, url, **kwargs):
+        urls.append(url)
+        raise RuntimeError("stop")
+
+    monkeypatch.setattr(client.base_client.rest_client, "request", request)
+
+    for c in (client, client.with_credentials(api_key="other")):
+        assert not c.base_client.client_side_validation
+        with pytest.raises(RuntimeError):
+            await c.assets.get_asset_info(INVALID_ID)
+
+    assert urls == ["http://localhost:2283/api/assets/not-a-uuid"] * 2
+    # Validated methods of other clients are unaffected
+    with pytest.raises(ValidationError):
+        await AssetsApi(client.base_client).get_asset_info(INVALID_ID)
+    await client.close()
@@ -80,3 +80,43 @@ async def test_reuse_injected_session():
 
     await session.close()
     assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_with_credentials_shares_session():
+    async with AsyncClient(base_url="http://localhost:2283/api") as client:
+        session = client.base_client.rest_client.pool_manager
+        assert session is not None
+        user = client.with_credentials(api_key="user-key")
+
+        assert user.base_client.rest_client is client.base_client.rest_client
+        assert user.assets.api_client is user.base_client
+        assert user.base_client.configuration.api_key == {"api_key": "user-key"}
+        assert client.base_client.configuration.api_key == {}
+
+        # Closing the derived client keeps the shared session open
+        await user.close()
+        assert client.base_client.rest_client.pool_manager is session
+        assert not session.closed
+
+    assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_with_credentials_sends_own_credentials(monkeypatch: pytest.MonkeyPatch):
+    client = AsyncClient(base_url="http://localhost:2283/api", api_key="admin-key")
+    alice = client.with_credentials(api_key="alice-key")
+    sent = []
+
+    async def request(method, url, headers: dict[str, str], **kwargs):
+        sent.append(headers["x-api-key"])
+        raise RuntimeError("stop")
+
+    monkeypatch.setattr(client.base_client.rest_client, "request", request)
+
+    for c in (alice, client):
+        with pytest.raises(RuntimeError):
+            await c.users.get_my_user()
+
+    assert sent == ["alice-key", "admin-key"]
+    await client.close()
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, cast
+from unittest.mock import AsyncMock
+
+import pytest
+
+from immichpy import AsyncClient
+from immichpy.client.generated.api_client import ApiClient
+from immichpy.client.generated.models.sync_entity_type import SyncEntityType
+from immichpy.client.generated.models.sync_request_type import SyncRequestType
+from immichpy.client.types import SyncEvent
+from immichpy.client.utils.changes import ChangeFeed
+from immichpy.client.utils.sync_stream import SYNC_REQUEST_TYPES, parse_sync_line
+from immichpy.client.wrapper.sync_api_wrapped import SyncApiWrapped
+
+
+def event(type: str, ack: str) -> SyncEvent:
+    parsed = parse_sync_line(json.dumps({"type": type, "data": {}, "ack": ack}))
+    assert parsed is not None
+    return parsed
+
+
+def make_feed(events: list[SyncEvent], **kwargs) -> tuple[ChangeFeed, AsyncMock]:
+    """Build a feed over a fake stream of `events`; returns it with the `send_sync_ack` mock."""
+    api = SyncApiWrapped(ApiClient())
+
+    async def stream(dto, **kwargs):
+        for e in events:
+            yield e
+
+    send_sync_ack = AsyncMock()
+    api.iter_sync_stream = cast(Any, stream)
+    api.send_sync_ack = send_sync_ack
+    return ChangeFeed(api, poll_interval=0, **kwargs), send_sync_ack
+
+
+def test_every_data_entity_type_has_a_request_type() -> None:
+    control = {
+        SyncEntityType.SYNCACKV1,
+        SyncEntityType.SYNCRESETV1,
+        SyncEntityType.SYNCCOMPLETEV1,
+    }
+    assert set(SYNC_REQUEST_TYPES) == set(SyncEntityType) - control
+
+
+@pytest.mark.asyncio
+async def test_request_types_follow_subscriptions() -> None:
+    feed, _ = make_feed([])
+    assert feed.request_types() == []
+
+    feed.subscribe(AsyncMock(), types=[SyncEntityType.ASSETV1])
+    feed.subscribe(
+        AsyncMock(), types=[SyncEntityType.ASSETDELETEV1, SyncEntityType.ALBUMV1]
+    )
+    assert feed.request_types() == [SyncRequestType.ALBUMSV1, SyncRequestType.ASSETSV1]
+
+    feed.subscribe(AsyncMock())
+    assert feed.request_types() == list(SyncRequestType)
+    await feed.stop()
+
+
+@pytest.mark.asyncio
+async def test_poll_fans_out_to_matching_subscribers() -> None:
+    events = [event("AssetV1", "1"), event("AlbumV1", "2"), event("AssetV1", "3")]
+    feed, send_sync_ack = make_feed(events)
+    assets: list[str] = []
+    everything: list[str] = []
+
+    async def on_asset(e: SyncEvent) -> None:
+        assets.append(e.ack)
+
+    async def on_any(e: SyncEvent) -> None:
+        everything.append(e.ack)
+
+    a = feed.subscribe(on_asset, types=[SyncEntityType.ASSETV1])
+    b = feed.subscribe(on_any)
+    assert await feed.poll() == 3
+    await a.drain()
+    await b.drain()
+
+    assert assets == ["1", "3"]
+    assert everything == ["1", "2", "3"]
+    send_sync_ack.assert_awaited_once()
+    await feed.stop()
+    assert feed.subscriptions == []
+
+
+@pytest.mark.asyncio
+async def test_full_queue_applies_backpressure() -> None:
+    events = [event("AssetV1", str(i)) for i in range(5)]
+    feed, _ = make_feed(events)
+    release = asyncio.Event()
+    handled: list[str] = []
+
+    async def slow(e: SyncEvent) -> None:
+        await release.wait()
+        handled.append(e.ack)
+
+    sub = feed.subscribe(slow, max_queue_size=2)
+    poll = asyncio.ensure_future(feed.poll())
+    await asyncio.sleep(0.01)
+
+    assert not poll.done()
+    assert sub.queue.full()
+
+    release.set()
+    await poll
+    await sub.drain()
+    assert handled == ["0", "1", "2", "3", "4"]
+    await feed.stop()
+
+
+@pytest.mark.asyncio
+async def test_failing_handler_does_not_stop_delivery() -> None:
+    feed, _ = make_feed([event("AssetV1", "1"), event("AssetV1", "2")])
+    handled: list[str] = []
+
+    async def flaky(e: SyncEvent) -> None:
+        if e.ack == "1":
+            raise RuntimeError("boom")
+        handled.append(e.ack)
+
+    sub = feed.subscribe(flaky)
+    await feed.poll()
+    await sub.drain()
+
+    assert handled == ["2"]
+    await feed.stop()
+
+
+@pytest.mark.asyncio
+async def test_acks_wait_for_all_handlers() -> None:
+    events = [event("AssetV1", str(i)) for i in range(4)]
+    feed, send_sync_ack = make_feed(events, ack_batch_size=2)
+    release = asyncio.Event()
+    handled: list[str] = []
+
+    async def slow(e: SyncEvent) -> None:
+        await release.wait()
+        handled.append(e.ack)
+
+    feed.subscribe(slow)
+    poll = asyncio.ensure_future(feed.poll())
+    await asyncio.sleep(0.01)
+
+    # The first batch is queued but not handled, so it is not acknowledged yet.
+    assert not poll.done()
+    send_sync_ack.assert_not_awaited()
+
+    release.set()
+    assert await poll == 4
+    assert handled == ["0", "1", "2", "3"]
+    assert send_sync_ack.await_count == 2
+    await feed.stop()
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_delivers_queued_events() -> None:
+    feed, _ = make_feed([])
+    handled: list[str] = []
+
+    async def handler(e: SyncEvent) -> None:
+        await asyncio.sleep(0)
+        handled.append(e.ack)
+
+    sub = feed.subscribe(handler)
+    for e in [event("AssetV1", "1"), event("AssetV1", "2")]:
+        await sub.put(e)
+    await feed.unsubscribe(sub)
+
+    assert handled == ["1", "2"]
+    assert feed.subscriptions == []
+
+
+@pytest.mark.asyncio
+async def test_feed_is_created_on_demand() -> None:
+    async with AsyncClient(base_url="http://localhost:2283/api") as client:
+        assert not hasattr(client, "changes")
+        feed = ChangeFeed(client.sync)
+        assert feed.sync_api is client.sync
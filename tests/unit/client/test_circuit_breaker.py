@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Optional, cast
+
+import aiohttp
+import pytest
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from immichpy import AsyncClient
+from immichpy.client.generated.exceptions import ServiceException
+from immichpy.client.generated.rest import RESTResponse
+from immichpy.client.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from immichpy.client.utils.retry import RetryPolicy
+
+VERSION = {"major": 2, "minor": 5, "patch": 2}
+HOST = "localhost:2283"
+
+
+class FakeResponse:
+    def __init__(self, status: int, body: Optional[dict] = None) -> None:
+        self.status = status
+        self.reason = "OK"
+        self.headers = CIMultiDictProxy(
+            CIMultiDict({"Content-Type": "application/json"})
+        )
+        self._body = json.dumps(body or {}).encode()
+
+    async def read(self) -> bytes:
+        return self._body
+
+    def release(self) -> None:
+        pass
+
+
+class Server:
+    """Answers with a fixed status (or raises) and records the requested URLs."""
+
+    def __init__(self, status: int = 503) -> None:
+        self.status = status
+        self.error: Optional[Exception] = None
+        self.requests: list[str] = []
+
+    async def __call__(self, method, url, headers=None, **kwargs) -> RESTResponse:
+        self.requests.append(url)
+        if self.error is not None:
+            raise self.error
+        if url.endswith("/server/ping"):
+            return RESTResponse(FakeResponse(self.status, {"res": "pong"}))
+        return RESTResponse(FakeResponse(self.status, VERSION))
+
+
+def make_client(
+    breaker: CircuitBreaker, retry_policy: Optional[RetryPolicy] = None
+) -> tuple[AsyncClient, Server]:
+    client = AsyncClient(
+        base_url=f"http://{HOST}/api",
+        circuit_breaker=breaker,
+        retry_policy=retry_policy,
+    )
+    server = Server()
+    client.base_client.rest_client.request = cast(Any, server)
+    return client, server
+
+
+@pytest.mark.asyncio
+async def test_opens_after_consecutive_failures_and_fails_fast() -> None:
+    breaker = CircuitBreaker(failure_threshold=3)
+    client, server = make_client(breaker)
+
+    for _ in range(3):
+        with pytest.raises(ServiceException):
+            await client.server.get_server_version()
+    assert breaker.state(HOST) == "open"
+
+    with pytest.raises(CircuitOpenError):
+        await client.server.get_server_version()
+    assert len(server.requests) == 3
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_count_as_failures() -> None:
+    breaker = CircuitBreaker(failure_threshold=2)
+    client, server = make_client(breaker)
+    server.error = aiohttp.ClientConnectionError("refused")
+
+    for _ in range(2):
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await client.server.get_server_version()
+
+    assert breaker.state(HOST) == "open"
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_success_resets_failure_count() -> None:
+    breaker = CircuitBreaker(failure_threshold=2)
+    client, server = make_client(breaker)
+
+    with pytest.raises(ServiceException):
+        await client.server.get_server_version()
+    server.status = 200
+    await client.server.get_server_version()
+    server.status = 503
+    with pytest.raises(ServiceException):
+        await client.server.get_server_version()
+
+    assert breaker.state(HOST) == "closed"
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_stops_retries() -> None:
+    breaker = CircuitBreaker(failure_threshold=2)
+    client, server = make_client(breaker, RetryPolicy(attempts=5, backoff=0))
+
+    with pytest.raises(CircuitOpenError):
+        await client.server.get_server_version()
+
+    assert len(server.requests) == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_half_open_probe_closes_circuit() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    client, server = make_client(breaker)
+
+    with pytest.raises(ServiceException):
+        await client.server.get_server_version()
+    await asyncio.sleep(0.02)
+    assert breaker.state(HOST) == "half_open"
+    server.status = 200
+
+    version = await client.server.get_server_version()
+
+    assert version.patch == 2
+    assert server.requests[-2].endswith("/server/ping")
+    assert breaker.state(HOST) == "closed"
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_probe_reopens_circuit() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    client, server = make_client(breaker, RetryPolicy(attempts=3, backoff=0))
+
+    with pytest.raises(CircuitOpenError):
+        await client.server.get_server_version()
+    await asyncio.sleep(0.02)
+    server.requests.clear()
+
+    with pytest.raises(CircuitOpenError):
+        await client.server.get_server_version()
+
+    assert len(server.requests) == 1
+    assert server.requests[0].endswith("/server/ping")
+    assert breaker.state(HOST) == "open"
+    await client.close()
+
+
+def test_rejects_invalid_threshold() -> None:
+    with pytest.raises(ValueError, match="failure_threshold must be >= 1"):
+        CircuitBreaker(failure_threshold=0)
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from immichpy.client.generated.api.download_api import DownloadApi
+from immichpy.client.generated.api_client import ApiClient
+from immichpy.client.generated.models.download_info_dto import DownloadInfoDto
+from immichpy.client.utils.concurrency import AdaptiveConcurrencyLimiter
+from immichpy.client.wrapper.download_api_wrapped import DownloadApiWrapped
+
+
+def test_limiter_validates_arguments() -> None:
+    with pytest.raises(ValueError, match="max_limit"):
+        AdaptiveConcurrencyLimiter(0)
+    with pytest.raises(ValueError, match="tolerance"):
+        AdaptiveConcurrencyLimiter(2, tolerance=0.5)
+    with pytest.raises(ValueError, match="window"):
+        AdaptiveConcurrencyLimiter(2, window=0)
+
+
+def test_non_adaptive_limiter_uses_max_limit() -> None:
+    limiter = AdaptiveConcurrencyLimiter(4, adaptive=False)
+    limiter.record_latency(10.0)
+    limiter.record_overload()
+
+    assert limiter.limit == 4
+
+
+def test_adaptive_limiter_grows_while_latency_is_flat() -> None:
+    limiter = AdaptiveConcurrencyLimiter(3)
+    assert limiter.limit == 1
+
+    for _ in range(5):
+        limiter.record_latency(1.0)
+
+    assert limiter.limit == 3
+
+
+def test_adaptive_limiter_backs_off_when_latency_rises() -> None:
+    limiter = AdaptiveConcurrencyLimiter(8, initial=8)
+    limiter.record_latency(1.0)
+    assert limiter.limit == 8
+
+    limiter.record_latency(2.0)
+    assert limiter.limit == 4
+    limiter.record_overload()
+    assert limiter.limit == 2
+
+
+def test_tiny_latencies_are_treated_as_min_latency() -> None:
+    limiter = AdaptiveConcurrencyLimiter(4, min_latency=0.1)
+    limiter.record_latency(0.001)
+    limiter.record_latency(0.05)
+
+    assert limiter.limit == 3
+
+
+def test_baseline_only_covers_recent_latencies() -> None:
+    limiter = AdaptiveConcurrencyLimiter(8, initial=8, window=2)
+    limiter.record_latency(0.2)
+    limiter.record_latency(1.0)
+    assert limiter.limit == 4
+
+    # The fast outlier dropped out of the window, so 1.0 is the new normal.
+    limiter.record_latency(1.0)
+    assert limiter.baseline() == 1.0
+    assert limiter.limit == 5
+
+
+def test_latencies_are_normalized_by_size() -> None:
+    limiter = AdaptiveConcurrencyLimiter(8, initial=4)
+    limiter.record_latency(1.0, size=1_000_000)
+    limiter.record_latency(3.0, size=3_000_000)
+
+    assert limiter.limit == 6
+
+
+@pytest.mark.asyncio
+async def test_limiter_bounds_active_holders() -> None:
+    limiter = AdaptiveConcurrencyLimiter(2, adaptive=False)
+    peak = 0
+
+    async def work() -> None:
+        nonlocal peak
+        async with limiter:
+            peak = max(peak, limiter.active)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[work() for _ in range(6)])
+
+    assert peak == 2
+    assert limiter.active == 0
+
+
+@pytest.mark.asyncio
+async def test_growing_limit_wakes_waiters() -> None:
+    limiter = AdaptiveConcurrencyLimiter(2)
+    await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    limiter.record_latency(1.0)
+    await asyncio.wait_for(waiter, timeout=1)
+
+    assert limiter.active == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_passes_wakeup_on() -> None:
+    limiter = AdaptiveConcurrencyLimiter(1, adaptive=False)
+    await limiter.acquire()
+    first = asyncio.ensure_future(limiter.acquire())
+    second = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+
+    await limiter.release()
+    first.cancel()
+    await asyncio.wait_for(second, timeout=1)
+
+    assert first.cancelled()
+    assert limiter.active == 1
+
+
+class ArchiveResponse:
+    def __init__(self, data: bytes):
+        self.status = 200
+        self.headers = {"Content-Length": str(len(data))}
+        self._data = data
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.closed = True
+
+    @property
+    def content(self):
+        data = self._data
+
+        class Content:
+            def iter_chunked(self, size):
+                async def _iter():
+                    await asyncio.sleep(0.01)
+                    yield data
+
+                return _iter()
+
+        return Content()
+
+
+def make_download_api(
+    num_archives: int, monkeypatch: pytest.MonkeyPatch
+) -> tuple[DownloadApiWrapped, list[int]]:
+    api = DownloadApiWrapped(ApiClient())
+    archives = [
+        MagicMock(asset_ids=[f"00000000-0000-0000-0000-00000000000{i}"], size=4)
+        for i in range(num_archives)
+    ]
+    # the wrapper calls super().get_download_info, so patch the generated class
+    monkeypatch.setattr(
+        DownloadApi,
+        "get_download_info",
+        AsyncMock(return_value=MagicMock(archives=archives)),
+    )
+    in_flight = [0, 0]  # current, peak
+
+    async def download_archive(**kwargs):
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight[1], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        return ArchiveResponse(b"zip!")
+
+    api.download_archive_without_preload_content = cast(Any, download_archive)
+    return api, in_flight
+
+
+@pytest.mark.asyncio
+async def test_download_archive_to_file_is_sequential_by_default(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    api, in_flight = make_download_api(3, monkeypatch)
+
+    paths = await api.download_archive_to_file(DownloadInfoDto(), tmp_path)
+
+    assert len(paths) == 3
+    assert all(p.read_bytes() == b"zip!" for p in paths)
+    assert in_flight[1] == 1
+
+
+@pytest.mark.asyncio
+async def test_download_archive_to_file_parallel(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    api, in_flight = make_download_api(4, monkeypatch)
+
+    paths = await api.download_archive_to_file(
+        DownloadInfoDto(), tmp_path, concurrency=4
+    )
+
+    assert len(paths) == 4
+    assert all(p.read_bytes() == b"zip!" for p in paths)
+    assert in_flight[1] == 4
+
+
+@pytest.mark.asyncio
+async def test_download_archive_to_file_rejects_invalid_concurrency(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    api, _ = make_download_api(1, monkeypatch)
+
+    with pytest.raises(ValueError, match="concurrency must be >= 1"):
+        await api.download_archive_to_file(DownloadInfoDto(), tmp_path, concurrency=0)
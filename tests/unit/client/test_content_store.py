@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import errno
+import hashlib
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+import uuid
+
+import pytest
+
+from immichpy.client.generated.api_client import ApiClient
+from immichpy.client.utils.content_store import ContentStore, checksum_to_hex
+from immichpy.client.wrapper.assets_api_wrapped import AssetsApiWrapped
+
+
+def b64_sha1(data: bytes) -> str:
+    return base64.b64encode(hashlib.sha1(data).digest()).decode()
+
+
+def make_fetch(data: bytes, calls: list[Path]):
+    async def fetch(tmp_dir: Path) -> Path:
+        calls.append(tmp_dir)
+        await asyncio.sleep(0)
+        path = tmp_dir / "object"
+        path.write_bytes(data)
+        return path
+
+    return fetch
+
+
+def test_checksum_to_hex_accepts_base64_and_hex() -> None:
+    data = b"content"
+    digest = hashlib.sha1(data).hexdigest()
+
+    assert checksum_to_hex(b64_sha1(data)) == digest
+    assert checksum_to_hex(digest.upper()) == digest
+    with pytest.raises(ValueError, match="Not a SHA1 checksum"):
+        checksum_to_hex("not-a-checksum")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_fetches_download_once(tmp_path: Path) -> None:
+    store = ContentStore(tmp_path / "store")
+    data = b"original"
+    calls: list[Path] = []
+    fetch = make_fetch(data, calls)
+
+    paths = await asyncio.gather(
+        *[store.get_or_fetch(b64_sha1(data), fetch) for _ in range(5)]
+    )
+
+    assert len(calls) == 1
+    assert len(set(paths)) == 1
+    assert paths[0].read_bytes() == data
+    assert b64_sha1(data) in store
+    assert store._locks == {}
+
+
+@pytest.mark.asyncio
+async def test_checksum_mismatch_is_rejected(tmp_path: Path) -> None:
+    store = ContentStore(tmp_path / "store")
+    calls: list[Path] = []
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        await store.get_or_fetch(b64_sha1(b"expected"), make_fetch(b"other", calls))
+    assert b64_sha1(b"expected") not in store
+
+
+@pytest.mark.asyncio
+async def test_materialize_hardlinks_into_every_tree(tmp_path: Path) -> None:
+    store = ContentStore(tmp_path / "store", link_mode="hardlink")
+    data = b"original"
+    calls: list[Path] = []
+    fetch = make_fetch(data, calls)
+
+    a = await store.materialize(b64_sha1(data), tmp_path / "a" / "img.jpg", fetch)
+    b = await store.materialize(b64_sha1(data), tmp_path / "b" / "img.jpg", fetch)
+
+    assert len(calls) == 1
+    assert a.read_bytes() == b.read_bytes() == data
+    assert (
+        a.stat().st_ino
+        == b.stat().st_ino
+        == store.object_path(b64_sha1(data)).stat().st_ino
+    )
+
+
+@pytest.mark.asyncio
+async def test_copy_mode_creates_independent_files(tmp_path: Path) -> None:
+    store = ContentStore(tmp_path / "store", link_mode="copy")
+    data = b"original"
+    calls: list[Path] = []
+
+    out = await store.materialize(
+        b64_sha1(data), tmp_path / "out.jpg", make_fetch(data, calls)
+    )
+
+    assert out.read_bytes() == data
+    assert out.stat().st_ino != store.object_path(b64_sha1(data)).stat().st_ino
+
+
+@pytest.mark.asyncio
+async def test_auto_mode_falls_back_to_copy(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def no_link(src, dst):
+        raise OSError(errno.EXDEV, "cross-device link")
+
+    monkeypatch.setattr("immichpy.client.utils.content_store.os.link", no_link)
+    monkeypatch.setattr("immichpy.client.utils.content_store.reflink", no_link)
+    store = ContentStore(tmp_path / "store")
+    data = b"original"
+
+    out = await store.materialize(
+        b64_sha1(data), tmp_path / "out.jpg", make_fetch(data, [])
+    )
+
+    assert out.read_bytes() == data
+
+
+@pytest.mark.asyncio
+async def test_auto_mode_does_not_fall_back_on_other_errors(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def no_space(src, dst):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr("immichpy.client.utils.content_store.os.link", no_space)
+    store = ContentStore(tmp_path / "store")
+    data = b"original"
+
+    with pytest.raises(OSError, match="No space left"):
+        await store.materialize(
+            b64_sha1(data), tmp_path / "out.jpg", make_fetch(data, [])
+        )
+    assert not (tmp_path / "out.jpg").exists()
+
+
+@pytest.mark.asyncio
+async def test_concurrently_created_destination_is_not_overwritten(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    dest = tmp_path / "out.jpg"
+
+    def raced_link(src, dst):
+        dest.write_bytes(b"local")
+        raise FileExistsError(errno.EEXIST, "File exists", str(dst))
+
+    monkeypatch.setattr("immichpy.client.utils.content_store.os.link", raced_link)
+    store = ContentStore(tmp_path / "store")
+    data = b"remote"
+
+    result = await store.materialize(b64_sha1(data), dest, make_fetch(data, []))
+
+    assert result == dest
+    assert dest.read_bytes() == b"local"
+
+
+@pytest.mark.asyncio
+async def test_existing_destination_is_left_untouched(tmp_path: Path) -> None:
+    store = ContentStore(tmp_path / "store")
+    dest = tmp_path / "out.jpg"
+    dest.write_bytes(b"local")
+    calls: list[Path] = []
+
+    result = await store.materialize(
+        b64_sha1(b"remote"), dest, make_fetch(b"remote", calls)
+    )
+
+    assert result.read_bytes() == b"local"
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_download_asset_to_file_with_store_fetches_once(tmp_path: Path) -> None:
+    data = b"original asset"
+    api = AssetsApiWrapped(ApiClient())
+    api.get_asset_info = AsyncMock(
+        return_value=MagicMock(checksum=b64_sha1(data), original_file_name="IMG_1.jpg")
+    )
+
+    class Response:
+        status = 200
+        headers = {"Content-Length": str(len(data))}
+        closed = False
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            self.close()
+
+        def close(self):
+            self.closed = True
+
+        @property
+        def content(self):
+            class Content:
+                def iter_chunked(self, size):
+                    async def _iter():
+                        yield data
+
+                    return _iter()
+
+            return Content()
+
+    api.download_asset_without_preload_content = AsyncMock(
+        side_effect=lambda **kwargs: Response()
+    )
+    store = ContentStore(tmp_path / "store")
+    asset_id = uuid.uuid4()
+
+    first = await api.download_asset_to_file(
+        asset_id, tmp_path / "album-a", store=store
+    )
+    second = await api.download_asset_to_file(
+        asset_id, tmp_path / "album-b", store=store
+    )
+
+    assert first == tmp_path / "album-a" / "IMG_1.jpg"
+    assert second == tmp_path / "album-b" / "IMG_1.jpg"
+    assert first.read_bytes() == second.read_bytes() == data
+    assert api.download_asset_without_preload_content.await_count == 1
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
+from uuid import uuid4
 
+import aiohttp
 import pytest
 
+from immichpy.client.generated.api_client import ApiClient
+from immichpy.client.generated.exceptions import NotFoundException
+from immichpy.client.wrapper import assets_api_wrapped
+from immichpy.client.wrapper.assets_api_wrapped import AssetsApiWrapped
 from immichpy.client.types import HeadersType
 import immichpy.client.utils.download as download_utils
 
@@ -417,3 +424,354 @@ async def test_download_file_cleans_up_temp_file_on_error(tmp_path: Path) -> Non
 
     # Temp file should not exist after error
     assert not (out_dir / "error.txt.temp").exists()
+
+
+@pytest.mark.asyncio
+async def test_async_file_writer_writes_in_order(tmp_path: Path) -> None:
+    """Test that queued chunks are written in submission order."""
+    path = tmp_path / "ordered.bin"
+    chunks = [bytes([i]) * 1000 for i in range(20)]
+
+    async with download_utils.AsyncFileWriter(path, max_pending=2) as writer:
+        for chunk in chunks:
+            await writer.write(chunk)
+
+    assert path.read_bytes() == b"".join(chunks)
+
+
+@pytest.mark.asyncio
+async def test_async_file_writer_offset_keeps_prefix(tmp_path: Path) -> None:
+    """Test that writing at an offset keeps the prefix and drops the rest."""
+    path = tmp_path / "offset.bin"
+    path.write_bytes(b"keep-drop")
+
+    async with download_utils.AsyncFileWriter(path, offset=5) as writer:
+        await writer.write(b"new")
+
+    assert path.read_bytes() == b"keep-new"
+
+
+@pytest.mark.asyncio
+async def test_async_file_writer_truncates_unused_preallocation(
+    tmp_path: Path,
+) -> None:
+    """Test that preallocated space not filled by the response is released."""
+    path = tmp_path / "prealloc.bin"
+
+    async with download_utils.AsyncFileWriter(path, preallocate=4096) as writer:
+        await writer.write(b"short")
+
+    assert path.read_bytes() == b"short"
+
+
+@pytest.mark.asyncio
+async def test_async_file_writer_fsync_policy(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that fsync is called per chunk (plus on close) for `always` and once for `close`."""
+    calls: list[int] = []
+    monkeypatch.setattr(download_utils.os, "fsync", lambda fd: calls.append(fd))
+
+    async with download_utils.AsyncFileWriter(
+        tmp_path / "always.bin", fsync="always"
+    ) as writer:
+        await writer.write(b"a")
+        await writer.write(b"b")
+    assert len(calls) == 3
+
+    calls.clear()
+    async with download_utils.AsyncFileWriter(
+        tmp_path / "close.bin", fsync="close"
+    ) as writer:
+        await writer.write(b"a")
+        await writer.write(b"b")
+    assert len(calls) == 1
+
+    calls.clear()
+    async with download_utils.AsyncFileWriter(tmp_path / "never.bin") as writer:
+        await writer.write(b"a")
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_async_file_writer_propagates_write_errors(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a failing write in the writer thread surfaces to the caller."""
+
+    def failing_write(self, chunk: bytes) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(download_utils.AsyncFileWriter, "_write", failing_write)
+
+    with pytest.raises(OSError, match="disk full"):
+        async with download_utils.AsyncFileWriter(tmp_path / "fail.bin") as writer:
+            await writer.write(b"a")
+
+
+@pytest.mark.asyncio
+async def test_async_file_writer_ignores_cancelled_writes(tmp_path: Path) -> None:
+    """Test that a cancelled pending write does not break later writes."""
+    async with download_utils.AsyncFileWriter(
+        tmp_path / "out.bin", max_pending=4
+    ) as writer:
+        cancelled = asyncio.get_running_loop().create_future()
+        cancelled.cancel()
+        writer._pending.append(cancelled)
+        await writer.write(b"a")
+        writer._pending.remove(cancelled)
+
+    assert (tmp_path / "out.bin").read_bytes() == b"a"
+
+
+@pytest.mark.asyncio
+async def test_to_file_wrappers_forward_preallocate_and_fsync(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the `*_to_file` wrappers pass the write options to download_file."""
+    calls: list[dict] = []
+
+    async def fake_download_file(**kwargs):
+        calls.append(kwargs)
+        return tmp_path / "out"
+
+    monkeypatch.setattr(assets_api_wrapped, "download_file", fake_download_file)
+    api = AssetsApiWrapped(ApiClient())
+    asset_id = uuid4()
+
+    await api.download_asset_to_file(
+        asset_id, tmp_path, preallocate=True, fsync="close"
+    )
+    await api.view_asset_to_file(asset_id, tmp_path, fsync="always")
+    await api.play_asset_video_to_file(asset_id, tmp_path, preallocate=True)
+
+    assert [(c["preallocate"], c["fsync"]) for c in calls] == [
+        (True, "close"),
+        (False, "always"),
+        (True, "never"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_download_file_preallocate_and_fsync(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that preallocation and fsync options produce a correct file."""
+    out_dir = tmp_path / "downloads"
+    out_dir.mkdir()
+
+    fallocate_calls: list[tuple[int, int]] = []
+    if hasattr(download_utils.os, "posix_fallocate"):
+        real_fallocate = download_utils.os.posix_fallocate
+
+        def spy_fallocate(fd: int, offset: int, length: int) -> None:
+            fallocate_calls.append((offset, length))
+            real_fallocate(fd, offset, length)
+
+        monkeypatch.setattr(download_utils.os, "posix_fallocate", spy_fallocate)
+
+    content_data = b"x" * (3 * 1024 * 1024 + 17)
+    headers = {"Content-Length": str(len(content_data))}
+
+    async def make_request(headers_arg):
+        return MockResponse(headers, content_data=content_data)
+
+    result = await download_utils.download_file(
+        make_request,
+        out_dir,
+        lambda h: "prealloc.bin",
+        preallocate=True,
+        fsync="close",
+    )
+
+    assert result.read_bytes() == content_data
+    if hasattr(download_utils.os, "posix_fallocate"):
+        assert fallocate_calls == [(0, len(content_data))]
+
+
+class InterruptedResponse(MockResponse):
+    """Mock response whose body stream fails after `fail_after` bytes."""
+
+    def __init__(self, *args, fail_after: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fail_after = fail_after
+
+    @property
+    def content(self):
+        data = self._content_data
+        fail_after = self._fail_after
+
+        class MockContent:
+            def iter_chunked(self, size):
+                async def _iter():
+                    offset = 0
+                    while offset < fail_after:
+                        chunk = data[offset : min(offset + size, fail_after)]
+                        offset += len(chunk)
+                        yield chunk
+                    raise aiohttp.ClientPayloadError("connection reset")
+
+                return _iter()
+
+        return MockContent()
+
+
+@pytest.mark.asyncio
+async def test_iter_response_bytes_yields_chunks() -> None:
+    """Test that the body is streamed in chunks of at most chunk_size bytes."""
+    content_data = b"0123456789" * 10
+
+    async def make_request(headers_arg):
+        return MockResponse({}, content_data=content_data)
+
+    chunks = [
+        chunk
+        async for chunk in download_utils.iter_response_bytes(
+            make_request, chunk_size=16
+        )
+    ]
+
+    assert b"".join(chunks) == content_data
+    assert max(len(c) for c in chunks) == 16
+
+
+@pytest.mark.asyncio
+async def test_iter_response_bytes_resumes_with_range() -> None:
+    """Test that an interrupted stream is resumed from the last delivered byte."""
+    content_data = bytes(range(256)) * 4
+    requests: list[dict | None] = []
+
+    async def make_request(headers_arg):
+        requests.append(headers_arg)
+        if headers_arg and "Range" in headers_arg:
+            start = int(headers_arg["Range"].removeprefix("bytes=").rstrip("-"))
+            return MockResponse({}, status=206, content_data=content_data[start:])
+        return InterruptedResponse({}, content_data=content_data, fail_after=300)
+
+    result = b"".join(
+        [
+            chunk
+            async for chunk in download_utils.iter_response_bytes(
+                make_request, chunk_size=64
+            )
+        ]
+    )
+
+    assert result == content_data
+    assert requests == [None, {"Range": "bytes=300-"}]
+
+
+@pytest.mark.asyncio
+async def test_iter_response_bytes_skips_prefix_without_range_support() -> None:
+    """Test that a full 200 response after an interruption skips the delivered prefix."""
+    content_data = b"abcdefghij" * 10
+    calls = 0
+
+    async def make_request(headers_arg):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return InterruptedResponse({}, content_data=content_data, fail_after=35)
+        return MockResponse({}, status=200, content_data=content_data)
+
+    result = await download_utils.read_response_bytes(make_request)
+
+    assert result == content_data
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_iter_response_bytes_restarts_when_content_changed() -> None:
+    """Test that a resumed request sends If-Range and restarts if the ETag changed."""
+    old_data = b"a" * 100
+    new_data = b"b" * 120
+    requests: list[HeadersType | None] = []
+
+    async def make_request(headers_arg):
+        requests.append(headers_arg)
+        if headers_arg is None:
+            return InterruptedResponse(
+                {"ETag": '"v1"'}, content_data=old_data, fail_after=40
+            )
+        return MockResponse({"ETag": '"v2"'}, status=200, content_data=new_data)
+
+    result = await download_utils.read_response_bytes(make_request)
+
+    assert result == new_data
+    assert requests == [None, {"Range": "bytes=40-", "If-Range": '"v1"'}]
+
+
+@pytest.mark.asyncio
+async def test_iter_response_bytes_raises_when_content_changed_without_restart() -> (
+    None
+):
+    """Test that a changed ETag raises instead of appending new content to the old prefix."""
+    received = bytearray()
+
+    async def make_request(headers_arg):
+        if headers_arg is None:
+            return InterruptedResponse(
+                {"ETag": '"v1"'}, content_data=b"a" * 100, fail_after=40
+            )
+        return MockResponse({"ETag": '"v2"'}, status=200, content_data=b"b" * 120)
+
+    with pytest.raises(RuntimeError, match="Content changed"):
+        async for chunk in download_utils.iter_response_bytes(make_request):
+            received += chunk
+    assert received == b"a" * 40
+
+
+@pytest.mark.asyncio
+async def test_bind_request_merges_headers() -> None:
+    """Test that bound requests merge the caller's headers with the extra headers."""
+    calls: list[dict] = []
+
+    async def method(**kwargs):
+        calls.append(kwargs)
+        return MockResponse({})
+
+    make_request = download_utils.bind_request(
+        method, id="a1", _headers={"X-Test": "1"}
+    )
+    await make_request(None)
+    await make_request({"Range": "bytes=5-"})
+
+    assert calls == [
+        {"id": "a1", "_headers": {"X-Test": "1"}},
+        {"id": "a1", "_headers": {"X-Test": "1", "Range": "bytes=5-"}},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_response_bytes_gives_up_after_resume_attempts() -> None:
+    """Test that the connection error is raised once resume attempts are exhausted."""
+    content_data = b"x" * 100
+    calls = 0
+
+    async def make_request(headers_arg):
+        nonlocal calls
+        calls += 1
+        return InterruptedResponse({}, content_data=content_data, fail_after=0)
+
+    with pytest.raises(aiohttp.ClientPayloadError):
+        await download_utils.read_response_bytes(make_request, resume_attempts=2)
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_iter_response_bytes_raises_api_exception_on_error_status() -> None:
+    """Test that non-2xx responses raise the matching ApiException subclass."""
+
+    class ErrorResponse(MockResponse):
+        reason = "Not Found"
+
+        async def read(self):
+            return self._content_data
+
+    async def make_request(headers_arg):
+        return ErrorResponse({}, status=404, content_data=b'{"message": "nope"}')
+
+    with pytest.raises(NotFoundException) as exc_info:
+        await download_utils.read_response_bytes(make_request)
+    assert exc_info.value.status == 404
+    assert "nope" in str(exc_info.value.body)
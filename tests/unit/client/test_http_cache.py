@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Optional
+from unittest.mock import AsyncMock
+
+import pytest
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from immichpy import AsyncClient
+from immichpy.client.generated.rest import RESTResponse
+from immichpy.client.utils.http_cache import HttpCache
+
+VERSION = {"major": 2, "minor": 5, "patch": 2}
+
+
+class FakeResponse:
+    def __init__(
+        self, status: int, body: bytes = b"", headers: Optional[dict] = None
+    ) -> None:
+        self.status = status
+        self.reason = "OK"
+        self.headers = CIMultiDictProxy(CIMultiDict(headers or {}))
+        self._body = body
+        self.released = False
+
+    async def read(self) -> bytes:
+        return self._body
+
+    def release(self) -> None:
+        self.released = True
+
+
+def server(etag: str = '"v1"', body: dict = VERSION) -> AsyncMock:
+    """A fake server that honours If-None-Match for a single ETag."""
+    requests: list[dict] = []
+
+    async def request(method, url, headers=None, **kwargs):
+        requests.append(dict(headers or {}))
+        if (headers or {}).get("If-None-Match") == etag:
+            return RESTResponse(FakeResponse(304))
+        return RESTResponse(
+            FakeResponse(
+                200,
+                json.dumps(body).encode(),
+                {"Content-Type": "application/json", "ETag": etag},
+            )
+        )
+
+    mock = AsyncMock(side_effect=request)
+    mock.requests = requests
+    return mock
+
+
+@pytest.mark.asyncio
+async def test_revalidates_and_reuses_parsed_model() -> None:
+    cache = HttpCache()
+    client = AsyncClient(base_url="http://localhost", api_key="k", http_cache=cache)
+    client.base_client.rest_client.request = server()
+
+    first = await client.server.get_server_version()
+    second = await client.server.get_server_version()
+
+    requests = client.base_client.rest_client.request.requests
+    assert "If-None-Match" not in requests[0]
+    assert requests[1]["If-None-Match"] == '"v1"'
+    assert second == first
+    assert second is not first
+    assert second.major == 2
+    assert cache.stats().hits == 1
+    assert cache.stats().misses == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_changed_resource_replaces_entry() -> None:
+    client = AsyncClient(base_url="http://localhost", http_cache=HttpCache())
+    client.base_client.rest_client.request = server('"v1"')
+    await client.server.get_server_version()
+
+    client.base_client.rest_client.request = server('"v2"', {**VERSION, "patch": 3})
+    assert (await client.server.get_server_version()).patch == 3
+    assert (await client.server.get_server_version()).patch == 3
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_raw_callers_see_cached_body() -> None:
+    client = AsyncClient(base_url="http://localhost", http_cache=HttpCache())
+    client.base_client.rest_client.request = server()
+    await client.server.get_server_version()
+
+    resp = await client.server.get_server_version_without_preload_content()
+
+    assert resp.status == 200
+    assert json.loads(await resp.read()) == VERSION
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_streamed_responses_are_not_cached() -> None:
+    cache = HttpCache()
+    client = AsyncClient(base_url="http://localhost", http_cache=cache)
+    client.base_client.rest_client.request = server()
+
+    resp = await client.server.get_server_version_without_preload_content()
+    assert json.loads(await resp.read()) == VERSION
+    await client.server.get_server_version()
+
+    requests = client.base_client.rest_client.request.requests
+    assert "If-None-Match" not in requests[1]
+    assert len(cache) == 1
+    assert cache.stats().misses == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_responses_count_as_misses() -> None:
+    cache = HttpCache()
+    client = AsyncClient(base_url="http://localhost", http_cache=cache)
+    client.base_client.rest_client.request = AsyncMock(
+        return_value=RESTResponse(
+            FakeResponse(
+                200, json.dumps(VERSION).encode(), {"Content-Type": "application/json"}
+            )
+        )
+    )
+
+    await client.server.get_server_version()
+
+    assert len(cache) == 0
+    assert cache.stats().misses == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_disk_entries_survive_a_new_cache(tmp_path: Path) -> None:
+    client = AsyncClient(base_url="http://localhost", http_cache=HttpCache(tmp_path))
+    client.base_client.rest_client.request = server()
+    await client.server.get_server_version()
+
+    cache = HttpCache(tmp_path)
+    client = AsyncClient(base_url="http://localhost", http_cache=cache)
+    client.base_client.rest_client.request = server()
+    assert (await client.server.get_server_version()).minor == 5
+    assert cache.hits == 1
+    await client.close()
+
+
+def test_keys_depend_on_credentials() -> None:
+    assert HttpCache.make_key("http://x/a", {"x-api-key": "1"}) != HttpCache.make_key(
+        "http://x/a", {"x-api-key": "2"}
+    )
+    assert HttpCache.make_key("http://x/a", {"X-Request-Id": "1"}) == (
+        HttpCache.make_key("http://x/a")
+    )
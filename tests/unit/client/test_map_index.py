@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import math
+import random
+from unittest.mock import AsyncMock
+
+import pytest
+
+from immichpy.client.generated.api_client import ApiClient
+from immichpy.client.generated.models.map_marker_response_dto import (
+    MapMarkerResponseDto,
+)
+from immichpy.client.utils.map_index import EARTH_RADIUS_KM, MapMarkerIndex
+from immichpy.client.wrapper.map_api_wrapped import MapApiWrapped
+
+
+def marker(id: str, lat: float, lon: float) -> MapMarkerResponseDto:
+    return MapMarkerResponseDto(
+        id=id, lat=lat, lon=lon, city=None, country=None, state=None
+    )
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+@pytest.fixture
+def markers() -> list[MapMarkerResponseDto]:
+    rng = random.Random(7)
+    return [
+        marker(f"m{i}", rng.uniform(-90, 90), rng.uniform(-180, 180))
+        for i in range(500)
+    ]
+
+
+def test_bbox_matches_linear_scan(markers: list[MapMarkerResponseDto]) -> None:
+    index = MapMarkerIndex(markers, cell_size=5.0)
+
+    for box in [(10, 20, 40, 60), (-90, -180, 90, 180), (-5, 170, 5, -170)]:
+        min_lat, min_lon, max_lat, max_lon = box
+        if min_lon > max_lon:
+            expected = {
+                m.id
+                for m in markers
+                if min_lat <= m.lat <= max_lat
+                and (m.lon >= min_lon or m.lon <= max_lon)
+            }
+        else:
+            expected = {
+                m.id
+                for m in markers
+                if min_lat <= m.lat <= max_lat and min_lon <= m.lon <= max_lon
+            }
+        assert {m.id for m in index.bbox(*box)} == expected
+
+
+def test_radius_and_nearest_match_linear_scan(
+    markers: list[MapMarkerResponseDto],
+) -> None:
+    index = MapMarkerIndex(markers)
+
+    for lat, lon in [(48.1, 11.5), (-89.0, 0.0), (0.0, 179.9)]:
+        distances = sorted((haversine(lat, lon, m.lat, m.lon), m.id) for m in markers)
+        within = [i for d, i in distances if d <= 1500]
+        result = index.radius(lat, lon, 1500)
+        assert [m.id for m, _ in result] == within
+        assert all(
+            d == pytest.approx(haversine(lat, lon, m.lat, m.lon)) for m, d in result
+        )
+
+        nearest = index.nearest(lat, lon, k=5)
+        assert [m.id for m, _ in nearest] == [i for _, i in distances[:5]]
+
+
+def test_update_and_remove_keep_index_consistent() -> None:
+    index = MapMarkerIndex([marker("a", 10, 10), marker("b", 20, 20)])
+    assert index.nearest(10, 10)[0][0].id == "a"
+
+    index.update([marker("a", 50, 50), marker("c", 11, 11)])
+    index.remove(["b", "unknown"])
+
+    assert len(index) == 2
+    assert "b" not in index
+    moved = index.get("a")
+    assert moved is not None and moved.lat == 50
+    assert [m.id for m in index.bbox(0, 0, 30, 30)] == ["c"]
+    assert index.nearest(10, 10)[0][0].id == "c"
+    assert index.nearest(10, 10, k=10)[-1][0].id == "a"
+
+
+def test_empty_index() -> None:
+    index = MapMarkerIndex()
+
+    assert index.bbox(-90, -180, 90, 180) == []
+    assert index.radius(0, 0, 100) == []
+    assert index.nearest(0, 0) == []
+    with pytest.raises(ValueError, match="k must be >= 1"):
+        index.nearest(0, 0, k=0)
+
+
+@pytest.mark.asyncio
+async def test_refresh_map_marker_index() -> None:
+    api = MapApiWrapped(ApiClient())
+    api.get_map_markers = AsyncMock(return_value=[marker("a", 1, 1), marker("b", 2, 2)])
+    index = await api.get_map_marker_index(is_favorite=True)
+    assert len(index) == 2
+
+    since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    api.get_map_markers.return_value = [marker("c", 3, 3)]
+    assert await api.refresh_map_marker_index(index, file_created_after=since) == 1
+    assert {m.id for m in index} == {"a", "b", "c"}
+    call = api.get_map_markers.await_args
+    assert call is not None
+    assert call.kwargs == {"file_created_after": since}
+
+    api.get_map_markers.return_value = [marker("a", 1, 1), marker("c", 4, 4)]
+    await api.refresh_map_marker_index(index)
+    assert {m.id for m in index} == {"a", "c"}
+    moved = index.get("c")
+    assert moved is not None and moved.lat == 4
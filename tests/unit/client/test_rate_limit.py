@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from immichpy import AsyncClient
+from immichpy.client.generated.exceptions import ServiceException
+from immichpy.client.generated.rest import RESTResponse
+from immichpy.client.utils.rate_limit import RateLimiter, TokenBucket
+
+
+class FakeResponse:
+    def __init__(self, status: int) -> None:
+        self.status = status
+        self.reason = "OK"
+        self.headers = CIMultiDictProxy(
+            CIMultiDict({"Content-Type": "application/json"})
+        )
+
+    async def read(self) -> bytes:
+        return json.dumps({"major": 2, "minor": 5, "patch": 2}).encode()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_paces() -> None:
+    bucket = TokenBucket(rate=100, burst=5)
+    start = time.monotonic()
+
+    for _ in range(5):
+        await bucket.acquire()
+    burst = time.monotonic() - start
+    for _ in range(5):
+        await bucket.acquire()
+    paced = time.monotonic() - start
+
+    assert burst < 0.01
+    assert paced >= 0.04
+
+
+def test_token_bucket_rejects_invalid_rate() -> None:
+    with pytest.raises(ValueError, match="rate must be > 0"):
+        TokenBucket(rate=0)
+
+
+def test_operation_group() -> None:
+    base = "http://localhost:2283/api"
+
+    assert RateLimiter.operation_group(f"{base}/assets/123/original", base) == (
+        "assets"
+    )
+    assert RateLimiter.operation_group(f"{base}/search/smart?x=1", base) == "search"
+
+
+@pytest.mark.asyncio
+async def test_max_in_flight_applies_to_client_calls(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    limiter = RateLimiter(max_in_flight=2)
+    client = AsyncClient(base_url="http://localhost/api", rate_limiter=limiter)
+    in_flight = 0
+    peak = 0
+
+    async def request(method, url, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return RESTResponse(FakeResponse(200))
+
+    monkeypatch.setattr(client.base_client.rest_client, "request", request)
+
+    await asyncio.gather(*(client.server.get_server_version() for _ in range(6)))
+
+    assert peak == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_group_bucket_only_limits_its_group() -> None:
+    slow = TokenBucket(rate=1, burst=1)
+    limiter = RateLimiter(groups={"search": slow})
+    async with limiter.limit("search"):
+        pass
+
+    start = time.monotonic()
+    for _ in range(5):
+        async with limiter.limit("server"):
+            pass
+    assert time.monotonic() - start < 0.1
+
+
+@pytest.mark.asyncio
+async def test_overload_halves_adaptive_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    limiter = RateLimiter(max_in_flight=16, adaptive=True)
+    assert limiter.concurrency is not None
+    limiter.concurrency.limit = 8
+    client = AsyncClient(base_url="http://localhost/api", rate_limiter=limiter)
+
+    async def request(method, url, **kwargs):
+        return RESTResponse(FakeResponse(503))
+
+    monkeypatch.setattr(client.base_client.rest_client, "request", request)
+
+    with pytest.raises(ServiceException):
+        await client.server.get_server_version()
+
+    assert limiter.concurrency.limit == 4
+    assert limiter.concurrency.active == 0
+    await client.close()
+
+
+def test_latencies_are_compared_per_group() -> None:
+    limiter = RateLimiter(max_in_flight=16, adaptive=True)
+    assert limiter.concurrency is not None
+    limiter.concurrency.limit = 8
+
+    limiter.record("server", 0.1, 200)
+    limiter.record("search", 2.0, 200)
+
+    assert limiter.concurrency.baseline("server") == 0.1
+    assert limiter.concurrency.baseline("search") == 2.0
+    assert limiter.concurrency.limit == 10
+
+
+def test_adaptive_requires_max_in_flight() -> None:
+    with pytest.raises(ValueError, match="adaptive requires max_in_flight"):
+        RateLimiter(adaptive=True)
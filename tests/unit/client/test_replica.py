@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from immichpy.client.generated.api_client import ApiClient
+from immichpy.client.utils.replica import SyncReplica
+from immichpy.client.utils.sync_stream import parse_sync_line
+from immichpy.client.types import SyncEvent
+from immichpy.client.wrapper.sync_api_wrapped import SyncApiWrapped
+
+ASSET = {
+    "checksum": "c1",
+    "deletedAt": None,
+    "duration": None,
+    "fileCreatedAt": "2024-01-01T00:00:00Z",
+    "fileModifiedAt": "2024-01-01T00:00:00Z",
+    "height": 10,
+    "id": "a1",
+    "isEdited": False,
+    "isFavorite": True,
+    "libraryId": None,
+    "livePhotoVideoId": None,
+    "localDateTime": "2024-01-01T00:00:00Z",
+    "originalFileName": "IMG_1.jpg",
+    "ownerId": "u1",
+    "stackId": None,
+    "thumbhash": None,
+    "type": "IMAGE",
+    "visibility": "timeline",
+    "width": 20,
+}
+
+ALBUM = {
+    "createdAt": "2024-01-01T00:00:00Z",
+    "description": "",
+    "id": "al1",
+    "isActivityEnabled": True,
+    "name": "Holiday",
+    "order": "desc",
+    "ownerId": "u1",
+    "thumbnailAssetId": None,
+    "updatedAt": "2024-01-01T00:00:00Z",
+}
+
+
+def raw_line(type: str, data: dict[str, Any], ack: str) -> bytes:
+    return json.dumps({"type": type, "data": data, "ack": ack}).encode() + b"\n"
+
+
+def event(type: str, data: dict[str, Any], ack: str = "ack") -> SyncEvent:
+    parsed = parse_sync_line(raw_line(type, data, ack))
+    assert parsed is not None
+    return parsed
+
+
+class StreamResponse:
+    """Minimal mock of a streamed aiohttp.ClientResponse."""
+
+    def __init__(self, body: bytes):
+        self.status = 200
+        self.closed = False
+        self._body = body
+
+    def close(self) -> None:
+        self.closed = True
+
+    @property
+    def content(self):
+        body = self._body
+
+        class Content:
+            def iter_chunked(self, size):
+                async def _iter():
+                    yield body
+
+                return _iter()
+
+        return Content()
+
+
+def test_apply_upserts_and_deletes(tmp_path: Path) -> None:
+    with SyncReplica(tmp_path / "replica.db") as replica:
+        replica.apply(event("AssetV1", ASSET))
+        replica.apply(event("AssetV1", {**ASSET, "isFavorite": False}))
+        replica.apply(event("AlbumV1", ALBUM))
+        replica.apply(event("AlbumToAssetV1", {"albumId": "al1", "assetId": "a1"}))
+
+        rows = replica.query("SELECT id, is_favorite, original_file_name FROM assets")
+        assert [tuple(r) for r in rows] == [("a1", 0, "IMG_1.jpg")]
+        assert replica.query('SELECT "order" FROM albums')[0]["order"] == "desc"
+
+        replica.apply(event("AssetDeleteV1", {"assetId": "a1"}))
+
+        assert replica.query("SELECT * FROM assets") == []
+        assert replica.query("SELECT * FROM album_assets") == []
+        assert len(replica.query("SELECT * FROM albums")) == 1
+
+
+def test_replica_persists_across_reopen(tmp_path: Path) -> None:
+    with SyncReplica(tmp_path / "replica.db") as replica:
+        replica.apply(event("AssetV1", ASSET))
+
+    with SyncReplica(tmp_path / "replica.db") as replica:
+        assert replica.query("SELECT count(*) AS n FROM assets")[0]["n"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_commits_before_acknowledging(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    body = (
+        raw_line("AssetV1", ASSET, "ack-1")
+        + raw_line("AssetV1", {**ASSET, "id": "a2"}, "ack-2")
+        + raw_line("SyncCompleteV1", {}, "ack-3")
+    )
+    api = SyncApiWrapped(ApiClient())
+    api.get_sync_stream_without_preload_content = AsyncMock(
+        return_value=StreamResponse(body)
+    )
+    replica = SyncReplica(tmp_path / "replica.db")
+    committed_at_ack: list[int] = []
+
+    async def send_sync_ack(dto, **kwargs):
+        with SyncReplica(tmp_path / "replica.db") as other:
+            committed_at_ack.append(len(other.query("SELECT id FROM assets")))
+
+    monkeypatch.setattr(api, "send_sync_ack", send_sync_ack)
+
+    applied = await replica.sync(api, batch_size=1)
+    replica.close()
+
+    assert applied == 3
+    assert committed_at_ack == [1, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_sync_rebuilds_after_reset(tmp_path: Path) -> None:
+    api = SyncApiWrapped(ApiClient())
+    api.get_sync_stream_without_preload_content = AsyncMock(
+        side_effect=[
+            StreamResponse(raw_line("SyncResetV1", {}, "reset")),
+            StreamResponse(raw_line("AssetV1", {**ASSET, "id": "a2"}, "ack-1")),
+        ]
+    )
+    api.send_sync_ack = AsyncMock()
+
+    with SyncReplica(tmp_path / "replica.db") as replica:
+        replica.apply(event("AssetV1", ASSET))
+        replica.commit()
+        await replica.sync(api)
+
+        assert [r["id"] for r in replica.query("SELECT id FROM assets")] == ["a2"]
+    second = api.get_sync_stream_without_preload_content.await_args_list[1]
+    assert second.kwargs["sync_stream_dto"].reset is True
+
+
+@pytest.mark.asyncio
+async def test_sync_raises_on_repeated_reset(tmp_path: Path) -> None:
+    api = SyncApiWrapped(ApiClient())
+    api.get_sync_stream_without_preload_content = AsyncMock(
+        side_effect=[
+            StreamResponse(raw_line("SyncResetV1", {}, "reset-1")),
+            StreamResponse(raw_line("SyncResetV1", {}, "reset-2")),
+        ]
+    )
+    api.send_sync_ack = AsyncMock()
+
+    with SyncReplica(tmp_path / "replica.db") as replica:
+        with pytest.raises(RuntimeError):
+            await replica.sync(api)
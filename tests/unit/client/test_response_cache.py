@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from typing import Any, cast
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from immichpy import AsyncClient
+from immichpy.client.generated.models.search_suggestion_type import (
+    SearchSuggestionType,
+)
+from immichpy.client.generated.models.statistics_search_dto import (
+    StatisticsSearchDto,
+)
+from immichpy.client.utils import response_cache
+from immichpy.client.utils.response_cache import ResponseCache
+
+
+def test_make_key_serializes_dtos_and_ignores_timeouts() -> None:
+    a = ResponseCache.make_key(
+        "op", StatisticsSearchDto(isFavorite=True), _request_timeout=5
+    )
+    b = ResponseCache.make_key("op", StatisticsSearchDto(isFavorite=True))
+    c = ResponseCache.make_key("op", StatisticsSearchDto(isFavorite=False))
+
+    assert a == b
+    assert a != c
+    assert a.startswith("op:")
+
+
+def test_entries_expire_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 100.0
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now)
+    cache = ResponseCache(ttl=10)
+
+    cache.put("op:a", [1])
+    assert cache.get("op:a") == (True, [1])
+    assert cache.stats().bytes == 1
+    now = 110.0
+    assert cache.get("op:a") == (False, None)
+    assert len(cache) == 0
+    assert cache.stats().model_dump() == {
+        "hits": 1,
+        "misses": 1,
+        "entries": 0,
+        "bytes": 0,
+    }
+
+
+def test_lru_eviction_by_entries_and_bytes() -> None:
+    cache = ResponseCache(max_entries=2)
+    cache.put("op:a", 1)
+    cache.put("op:b", 2)
+    cache.get("op:a")
+    cache.put("op:c", 3)
+    assert cache.get("op:b") == (False, None)
+    assert cache.get("op:a") == (True, 1)
+
+    cache = ResponseCache(max_bytes=10)
+    cache.put("op:a", "xxx")  # 5 bytes of JSON
+    cache.put("op:b", "yyy")
+    cache.put("op:c", "zzz")
+    cache.put("op:big", "x" * 20)
+    assert cache.size == 10
+    assert [cache.get(k)[0] for k in ("op:a", "op:b", "op:c", "op:big")] == [
+        False,
+        True,
+        True,
+        False,
+    ]
+
+
+def test_invalidate_by_operation() -> None:
+    cache = ResponseCache()
+    cache.put("a:1", 1)
+    cache.put("a:2", 2)
+    cache.put("b:1", 3)
+
+    assert cache.invalidate("a") == 2
+    assert len(cache) == 1
+    assert cache.invalidate() == 1
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_call_returns_copies() -> None:
+    cache = ResponseCache()
+    func = AsyncMock(return_value=StatisticsSearchDto(isFavorite=True))
+
+    first = await cache.call("op", func)
+    first.is_favorite = False
+    second = await cache.call("op", func)
+
+    assert func.await_count == 1
+    assert second.is_favorite is True
+    assert second is not first
+
+
+def mock_transport(client: AsyncClient) -> AsyncMock:
+    """Answer every request of the client with the name of its response type."""
+    call_api = AsyncMock(return_value=MagicMock(read=AsyncMock()))
+
+    def response_deserialize(response_data, response_types_map):
+        return MagicMock(data=response_types_map["200"])
+
+    client.base_client.call_api = call_api
+    client.base_client.response_deserialize = cast(Any, response_deserialize)
+    return call_api
+
+
+@pytest.mark.asyncio
+async def test_client_caches_statistics_calls() -> None:
+    cache = ResponseCache()
+    client = AsyncClient(base_url="http://localhost", response_cache=cache)
+    call_api = mock_transport(client)
+    dto = StatisticsSearchDto(isFavorite=True)
+
+    for _ in range(2):
+        assert (
+            await client.search.search_asset_statistics(dto)
+            == "SearchStatisticsResponseDto"
+        )
+        await client.search.search_asset_statistics(statistics_search_dto=dto)
+        await client.search.get_search_suggestions(type=SearchSuggestionType.CITY)
+        await client.search.get_explore_data()
+        await client.server.get_server_statistics()
+
+    assert call_api.await_count == 4
+    assert cache.stats().hits == 6
+
+    await client.search.search_asset_statistics(StatisticsSearchDto(isFavorite=False))
+    assert call_api.await_count == 5
+
+    assert cache.invalidate("search_asset_statistics") == 2
+    await client.search.search_asset_statistics(dto)
+    assert call_api.await_count == 6
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_without_cache_calls_through() -> None:
+    client = AsyncClient(base_url="http://localhost")
+    call_api = mock_transport(client)
+
+    await client.server.get_server_statistics()
+    await client.server.get_server_statistics()
+
+    assert client.response_cache is None
+    assert call_api.await_count == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_entries_are_scoped_by_credentials() -> None:
+    cache = ResponseCache()
+    alice = AsyncClient(base_url="http://localhost", api_key="a", response_cache=cache)
+    call_api = mock_transport(alice)
+    bob = alice.with_credentials(api_key="b", response_cache=cache)
+
+    await alice.server.get_server_statistics()
+    await bob.server.get_server_statistics()
+    await alice.server.get_server_statistics()
+
+    assert call_api.await_count == 2
+    assert cache.stats().hits == 1
+    await bob.close()
+    await alice.close()
+
+
+@pytest.mark.asyncio
+async def test_cached_calls_skip_validation_when_disabled() -> None:
+    cache = ResponseCache()
+    client = AsyncClient(
+        base_url="http://localhost", response_cache=cache, validate_requests=False
+    )
+    call_api = mock_transport(client)
+    method: Any = client.search.get_search_suggestions
+    cached: Any = type(client.search).get_search_suggestions
+
+    assert method.__func__ is cached.raw_function
+    await method(type=SearchSuggestionType.CITY)
+    await method(type=SearchSuggestionType.CITY)
+
+    assert call_api.await_count == 1
+    assert cache.stats().hits == 1
+    await client.close()
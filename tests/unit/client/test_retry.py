@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import io
+import json
+from typing import Optional
+from unittest.mock import AsyncMock
+
+import aiohttp
+import pytest
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from immichpy import AsyncClient
+from immichpy.client.generated.exceptions import ServiceException
+from immichpy.client.generated.models.metadata_search_dto import MetadataSearchDto
+from immichpy.client.generated.rest import RESTResponse
+from immichpy.client.utils import retry
+from immichpy.client.utils.retry import (
+    IDEMPOTENT_POSTS,
+    RetryBudget,
+    RetryPolicy,
+    parse_retry_after,
+    record_positions,
+    rewind_post_params,
+)
+
+BASE = "http://localhost/api"
+VERSION = {"major": 2, "minor": 5, "patch": 2}
+
+
+class FakeResponse:
+    def __init__(self, status: int, headers: Optional[dict] = None) -> None:
+        self.status = status
+        self.reason = "OK"
+        self.headers = CIMultiDictProxy(
+            CIMultiDict({"Content-Type": "application/json", **(headers or {})})
+        )
+        self.released = False
+
+    async def read(self) -> bytes:
+        return json.dumps(VERSION).encode()
+
+    def release(self) -> None:
+        self.released = True
+
+
+def make_client(responses: list, policy: RetryPolicy) -> tuple[AsyncClient, AsyncMock]:
+    client = AsyncClient(base_url=BASE, retry_policy=policy)
+    items = iter(responses)
+
+    async def request(method, url, **kwargs):
+        item = next(items)
+        if isinstance(item, BaseException):
+            raise item
+        return RESTResponse(item)
+
+    mock = AsyncMock(side_effect=request)
+    client.base_client.rest_client.request = mock
+    return client, mock
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    delays: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        delays.append(delay)
+
+    monkeypatch.setattr(
+        "immichpy.client.wrapper.api_client_wrapped.asyncio.sleep", sleep
+    )
+    return delays
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_status_honouring_retry_after(
+    no_sleep: list[float],
+) -> None:
+    first = FakeResponse(503, {"Retry-After": "2"})
+    client, mock = make_client([first, FakeResponse(200)], RetryPolicy())
+
+    assert (await client.server.get_server_version()).patch == 2
+    assert mock.await_count == 2
+    assert first.released
+    assert no_sleep == [2.0]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_retries_connection_errors_up_to_attempts() -> None:
+    errors = [aiohttp.ClientConnectionError("down")] * 3
+    client, mock = make_client(errors, RetryPolicy(attempts=3))
+
+    with pytest.raises(aiohttp.ClientConnectionError):
+        await client.server.get_server_version()
+    assert mock.await_count == 3
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_read_only_post_is_retried() -> None:
+    responses = [FakeResponse(502), FakeResponse(500)]
+    client, mock = make_client(responses, RetryPolicy())
+
+    with pytest.raises(ServiceException):
+        await client.search.search_assets(MetadataSearchDto())
+    assert mock.await_count == 2
+    await client.close()
+
+
+def test_is_idempotent() -> None:
+    policy = RetryPolicy()
+
+    assert policy.is_idempotent("GET", f"{BASE}/albums", BASE)
+    assert policy.is_idempotent("POST", f"{BASE}/search/smart", BASE)
+    assert not policy.is_idempotent("POST", f"{BASE}/albums", BASE)
+    assert not policy.is_idempotent("POST", f"{BASE}/assets", BASE)
+    assert not policy.is_idempotent("POST", f"{BASE}/download/archive", BASE)
+    opted_in = RetryPolicy(idempotent_posts={*IDEMPOTENT_POSTS, "/assets"})
+    assert opted_in.is_idempotent("POST", f"{BASE}/assets", BASE)
+    assert not policy.is_idempotent("PATCH", f"{BASE}/assets/1", BASE)
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_post_is_not_retried() -> None:
+    client, mock = make_client([FakeResponse(503)], RetryPolicy())
+
+    response = await client.base_client.call_api("POST", f"{BASE}/albums", {}, {})
+
+    assert response.status == 503
+    assert mock.await_count == 1
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_budget_caps_retries() -> None:
+    policy = RetryPolicy(attempts=5, budget=RetryBudget(ratio=0, capacity=1))
+    client, mock = make_client([FakeResponse(503)] * 5, policy)
+
+    with pytest.raises(ServiceException):
+        await client.server.get_server_version()
+    assert mock.await_count == 2
+    await client.close()
+
+
+def test_delay_backoff_and_retry_after(monkeypatch: pytest.MonkeyPatch) -> None:
+    policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+
+    assert [policy.delay(a) for a in (1, 2, 3, 4)] == [1, 2, 4, 5]
+    assert policy.delay(1, "60") == 5
+    monkeypatch.setattr(retry.random, "uniform", lambda a, b: b / 2)
+    assert RetryPolicy(backoff=1).delay(2) == 1
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_rewind_post_params() -> None:
+    stream = io.BytesIO(b"data")
+    stream.seek(1)
+    params = [("assetData", ("a.jpg", stream, "image/jpeg")), ("deviceId", "x")]
+    positions = record_positions(params)
+    stream.read()
+
+    assert rewind_post_params(params, positions)
+    assert stream.tell() == 1
+
+    class Pipe:
+        def read(self) -> bytes:
+            return b""
+
+    assert not rewind_post_params([("assetData", Pipe())], {})
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any, cast
+from unittest.mock import MagicMock
+
+import pytest
+
+from immichpy.client.generated.api_client import ApiClient
+from immichpy.client.generated.models.metadata_search_dto import MetadataSearchDto
+from immichpy.client.generated.models.smart_search_dto import SmartSearchDto
+from immichpy.client.utils.pagination import iter_search_pages
+from immichpy.client.wrapper.search_api_wrapped import SearchApiWrapped
+
+
+def make_page(page: int, last_page: int, size: int = 2) -> MagicMock:
+    if page > last_page:
+        return MagicMock(items=[], next_page=None)
+    return MagicMock(
+        items=[f"p{page}-{i}" for i in range(size)],
+        next_page=str(page + 1) if page < last_page else None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_iter_search_pages_yields_all_pages_in_order() -> None:
+    async def fetch(page: int):
+        await asyncio.sleep(0.001 * (5 - page))  # later pages finish first
+        return make_page(page, last_page=3)
+
+    items = [item async for item in iter_search_pages(fetch, prefetch=3)]
+
+    assert items == ["p1-0", "p1-1", "p2-0", "p2-1", "p3-0", "p3-1"]
+
+
+@pytest.mark.asyncio
+async def test_iter_search_pages_fetches_ahead() -> None:
+    in_flight = 0
+    peak = 0
+
+    async def fetch(page: int):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return make_page(page, last_page=10)
+
+    items = [item async for item in iter_search_pages(fetch, prefetch=2)]
+
+    assert len(items) == 20
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_iter_search_pages_sequential_without_prefetch() -> None:
+    requested: list[int] = []
+
+    async def fetch(page: int):
+        requested.append(page)
+        return make_page(page, last_page=2)
+
+    items = [item async for item in iter_search_pages(fetch, prefetch=0)]
+
+    assert len(items) == 4
+    assert requested == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_iter_search_pages_cancels_outstanding_requests_on_early_exit() -> None:
+    completed: list[int] = []
+
+    async def fetch(page: int):
+        if page > 1:
+            await asyncio.sleep(0.05)
+        completed.append(page)
+        return make_page(page, last_page=10)
+
+    stream = iter_search_pages(fetch, prefetch=2)
+    assert await stream.__anext__() == "p1-0"
+    await stream.aclose()
+    await asyncio.sleep(0.1)
+
+    assert completed == [1]
+
+
+def test_iter_search_pages_rejects_negative_prefetch() -> None:
+    async def fetch(page: int):
+        return make_page(page, last_page=1)
+
+    with pytest.raises(ValueError, match="prefetch must be >= 0"):
+        asyncio.run(iter_search_pages(fetch, prefetch=-1).__anext__())
+
+
+@pytest.mark.asyncio
+async def test_iter_search_assets_sets_page_and_size() -> None:
+    api = SearchApiWrapped(ApiClient())
+    dtos: list[MetadataSearchDto] = []
+
+    async def search_assets(dto, **kwargs):
+        dtos.append(dto)
+        return MagicMock(assets=make_page(int(dto.page), last_page=3))
+
+    api.search_assets = cast(Any, search_assets)
+
+    items = [
+        a
+        async for a in api.iter_search_assets(
+            MetadataSearchDto(page=2, isFavorite=True), page_size=50, prefetch=0
+        )
+    ]
+
+    assert items == ["p2-0", "p2-1", "p3-0", "p3-1"]
+    assert [(d.page, d.size, d.is_favorite) for d in dtos] == [
+        (2, 50, True),
+        (3, 50, True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_search_smart_uses_search_smart() -> None:
+    api = SearchApiWrapped(ApiClient())
+
+    async def search_smart(dto, **kwargs):
+        assert dto.query == "beach"
+        return MagicMock(assets=make_page(int(dto.page), last_page=1))
+
+    api.search_smart = cast(Any, search_smart)
+
+    items = [a async for a in api.iter_search_smart(SmartSearchDto(query="beach"))]
+
+    assert items == ["p1-0", "p1-1"]
+
+
+def asset(id: str) -> MagicMock:
+    return MagicMock(id=id)
+
+
+@pytest.mark.asyncio
+async def test_search_smart_many_merges_and_ranks() -> None:
+    api = SearchApiWrapped(ApiClient())
+    results = {
+        ("cat", 1): (["a", "b"], True),
+        ("cat", 2): (["c", "a"], False),
+        ("dog", 1): (["b", "d"], True),
+        ("dog", 2): (["e"], True),
+    }
+    requested: list[tuple[str, int]] = []
+
+    async def search_smart(dto, **kwargs):
+        requested.append((dto.query, int(dto.page)))
+        assert dto.size == 2
+        items, more = results[(dto.query, int(dto.page))]
+        return MagicMock(
+            assets=MagicMock(
+                items=[asset(i) for i in items], next_page="x" if more else None
+            )
+        )
+
+    api.search_smart = cast(Any, search_smart)
+
+    matches = await api.search_smart_many(
+        {
+            "cat": SmartSearchDto(query="cat"),
+            "dog": SmartSearchDto(query="dog"),
+        },
+        pages=2,
+        page_size=2,
+    )
+
+    assert sorted(requested) == [("cat", 1), ("cat", 2), ("dog", 1), ("dog", 2)]
+    by_id = {m.asset.id: m for m in matches}
+    assert set(by_id) == {"a", "b", "c", "d", "e"}
+    assert by_id["a"].ranks == {"cat": 1}
+    assert by_id["b"].ranks == {"cat": 2, "dog": 1}
+    assert matches[0].asset.id == "b"
+    assert by_id["b"].score == pytest.approx(1 / 62 + 1 / 61)
+
+
+@pytest.mark.asyncio
+async def test_search_smart_many_bounds_concurrency() -> None:
+    api = SearchApiWrapped(ApiClient())
+    in_flight = 0
+    peak = 0
+
+    async def search_smart(dto, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return MagicMock(assets=MagicMock(items=[asset(dto.query)], next_page=None))
+
+    api.search_smart = cast(Any, search_smart)
+
+    matches = await api.search_smart_many(
+        {str(i): SmartSearchDto(query=str(i)) for i in range(10)}, concurrency=3
+    )
+
+    assert len(matches) == 10
+    assert peak == 3
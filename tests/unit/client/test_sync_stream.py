@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, cast
+from unittest.mock import AsyncMock, MagicMock
+import uuid
+
+import pytest
+
+from immichpy.client.generated.api_client import ApiClient
+from immichpy.client.generated.exceptions import NotFoundException
+from immichpy.client.generated.models.sync_asset_delete_v1 import SyncAssetDeleteV1
+from immichpy.client.generated.models.sync_entity_type import SyncEntityType
+from immichpy.client.generated.models.sync_request_type import SyncRequestType
+from immichpy.client.generated.models.sync_stream_dto import SyncStreamDto
+from immichpy.client.types import SyncEvent
+from immichpy.client.utils.sync_stream import (
+    SYNC_ENTITY_MODELS,
+    SyncAckBatcher,
+    iter_response_lines,
+    parse_sync_line,
+)
+from immichpy.client.wrapper.sync_api_wrapped import SyncApiWrapped
+
+
+class StreamResponse:
+    """Minimal mock of a streamed aiohttp.ClientResponse."""
+
+    def __init__(self, chunks: list[bytes], status: int = 200):
+        self.status = status
+        self.reason = "OK"
+        self.headers: dict[str, str] = {}
+        self.closed = False
+        self._chunks = chunks
+
+    async def read(self) -> bytes:
+        return b"".join(self._chunks)
+
+    def close(self) -> None:
+        self.closed = True
+
+    @property
+    def content(self):
+        chunks = self._chunks
+
+        class Content:
+            def iter_chunked(self, size):
+                async def _iter():
+                    for chunk in chunks:
+                        yield chunk
+
+                return _iter()
+
+        return Content()
+
+
+def line(type: str, data: dict[str, Any], ack: str) -> bytes:
+    return json.dumps({"type": type, "data": data, "ack": ack}).encode() + b"\n"
+
+
+def test_every_entity_type_has_a_model_mapping() -> None:
+    assert set(SYNC_ENTITY_MODELS) == set(SyncEntityType)
+
+
+def test_parse_sync_line_dispatches_by_type() -> None:
+    event = parse_sync_line(line("AssetDeleteV1", {"assetId": "a1"}, "ack-1"))
+
+    assert event is not None
+    assert event.type == SyncEntityType.ASSETDELETEV1
+    assert isinstance(event.data, SyncAssetDeleteV1)
+    assert event.data.asset_id == "a1"
+    assert event.ack == "ack-1"
+
+
+def test_parse_sync_line_control_event_has_no_data() -> None:
+    event = parse_sync_line(line("SyncCompleteV1", {}, "ack-2"))
+
+    assert event is not None
+    assert event.type == SyncEntityType.SYNCCOMPLETEV1
+    assert event.data is None
+
+
+def test_parse_sync_line_skips_unknown_types() -> None:
+    assert parse_sync_line(line("SomethingNewV9", {}, "ack-3")) is None
+
+
+@pytest.mark.asyncio
+async def test_iter_response_lines_handles_split_lines() -> None:
+    resp = StreamResponse([b'{"a":', b"1}\n\n", b'{"b":2}\n{"c"', b":3}"])
+
+    lines = [line async for line in iter_response_lines(cast(Any, resp))]
+
+    assert lines == [b'{"a":1}', b'{"b":2}', b'{"c":3}']
+
+
+@pytest.mark.asyncio
+async def test_iter_sync_stream_yields_typed_events() -> None:
+    body = line("AssetDeleteV1", {"assetId": "a1"}, "ack-1") + line(
+        "SyncCompleteV1", {}, "ack-2"
+    )
+    resp = StreamResponse([body[:10], body[10:40], body[40:]])
+    api = SyncApiWrapped(ApiClient())
+    api.get_sync_stream_without_preload_content = AsyncMock(return_value=resp)
+
+    events = [
+        event
+        async for event in api.iter_sync_stream(
+            SyncStreamDto(types=[SyncRequestType.ASSETSV1])
+        )
+    ]
+
+    assert [e.type for e in events] == [
+        SyncEntityType.ASSETDELETEV1,
+        SyncEntityType.SYNCCOMPLETEV1,
+    ]
+    assert [e.ack for e in events] == ["ack-1", "ack-2"]
+    assert resp.closed
+
+
+@pytest.mark.asyncio
+async def test_iter_sync_stream_closes_response_on_early_exit() -> None:
+    body = line("AssetDeleteV1", {"assetId": "a1"}, "ack-1") * 3
+    resp = StreamResponse([body])
+    api = SyncApiWrapped(ApiClient())
+    api.get_sync_stream_without_preload_content = AsyncMock(return_value=resp)
+
+    stream = api.iter_sync_stream(SyncStreamDto(types=[SyncRequestType.ASSETSV1]))
+    async for _ in stream:
+        break
+    await stream.aclose()
+
+    assert resp.closed
+
+
+@pytest.mark.asyncio
+async def test_iter_sync_stream_raises_api_errors() -> None:
+    api = SyncApiWrapped(ApiClient())
+    api.get_sync_stream_without_preload_content = AsyncMock(
+        return_value=StreamResponse([b"not found"], status=404)
+    )
+
+    with pytest.raises(NotFoundException):
+        async for _ in api.iter_sync_stream(
+            SyncStreamDto(types=[SyncRequestType.ASSETSV1])
+        ):
+            pass
+
+
+def event(type: str, ack: str) -> SyncEvent:
+    parsed = parse_sync_line(line(type, {}, ack))
+    assert parsed is not None
+    return parsed
+
+
+@pytest.mark.asyncio
+async def test_ack_batcher_flushes_by_count_and_keeps_latest_per_type() -> None:
+    sent: list[list[str]] = []
+
+    async def send(acks: list[str]) -> None:
+        sent.append(acks)
+
+    batcher = SyncAckBatcher(send, max_pending=3, max_interval=60)
+    await batcher.add(event("AssetDeleteV1", "a1"))
+    await batcher.add(event("AlbumDeleteV1", "b1"))
+    assert sent == []
+    await batcher.add(event("AssetDeleteV1", "a2"))
+
+    assert sent == [["a2", "b1"]]
+    assert batcher.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_ack_batcher_flushes_by_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    sent: list[list[str]] = []
+    now = [100.0]
+    monkeypatch.setattr(
+        "immichpy.client.utils.sync_stream.time.monotonic", lambda: now[0]
+    )
+
+    async def send(acks: list[str]) -> None:
+        sent.append(acks)
+
+    batcher = SyncAckBatcher(send, max_pending=100, max_interval=5)
+    await batcher.add(event("AssetDeleteV1", "a1"))
+    now[0] += 6
+    await batcher.add(event("AssetDeleteV1", "a2"))
+
+    assert sent == [["a2"]]
+
+
+@pytest.mark.asyncio
+async def test_ack_batcher_flushes_on_checkpoint_and_exit() -> None:
+    sent: list[list[str]] = []
+
+    async def send(acks: list[str]) -> None:
+        sent.append(acks)
+
+    async with SyncAckBatcher(send, max_pending=100, max_interval=60) as batcher:
+        await batcher.add(event("AssetDeleteV1", "a1"))
+        await batcher.add(event("SyncCompleteV1", "done"))
+        await batcher.add(event("AssetDeleteV1", "a2"))
+        assert sent == [["a1", "done"]]
+
+    assert sent == [["a1", "done"], ["a2"]]
+
+
+@pytest.mark.asyncio
+async def test_consume_sync_stream_acks_processed_events_on_failure() -> None:
+    body = b"".join(
+        line("AssetDeleteV1", {"assetId": f"a{i}"}, f"ack-{i}") for i in range(5)
+    )
+    api = SyncApiWrapped(ApiClient())
+    api.get_sync_stream_without_preload_content = AsyncMock(
+        return_value=StreamResponse([body])
+    )
+    api.send_sync_ack = AsyncMock()
+    handled: list[str] = []
+
+    async def handler(e: SyncEvent) -> None:
+        if e.ack == "ack-3":
+            raise RuntimeError("boom")
+        handled.append(e.ack)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await api.consume_sync_stream(
+            SyncStreamDto(types=[SyncRequestType.ASSETSV1]),
+            handler,
+            ack_batch_size=2,
+        )
+
+    acks = [c.args[0].acks for c in api.send_sync_ack.await_args_list]
+    assert handled == ["ack-0", "ack-1", "ack-2"]
+    assert acks == [["ack-1"], ["ack-2"]]
+
+
+@pytest.mark.asyncio
+async def test_consume_sync_stream_returns_processed_count() -> None:
+    body = line("AssetDeleteV1", {"assetId": "a1"}, "ack-1") + line(
+        "SyncCompleteV1", {}, "ack-2"
+    )
+    api = SyncApiWrapped(ApiClient())
+    api.get_sync_stream_without_preload_content = AsyncMock(
+        return_value=StreamResponse([body])
+    )
+    api.send_sync_ack = AsyncMock()
+
+    count = await api.consume_sync_stream(
+        SyncStreamDto(types=[SyncRequestType.ASSETSV1]), AsyncMock()
+    )
+
+    assert count == 2
+    api.send_sync_ack.assert_awaited_once()
+    ack_call = api.send_sync_ack.await_args
+    assert ack_call is not None
+    assert ack_call.args[0].acks == ["ack-1", "ack-2"]
+
+
+def make_assets(start: int, count: int) -> list[MagicMock]:
+    return [MagicMock(id=str(uuid.UUID(int=i))) for i in range(start, start + count)]
+
+
+@pytest.mark.asyncio
+async def test_iter_full_sync_follows_keyset_pagination() -> None:
+    pages = [make_assets(1, 2), make_assets(3, 2), make_assets(5, 1)]
+    api = SyncApiWrapped(ApiClient())
+    api.get_full_sync_for_user = AsyncMock(side_effect=pages)
+
+    assets = [a async for a in api.iter_full_sync(limit=2)]
+
+    assert [a.id for a in assets] == [str(uuid.UUID(int=i)) for i in range(1, 6)]
+    dtos = [c.args[0] for c in api.get_full_sync_for_user.await_args_list]
+    assert [d.last_id for d in dtos] == [None, uuid.UUID(int=2), uuid.UUID(int=4)]
+    assert len({d.updated_until for d in dtos}) == 1
+
+
+@pytest.mark.asyncio
+async def test_iter_full_sync_prefetches_next_page() -> None:
+    api = SyncApiWrapped(ApiClient())
+    api.get_full_sync_for_user = AsyncMock(
+        side_effect=[make_assets(1, 2), make_assets(3, 2), []]
+    )
+
+    stream = api.iter_full_sync(limit=2)
+    await stream.__anext__()
+    await asyncio.sleep(0)
+
+    assert api.get_full_sync_for_user.await_count == 2
+    await stream.aclose()
+
+
+@pytest.mark.asyncio
+async def test_iter_full_sync_retrieves_failed_prefetch_on_close() -> None:
+    api = SyncApiWrapped(ApiClient())
+    api.get_full_sync_for_user = AsyncMock(
+        side_effect=[make_assets(1, 2), RuntimeError("boom")]
+    )
+
+    stream = api.iter_full_sync(limit=2)
+    await stream.__anext__()
+    await asyncio.sleep(0)
+    await stream.aclose()
+
+    # The failed prefetch was awaited, so its exception does not leak out of aclose.
+    assert api.get_full_sync_for_user.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_iter_full_sync_hands_off_to_delta_sync() -> None:
+    user_id = uuid.uuid4()
+    api = SyncApiWrapped(ApiClient())
+    api.get_full_sync_for_user = AsyncMock(return_value=make_assets(1, 1))
+    api.get_delta_sync = AsyncMock(
+        return_value=MagicMock(
+            deleted=["gone"], needs_full_sync=False, upserted=make_assets(9, 1)
+        )
+    )
+    deleted: list[str] = []
+
+    async def on_deleted(ids: list[str]) -> None:
+        deleted.extend(ids)
+
+    assets = [
+        a
+        async for a in api.iter_full_sync(
+            user_id=user_id, limit=10, delta=True, on_deleted=on_deleted
+        )
+    ]
+
+    assert [a.id for a in assets] == [str(uuid.UUID(int=1)), str(uuid.UUID(int=9))]
+    assert deleted == ["gone"]
+    full_call = api.get_full_sync_for_user.await_args
+    delta_call = api.get_delta_sync.await_args
+    assert full_call is not None and delta_call is not None
+    full_dto, delta_dto = full_call.args[0], delta_call.args[0]
+    assert delta_dto.updated_after == full_dto.updated_until
+    assert delta_dto.user_ids == [user_id]
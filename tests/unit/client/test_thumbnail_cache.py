@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import AsyncMock
+import uuid
+
+import pytest
+
+from immichpy.client.generated.api_client import ApiClient
+from immichpy.client.generated.models.asset_media_size import AssetMediaSize
+from immichpy.client.utils.thumbnail_cache import ThumbnailCache
+from immichpy.client.wrapper.assets_api_wrapped import AssetsApiWrapped
+
+
+class MockResponse:
+    """Minimal mock of aiohttp.ClientResponse with a preloaded body."""
+
+    def __init__(self, status: int = 200, body: bytes = b"", headers=None):
+        self.status = status
+        self.reason = "OK"
+        self.headers = headers or {}
+        self._body = body
+        self.closed = False
+
+    async def read(self) -> bytes:
+        return self._body
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_make_key_depends_on_all_parts() -> None:
+    asset_id = uuid.uuid4()
+    keys = {
+        ThumbnailCache.make_key(asset_id),
+        ThumbnailCache.make_key(asset_id, AssetMediaSize.PREVIEW),
+        ThumbnailCache.make_key(asset_id, AssetMediaSize.PREVIEW, "v2"),
+        ThumbnailCache.make_key(uuid.uuid4(), AssetMediaSize.PREVIEW, "v2"),
+    }
+    assert len(keys) == 4
+
+
+def test_get_put_roundtrip_and_counters(tmp_path: Path) -> None:
+    cache = ThumbnailCache(tmp_path)
+
+    assert cache.get_sync("a") is None
+    cache.put_sync("a", b"image", etag='"abc"', content_type="image/jpeg")
+    entry = cache.get_sync("a")
+
+    assert entry is not None
+    assert entry.data == b"image"
+    assert entry.etag == '"abc"'
+    assert entry.content_type == "image/jpeg"
+    stats = cache.stats()
+    meta_size = (tmp_path / "a.json").stat().st_size
+    assert (stats.hits, stats.misses, stats.entries, stats.bytes) == (
+        1,
+        1,
+        1,
+        5 + meta_size,
+    )
+
+
+def test_evicts_least_recently_used(tmp_path: Path) -> None:
+    # Each entry takes 4 bytes of image and 2 bytes of metadata ("{}").
+    cache = ThumbnailCache(tmp_path, max_bytes=14)
+    cache.put_sync("a", b"aaaa")
+    cache.put_sync("b", b"bbbb")
+    # touch "a" so "b" becomes the least recently used entry
+    assert cache.get_sync("a") is not None
+    cache.put_sync("c", b"cccc")
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.size == 12
+    assert not (tmp_path / "b.bin").exists()
+
+
+def test_does_not_cache_entries_larger_than_capacity(tmp_path: Path) -> None:
+    cache = ThumbnailCache(tmp_path, max_bytes=3)
+    cache.put_sync("a", b"too large")
+
+    assert len(cache) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_overwrite_updates_size(tmp_path: Path) -> None:
+    cache = ThumbnailCache(tmp_path)
+    cache.put_sync("a", b"1234")
+    cache.put_sync("a", b"12")
+
+    assert cache.size == 4
+    assert len(cache) == 1
+
+
+def test_reload_restores_entries_in_lru_order(tmp_path: Path) -> None:
+    cache = ThumbnailCache(tmp_path)
+    cache.put_sync("old", b"1111")
+    cache.put_sync("new", b"2222")
+    os.utime(tmp_path / "old.bin", ns=(1_000_000_000, 1_000_000_000))
+
+    reloaded = ThumbnailCache(tmp_path, max_bytes=10)
+
+    assert "old" not in reloaded
+    assert "new" in reloaded
+    assert reloaded.get_sync("new") is not None
+
+
+def test_externally_removed_file_is_a_miss(tmp_path: Path) -> None:
+    cache = ThumbnailCache(tmp_path)
+    cache.put_sync("a", b"1234")
+    (tmp_path / "a.bin").unlink()
+
+    assert cache.get_sync("a") is None
+    assert "a" not in cache
+    assert cache.size == 0
+
+
+def test_metadata_counts_toward_capacity(tmp_path: Path) -> None:
+    cache = ThumbnailCache(tmp_path, max_bytes=40)
+    cache.put_sync("a", b"1234", etag='"a-long-etag"', content_type="image/jpeg")
+
+    assert len(cache) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_clear_removes_everything(tmp_path: Path) -> None:
+    cache = ThumbnailCache(tmp_path)
+    await cache.put("a", b"1")
+    await cache.put("b", b"2")
+    await cache.clear()
+
+    assert len(cache) == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_view_asset_cached_with_version_skips_server(tmp_path: Path) -> None:
+    api = AssetsApiWrapped(ApiClient())
+    api.view_asset_without_preload_content = AsyncMock(
+        return_value=MockResponse(body=b"thumb")
+    )
+    cache = ThumbnailCache(tmp_path)
+    asset_id = uuid.uuid4()
+
+    first = await api.view_asset_cached(asset_id, cache, version="checksum-1")
+    second = await api.view_asset_cached(asset_id, cache, version="checksum-1")
+
+    assert first == second == b"thumb"
+    assert api.view_asset_without_preload_content.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_view_asset_cached_revalidates_with_etag(tmp_path: Path) -> None:
+    api = AssetsApiWrapped(ApiClient())
+    api.view_asset_without_preload_content = AsyncMock(
+        side_effect=[
+            MockResponse(body=b"thumb", headers={"ETag": '"v1"'}),
+            MockResponse(status=304),
+        ]
+    )
+    cache = ThumbnailCache(tmp_path)
+    asset_id = uuid.uuid4()
+
+    await api.view_asset_cached(asset_id, cache, size=AssetMediaSize.THUMBNAIL)
+    result = await api.view_asset_cached(asset_id, cache, size=AssetMediaSize.THUMBNAIL)
+
+    assert result == b"thumb"
+    second_call = api.view_asset_without_preload_content.await_args_list[1]
+    assert second_call.kwargs["_headers"] == {"If-None-Match": '"v1"'}
+
+
+@pytest.mark.asyncio
+async def test_view_asset_cached_replaces_changed_thumbnail(tmp_path: Path) -> None:
+    api = AssetsApiWrapped(ApiClient())
+    api.view_asset_without_preload_content = AsyncMock(
+        side_effect=[
+            MockResponse(body=b"old", headers={"ETag": '"v1"'}),
+            MockResponse(body=b"new", headers={"ETag": '"v2"'}),
+        ]
+    )
+    cache = ThumbnailCache(tmp_path)
+    asset_id = uuid.uuid4()
+
+    await api.view_asset_cached(asset_id, cache)
+    result = await api.view_asset_cached(asset_id, cache)
+
+    assert result == b"new"
+    entry = await cache.get(cache.make_key(asset_id))
+    assert entry is not None
+    assert entry.etag == '"v2"'
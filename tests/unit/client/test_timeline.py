@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+from typing import Any, cast
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from immichpy.client.generated.api_client import ApiClient
+from immichpy.client.generated.exceptions import NotFoundException
+from immichpy.client.utils.timeline import TimelineColumns
+from immichpy.client.wrapper.timeline_api_wrapped import TimelineApiWrapped
+
+
+def bucket(ids: list[str]) -> dict:
+    n = len(ids)
+    return {
+        "id": ids,
+        "city": [None] * n,
+        "country": [None] * n,
+        "duration": [None] * n,
+        "fileCreatedAt": ["2024-01-01T00:00:00Z"] * n,
+        "isFavorite": [i % 2 == 0 for i in range(n)],
+        "isImage": [True] * n,
+        "isTrashed": [False] * n,
+        "latitude": [None if i == 0 else 50.0 + i for i in range(n)],
+        "livePhotoVideoId": [None] * n,
+        "localOffsetHours": [1] * n,
+        "longitude": [10.0] * n,
+        "ownerId": ["u1"] * n,
+        "projectionType": [None] * n,
+        "ratio": [1.5] * n,
+        "thumbhash": [None] * n,
+        "visibility": ["timeline"] * n,
+    }
+
+
+class BodyResponse:
+    def __init__(self, data: dict, status: int = 200):
+        self.status = status
+        self.reason = "OK"
+        self.headers: dict[str, str] = {}
+        self.closed = False
+        self._body = json.dumps(data).encode()
+
+    async def read(self) -> bytes:
+        return self._body
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_from_json_builds_typed_columns() -> None:
+    columns = TimelineColumns.from_json(bucket(["a", "b", "c"]))
+
+    assert len(columns) == 3
+    assert list(columns["id"]) == ["a", "b", "c"]
+    assert list(columns["is_favorite"]) == [True, False, True]
+    assert math.isnan(columns["latitude"][0])
+    assert columns["latitude"][2] == 52.0
+    assert sum(columns["ratio"]) == 4.5
+
+
+def test_rows_are_lazy_views() -> None:
+    columns = TimelineColumns.from_json(bucket(["a", "b"]))
+
+    row = columns.row(-1)
+    assert row.id == "b"
+    assert row.is_favorite is False
+    assert row.owner_id == "u1"
+    assert [r.id for r in columns] == ["a", "b"]
+    assert row.to_dict()["file_created_at"] == "2024-01-01T00:00:00Z"
+    with pytest.raises(AttributeError):
+        row.missing
+    with pytest.raises(IndexError):
+        columns.row(2)
+
+
+def test_concat_combines_buckets() -> None:
+    first = bucket(["a", "b"])
+    second = bucket(["c"])
+    del second["latitude"]
+
+    combined = TimelineColumns.concat(
+        [TimelineColumns.from_json(first), TimelineColumns.from_json(second)]
+    )
+
+    assert len(combined) == 3
+    assert list(combined["id"]) == ["a", "b", "c"]
+    assert list(combined["is_favorite"]) == [True, False, True]
+    assert "latitude" not in combined
+    assert len(TimelineColumns.concat([])) == 0
+
+
+def test_concat_uses_numpy_arrays() -> None:
+    np = pytest.importorskip("numpy")
+    combined = TimelineColumns.concat(
+        [
+            TimelineColumns.from_json(bucket(["a", "b"])),
+            TimelineColumns.from_json(bucket(["c"])),
+        ]
+    )
+
+    ratio, is_favorite = combined["ratio"], combined["is_favorite"]
+    assert isinstance(ratio, np.ndarray) and isinstance(is_favorite, np.ndarray)
+    assert ratio.dtype == np.float64
+    assert is_favorite.dtype == np.bool_
+    assert is_favorite.tolist() == [True, False, True]
+    assert np.isnan(combined["latitude"]).tolist() == [True, False, True]
+    assert combined.row(2).is_favorite is True
+
+
+def test_mismatched_column_lengths_are_rejected() -> None:
+    with pytest.raises(ValueError, match="different lengths"):
+        TimelineColumns({"id": ["a"], "ratio": [1.0, 2.0]})
+
+
+@pytest.mark.asyncio
+async def test_get_time_bucket_columns_parses_raw_body() -> None:
+    api = TimelineApiWrapped(ApiClient())
+    resp = BodyResponse(bucket(["a"]))
+    api.get_time_bucket_without_preload_content = AsyncMock(return_value=resp)
+
+    columns = await api.get_time_bucket_columns("2024-01-01", is_favorite=True)
+
+    assert list(columns["id"]) == ["a"]
+    assert resp.closed
+    call = api.get_time_bucket_without_preload_content.await_args
+    assert call is not None
+    assert call.kwargs == {"time_bucket": "2024-01-01", "is_favorite": True}
+
+
+@pytest.mark.asyncio
+async def test_get_time_bucket_columns_raises_api_errors() -> None:
+    api = TimelineApiWrapped(ApiClient())
+    api.get_time_bucket_without_preload_content = AsyncMock(
+        return_value=BodyResponse({"message": "not found"}, status=404)
+    )
+
+    with pytest.raises(NotFoundException):
+        await api.get_time_bucket_columns("2024-01-01")
+
+
+@pytest.mark.asyncio
+async def test_iter_time_bucket_columns_keeps_order_and_prefetches() -> None:
+    api = TimelineApiWrapped(ApiClient())
+    names = ["2024-03-01", "2024-02-01", "2024-01-01"]
+    api.get_time_buckets = AsyncMock(
+        return_value=[MagicMock(time_bucket=n) for n in names]
+    )
+    in_flight = 0
+    peak = 0
+
+    async def get_columns(time_bucket, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01 * (3 - names.index(time_bucket)))
+        in_flight -= 1
+        return TimelineColumns.from_json(bucket([time_bucket]))
+
+    api.get_time_bucket_columns = cast(Any, get_columns)
+
+    results = [
+        (name, list(columns["id"]))
+        async for name, columns in api.iter_time_bucket_columns(prefetch=2)
+    ]
+
+    assert results == [(n, [n]) for n in names]
+    assert peak == 3
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import gzip
+import json
+import socket
+from typing import Optional
+
+import aiohttp
+import pytest
+from aiohttp import web
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from immichpy import AsyncClient
+from immichpy.client.generated.models.asset_bulk_upload_check_dto import (
+    AssetBulkUploadCheckDto,
+)
+from immichpy.client.generated.models.asset_bulk_upload_check_item import (
+    AssetBulkUploadCheckItem,
+)
+from immichpy.client.generated.rest import RESTResponse
+from immichpy.client.utils.transport import TransportConfig
+
+
+class FakeResponse:
+    def __init__(self, body: Optional[dict] = None) -> None:
+        self.status = 200
+        self.reason = "OK"
+        self.headers = CIMultiDictProxy(
+            CIMultiDict({"Content-Type": "application/json"})
+        )
+        self._body = body if body is not None else {"major": 2, "minor": 5, "patch": 2}
+
+    async def read(self) -> bytes:
+        return json.dumps(self._body).encode()
+
+
+def test_default_timeout_bounds_connect_and_read_only() -> None:
+    timeout = TransportConfig().timeout()
+
+    assert timeout.total is None
+    assert timeout.sock_connect == 10.0
+    assert timeout.sock_read == 60.0
+
+
+def test_request_timeout_conversion() -> None:
+    config = TransportConfig(total_timeout=120)
+
+    assert config.request_timeout(None).total == 120
+    assert config.request_timeout(5).total == 5
+    pair = config.request_timeout((3, 30))
+    assert (pair.sock_connect, pair.sock_read, pair.total) == (3, 30, 120)
+    custom = aiohttp.ClientTimeout(total=1)
+    assert config.request_timeout(custom) is custom
+
+
+@pytest.mark.asyncio
+async def test_connector_settings() -> None:
+    connector = TransportConfig(limit=8, limit_per_host=4).connector()
+    try:
+        assert connector.limit == 8
+        assert connector.limit_per_host == 4
+    finally:
+        await connector.close()
+
+    connector = TransportConfig(keepalive_timeout=0).connector()
+    try:
+        assert connector.force_close
+    finally:
+        await connector.close()
+
+
+def test_socket_options_are_applied() -> None:
+    config = TransportConfig(
+        socket_options=[(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    )
+    sock = config._socket_factory(
+        (socket.AF_INET, socket.SOCK_STREAM, 0, "", ("127.0.0.1", 0))
+    )
+    try:
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE) == 1
+    finally:
+        sock.close()
+
+
+@pytest.mark.asyncio
+async def test_client_uses_transport_session_and_timeout(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = AsyncClient(
+        base_url="http://localhost/api",
+        transport=TransportConfig(limit=7, read_timeout=15),
+    )
+    timeouts = []
+
+    async def request(
+        method, url, headers=None, body=None, post_params=None, _request_timeout=None
+    ):
+        timeouts.append(_request_timeout)
+        return RESTResponse(FakeResponse())
+
+    monkeypatch.setattr(client.base_client.rest_client, "request", request)
+
+    await client.server.get_server_version()
+    await client.server.get_server_version(_request_timeout=(1, 2))
+
+    session = client.base_client.rest_client.pool_manager
+    assert session is not None
+    assert session.connector is not None
+    assert session.connector.limit == 7
+    assert not session.trust_env
+    assert timeouts[0].sock_read == 15
+    assert (timeouts[1].sock_connect, timeouts[1].sock_read) == (1, 2)
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_connector_factory_overrides_settings() -> None:
+    created = []
+
+    def factory() -> aiohttp.BaseConnector:
+        connector = aiohttp.TCPConnector(limit=3)
+        created.append(connector)
+        return connector
+
+    session = TransportConfig(connector_factory=factory, limit=50).session()
+    try:
+        assert session.connector is created[0]
+    finally:
+        await session.close()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+@pytest.mark.asyncio
+async def test_client_over_unix_socket(tmp_path) -> None:
+    async def version(request: web.Request) -> web.Response:
+        assert request.host == "immich"
+        return web.json_response({"major": 2, "minor": 5, "patch": 2})
+
+    app = web.Application()
+    app.router.add_get("/api/server/version", version)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    path = str(tmp_path / "immich.sock")
+    await web.UnixSite(runner, path).start()
+    try:
+        async with AsyncClient(
+            base_url="http://immich/api",
+            transport=TransportConfig(unix_socket=path),
+        ) as client:
+            assert (await client.server.get_server_version()).minor == 5
+            session = client.base_client.rest_client.pool_manager
+            assert session is not None
+            connector = session.connector
+            assert isinstance(connector, aiohttp.UnixConnector)
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.parametrize("items, compressed", [(1, False), (200, True)])
+@pytest.mark.asyncio
+async def test_large_json_bodies_are_gzipped(items: int, compressed: bool) -> None:
+    received: list[tuple[Optional[str], bytes]] = []
+
+    async def bulk_upload_check(request: web.Request) -> web.Response:
+        received.append(
+            (request.headers.get("Content-Encoding"), await request.content.read())
+        )
+        return web.json_response({"results": []})
+
+    app = web.Application()
+    app.router.add_post("/api/assets/bulk-upload-check", bulk_upload_check)
+    # keep the body as it was sent instead of decompressing it
+    runner = web.AppRunner(app, auto_decompress=False)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    port = runner.addresses[0][1]
+    dto = AssetBulkUploadCheckDto(
+        assets=[
+            AssetBulkUploadCheckItem(checksum=f"{i:040x}", id=str(i))
+            for i in range(items)
+        ]
+    )
+    try:
+        async with AsyncClient(
+            base_url=f"http://127.0.0.1:{port}/api",
+            transport=TransportConfig(compress_threshold=1024),
+        ) as client:
+            await client.assets.check_bulk_upload(dto)
+    finally:
+        await runner.cleanup()
+
+    encoding, body = received[0]
+    assert (encoding == "gzip") is compressed
+    data = gzip.decompress(body) if compressed else body
+    assert len(json.loads(data)["assets"]) == items